@@ -0,0 +1,120 @@
+"""
+Materialized views behind the count and summary analytics endpoints.
+
+The views are rolled up per match cycle, so an endpoint reads a handful
+of precomputed rows instead of aggregating the program tables on every
+request. The ``refresh_analytics_views`` asset refreshes them
+CONCURRENTLY after each load (readers are never blocked), which is why
+each view has a unique index.
+"""
+from sqlalchemy import Column, Date, DateTime, Integer, MetaData, String, Table, text
+
+# name -> (query, columns of its unique index)
+ANALYTICS_VIEWS: dict[str, tuple[str, tuple[str, ...]]] = {
+    "mv_program_summary": (
+        """
+        SELECT match_cycle,
+               count(*) AS total_programs,
+               count(description) AS with_description,
+               (SELECT count(*) FROM discipline) AS disciplines,
+               (SELECT count(*) FROM school) AS schools,
+               (SELECT count(*) FROM programstream) AS streams,
+               count(*) FILTER (WHERE description ILIKE '%Langue de candidature%') AS french_programs,
+               count(*) FILTER (WHERE description ILIKE '%Program application language%') AS english_programs,
+               now() AS refreshed_at
+        FROM program
+        GROUP BY match_cycle
+        """,
+        ("match_cycle",),
+    ),
+    "mv_discipline_count": (
+        """
+        SELECT p.match_cycle, d.name AS discipline, count(*) AS programs
+        FROM program p
+        JOIN discipline d ON d.id = p.discipline_id
+        GROUP BY p.match_cycle, d.name
+        """,
+        ("match_cycle", "discipline"),
+    ),
+    "mv_school_count": (
+        """
+        SELECT p.match_cycle, s.name AS school, count(*) AS programs
+        FROM program p
+        JOIN school s ON s.id = p.school_id
+        GROUP BY p.match_cycle, s.name
+        """,
+        ("match_cycle", "school"),
+    ),
+    "mv_stream_count": (
+        """
+        SELECT p.match_cycle, st.name AS stream, count(*) AS programs
+        FROM program p
+        JOIN programstream st ON st.id = p.stream_id
+        GROUP BY p.match_cycle, st.name
+        """,
+        ("match_cycle", "stream"),
+    ),
+    "mv_changes_per_day": (
+        """
+        SELECT match_cycle, changed_at::date AS date, count(*) AS changes
+        FROM programchangelog
+        GROUP BY match_cycle, changed_at::date
+        """,
+        ("match_cycle", "date"),
+    ),
+}
+
+
+def create_analytics_views(conn) -> None:
+    """Create the views (populated) and their unique indexes if missing."""
+    for name, (query, unique_columns) in ANALYTICS_VIEWS.items():
+        conn.execute(text(f"CREATE MATERIALIZED VIEW IF NOT EXISTS {name} AS {query}"))
+        conn.execute(text(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS ux_{name} ON {name} ({', '.join(unique_columns)})"
+        ))
+
+
+# ── Query handles (not part of SQLModel.metadata, so create_all skips them) ──
+
+_metadata = MetaData()
+
+program_summary_view = Table(
+    "mv_program_summary", _metadata,
+    Column("match_cycle", String, primary_key=True),
+    Column("total_programs", Integer),
+    Column("with_description", Integer),
+    Column("disciplines", Integer),
+    Column("schools", Integer),
+    Column("streams", Integer),
+    Column("french_programs", Integer),
+    Column("english_programs", Integer),
+    Column("refreshed_at", DateTime),
+)
+
+discipline_count_view = Table(
+    "mv_discipline_count", _metadata,
+    Column("match_cycle", String, primary_key=True),
+    Column("discipline", String, primary_key=True),
+    Column("programs", Integer),
+)
+
+school_count_view = Table(
+    "mv_school_count", _metadata,
+    Column("match_cycle", String, primary_key=True),
+    Column("school", String, primary_key=True),
+    Column("programs", Integer),
+)
+
+stream_count_view = Table(
+    "mv_stream_count", _metadata,
+    Column("match_cycle", String, primary_key=True),
+    Column("stream", String, primary_key=True),
+    Column("programs", Integer),
+)
+
+changes_per_day_view = Table(
+    "mv_changes_per_day", _metadata,
+    Column("match_cycle", String, primary_key=True),
+    Column("date", Date, primary_key=True),
+    Column("changes", Integer),
+)
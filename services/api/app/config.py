@@ -38,6 +38,13 @@ SQL_ECHO: bool = os.getenv("SQL_ECHO", "false").lower() == "true"
 
 API_URL: str = os.getenv("API_URL", "http://localhost:8000")              # used by Streamlit
 
+# "chroma" (whole descriptions) or "chunks" (pgvector search over ProgramChunk sections)
+RETRIEVER_BACKEND: str = os.getenv("RETRIEVER_BACKEND", "chroma")
+
+# In-memory cache of GET /programs and /analytics responses (see app/response_cache.py)
+RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "512"))
+RESPONSE_CACHE_TTL_SECONDS: float = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+
 
 # ── OpenAI Configuration ──────────────────────────────────────────
 OPENAI_API_KEY: str = _require_env("OPENAI_API_KEY")
@@ -0,0 +1,37 @@
+"""
+Match cycle lookups shared by the API routes and the QA retriever.
+
+Cycle ids are text ("1503"), so ``max(match_cycle)`` compares them as
+strings and would put "999" after "1503". Cycles are compared as numbers
+here, and the candidates are read from ``program``'s per-cycle partitions
+(one catalog row per cycle) instead of aggregating every partition.
+"""
+from sqlalchemy import text
+from sqlmodel import Session, select
+
+from .models import Program
+
+_PROGRAM_PARTITION_CYCLES = text("""
+SELECT substr(c.relname, length('program_') + 1)
+FROM pg_inherits i
+JOIN pg_class c ON c.oid = i.inhrelid
+WHERE i.inhparent = 'program'::regclass
+""")
+
+
+def cycle_sort_key(cycle: str) -> tuple:
+    """Numeric cycles in numeric order, after any non-numeric ones."""
+    return (1, int(cycle), cycle) if cycle.isdigit() else (0, 0, cycle)
+
+
+def latest_match_cycle(session: Session) -> str | None:
+    """Newest match cycle that has programs, or None before the first load."""
+    cycles = session.execute(_PROGRAM_PARTITION_CYCLES).scalars().all()
+    for cycle in sorted(cycles, key=cycle_sort_key, reverse=True):
+        # a partition is created just before its cycle's first load, which may have failed
+        has_programs = session.exec(
+            select(Program.program_stream_id).where(Program.match_cycle == cycle).limit(1)
+        ).first()
+        if has_programs is not None:
+            return cycle
+    return None
@@ -13,7 +13,7 @@ from langchain_classic.chains import RetrievalQA
 from langchain_community.utilities import SQLDatabase
 from langchain_community.agent_toolkits import create_sql_agent
 
-from .retriever import get_retriever
+from .retriever import ProgramChunkRetriever, get_retriever
 from ..config import OPENAI_API_KEY, DATABASE_URL
 
 llm = ChatOpenAI(
@@ -51,12 +51,23 @@ prompt = PromptTemplate(
     input_variables=["context", "question"],
 )
 
-qa = RetrievalQA.from_chain_type(
-    llm=llm,
-    retriever=retriever,
-    chain_type_kwargs={"prompt": prompt},
-    return_source_documents=True,
-)
+def _qa_chain(retriever) -> RetrievalQA:
+    return RetrievalQA.from_chain_type(
+        llm=llm,
+        retriever=retriever,
+        chain_type_kwargs={"prompt": prompt},
+        return_source_documents=True,
+    )
+
+
+qa = _qa_chain(retriever)
+
+
+def _qa_for_cycle(cycle: str | None) -> RetrievalQA:
+    """QA chain whose chunk retriever only searches ``cycle``."""
+    if cycle is None or not isinstance(retriever, ProgramChunkRetriever):
+        return qa
+    return _qa_chain(retriever.model_copy(update={"match_cycle": cycle}))
 
 # to avoid connection attempts at module import time
 _sql_agent = None
@@ -79,7 +90,8 @@ You are a data assistant querying a PostgreSQL database about Canadian residency
 The database schema:
 
 program (
-    program_stream_id TEXT PRIMARY KEY,
+    match_cycle TEXT,  -- e.g. '1503'; one set of programs per match cycle
+    program_stream_id TEXT,
     name TEXT,
     site TEXT,
     url TEXT,
@@ -89,7 +101,9 @@ program (
     stream_id INTEGER REFERENCES programstream(id),
     description_hash TEXT,
     embedding VECTOR(1536),
-    updated_at TIMESTAMP
+    updated_at TIMESTAMP,
+    search_vector TSVECTOR,  -- name + description, English and French, GIN-indexed
+    PRIMARY KEY (match_cycle, program_stream_id)
 )
 
 school (
@@ -109,17 +123,24 @@ programstream (
 )
 
 programchangelog (
-    id INTEGER PRIMARY KEY,
-    program_stream_id TEXT REFERENCES program(program_stream_id),
+    id INTEGER,
+    match_cycle TEXT,
+    program_stream_id TEXT,
     changed_at TIMESTAMP,
     old_hash TEXT,
-    new_hash TEXT
+    new_hash TEXT,
+    FOREIGN KEY (match_cycle, program_stream_id) REFERENCES program(match_cycle, program_stream_id)
 )
 
 Important:
+- Unless the question names a cycle, only look at the latest match_cycle. Cycle ids are text,
+  so compare them as numbers: ORDER BY match_cycle::int DESC LIMIT 1, not MAX(match_cycle).
+- Join program and programchangelog on both match_cycle and program_stream_id.
 - Use JOINs to connect programs with schools, disciplines, and streams via foreign keys.
 - When counting or aggregating, use proper SQL aggregation functions (COUNT, SUM, AVG, etc.).
-- Check program description with ISLIKE("%%") to find program that matches words in the question. Use similarity search to find the most similar program.
+- To find programs mentioning words of the question, prefer the index:
+  search_vector @@ (websearch_to_tsquery('english', '...') || websearch_to_tsquery('french', '...')).
+  Fall back to description ILIKE '%%...%%' for exact fragments. Use similarity search to find the most similar program.
 - Use French to English translation to check if french programs descriptions have the same words as the question.
 - Always return the final answer in natural language, not just raw numbers.
 - If no data is found, say "Not found in database."
@@ -180,11 +201,11 @@ def _run_sql(question: str) -> dict[str, Any]:
         raise e
 
 
-def ask_hybrid(session: Session, question: str) -> dict[str, Any]:
+def ask_hybrid(session: Session, question: str, cycle: str | None = None) -> dict[str, Any]:
     """
     Main entry point:
     - routes analytics/count questions to SQL
-    - routes everything else to RAG
+    - routes everything else to RAG, searching only ``cycle``'s programs
     """
     if _should_use_sql(question):
         try:
@@ -198,7 +219,7 @@ def ask_hybrid(session: Session, question: str) -> dict[str, Any]:
             pass
 
     # RAG fallback
-    rag = qa.invoke({"query": question})
+    rag = _qa_for_cycle(cycle).invoke({"query": question})
     answer = (rag.get("result") or "").strip() or "Not found in database."
 
     return {
@@ -1,17 +1,93 @@
 from pathlib import Path
 from langchain_chroma import Chroma
+from langchain_core.documents import Document
+from langchain_core.embeddings import Embeddings
+from langchain_core.retrievers import BaseRetriever
+from sqlmodel import Session, select
 from .embeddings import get_embeddings
+from ..config import RETRIEVER_BACKEND
+from ..cycles import latest_match_cycle
+from ..database import engine
+from ..models import Program, ProgramChunk
 
 PROJECT_ROOT = Path(__file__).resolve().parents[4]
 CHROMA_DIR = str(PROJECT_ROOT / "chroma_store")
 
+
+class ProgramChunkRetriever(BaseRetriever):
+    """Nearest description sections from the ProgramChunk table (pgvector).
+
+    Only chunks of one match cycle are searched: ``match_cycle``, or the
+    latest cycle loaded. The same section of near-duplicate programs (same
+    Program.cluster_id) is returned once, for the closest program.
+    """
+
+    embeddings: Embeddings
+    match_cycle: str | None = None
+    k: int = 5
+    # nearest chunks fetched per query before near-duplicates are dropped
+    fetch_k: int = 25
+
+    def _get_relevant_documents(self, query: str, *, run_manager=None) -> list[Document]:
+        query_vector = self.embeddings.embed_query(query)
+
+        with Session(engine) as session:
+            cycle = self.match_cycle or latest_match_cycle(session)
+            rows = session.exec(
+                select(
+                    ProgramChunk.match_cycle,
+                    ProgramChunk.program_stream_id,
+                    ProgramChunk.section,
+                    ProgramChunk.content,
+                    Program.name,
+                    Program.url,
+                    Program.cluster_id,
+                )
+                .join(
+                    Program,
+                    (Program.match_cycle == ProgramChunk.match_cycle)
+                    & (Program.program_stream_id == ProgramChunk.program_stream_id),
+                )
+                .where(ProgramChunk.match_cycle == cycle)
+                .where(ProgramChunk.embedding.isnot(None))
+                .order_by(ProgramChunk.embedding.cosine_distance(query_vector))
+                .limit(max(self.fetch_k, self.k))
+            ).all()
+
+        seen = set()
+        unique = []
+        for row in rows:
+            cycle, pid, section, _, _, _, cluster_id = row
+            key = (cluster_id or (cycle, pid), section)
+            if key not in seen:
+                seen.add(key)
+                unique.append(row)
+
+        return [
+            Document(
+                page_content=content,
+                metadata={
+                    "program_id": pid,
+                    "match_cycle": cycle,
+                    "program_name": name,
+                    "section": section,
+                    "source": url,
+                },
+            )
+            for cycle, pid, section, content, name, url, _ in unique[:self.k]
+        ]
+
+
 def get_retriever():
 
     embeddings = get_embeddings()
 
+    if RETRIEVER_BACKEND == "chunks":
+        return ProgramChunkRetriever(embeddings=embeddings, k=5)
+
     vectorstore = Chroma(
         persist_directory=CHROMA_DIR,
         embedding_function=embeddings
     )
 
-    return vectorstore.as_retriever(search_kwargs={"k": 5})
\ No newline at end of file
+    return vectorstore.as_retriever(search_kwargs={"k": 5})
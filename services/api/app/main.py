@@ -7,6 +7,7 @@ sys.path.insert(0, str(Path(__file__).resolve().parents[3]))
 from fastapi import FastAPI
 from sqlalchemy import text
 from sqlmodel import SQLModel
+from services.api.app.analytics_views import create_analytics_views
 from services.api.app.database import engine
 from services.api.routes import health, programs, qa
 
@@ -21,8 +22,11 @@ app.include_router(qa.router)
 def on_startup():
     with engine.connect() as conn:
         conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
         conn.commit()
     SQLModel.metadata.create_all(engine)
+    with engine.begin() as conn:
+        create_analytics_views(conn)
 
 
 @app.get("/")
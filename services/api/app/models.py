@@ -1,22 +1,39 @@
-from datetime import datetime
-from sqlalchemy import Column
+from datetime import date, datetime
+from sqlalchemy import Column, Computed, ForeignKeyConstraint, Index, LargeBinary, UniqueConstraint
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlmodel import SQLModel, Field, Relationship
 from typing import Optional, List
 import hashlib
 from pgvector.sqlalchemy import Vector
+
+
+# the name columns carry pg_trgm GIN indexes so ILIKE '%...%' and fuzzy
+# (<%) lookups on them don't scan the table
 class Discipline(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_discipline_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True, unique=True)
     programs: List["Program"] = Relationship(back_populates="discipline")
 
 
 class School(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_school_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True, unique=True)
     programs: List["Program"] = Relationship(back_populates="school")
 
 
 class ProgramStream(SQLModel, table=True):
+    __table_args__ = (
+        Index("ix_programstream_name_trgm", "name", postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"}),
+    )
+
     id: Optional[int] = Field(default=None, primary_key=True)
     name: str = Field(index=True, unique=True)
     category: Optional[str] = Field(default=None)
@@ -24,7 +41,24 @@ class ProgramStream(SQLModel, table=True):
     programs: List["Program"] = Relationship(back_populates="stream")
 
 
+# name plus the description parsed as both English and French, so a query in
+# either language matches its stems; the name ranks above the body
+PROGRAM_SEARCH_VECTOR_SQL = (
+    "setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B') || "
+    "setweight(to_tsvector('french'::regconfig, coalesce(description, '')), 'B')"
+)
+
+
 class Program(SQLModel, table=True):
+    """One program stream in one match cycle; LIST-partitioned by cycle."""
+    __table_args__ = (
+        Index("ix_program_search_vector", "search_vector", postgresql_using="gin"),
+        {"postgresql_partition_by": "LIST (match_cycle)"},
+    )
+
+    # "1503" in a raw record id like "1503|27447"
+    match_cycle: str = Field(primary_key=True)
     program_stream_id: str = Field(primary_key=True)
 
     name: str
@@ -32,9 +66,9 @@ class Program(SQLModel, table=True):
     url: Optional[str] = None
     description: Optional[str] = None
 
-    discipline_id: int = Field(foreign_key="discipline.id")
-    school_id: int = Field(foreign_key="school.id")
-    stream_id: int = Field(foreign_key="programstream.id")
+    discipline_id: int = Field(foreign_key="discipline.id", index=True)
+    school_id: int = Field(foreign_key="school.id", index=True)
+    stream_id: int = Field(foreign_key="programstream.id", index=True)
 
     discipline: Optional[Discipline] = Relationship(back_populates="programs")
     school: Optional[School] = Relationship(back_populates="programs")
@@ -44,15 +78,33 @@ class Program(SQLModel, table=True):
         sa_column=Column(Vector(1536))
     )
     updated_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+    # description_hash of the smallest member of its near-duplicate cluster
+    cluster_id: Optional[str] = Field(default=None, index=True)
+    # generated by Postgres, never written
+    search_vector: Optional[str] = Field(
+        default=None,
+        sa_column=Column(TSVECTOR, Computed(PROGRAM_SEARCH_VECTOR_SQL, persisted=True))
+    )
 
 
 class ProgramChangeLog(SQLModel, table=True):
-    id: Optional[int] = Field(default=None, primary_key=True)
+    """LIST-partitioned by cycle like Program."""
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["match_cycle", "program_stream_id"],
+            ["program.match_cycle", "program.program_stream_id"],
+        ),
+        {"postgresql_partition_by": "LIST (match_cycle)"},
+    )
 
-    program_stream_id: str = Field(
-        foreign_key="program.program_stream_id",
-        index=True
+    id: Optional[int] = Field(
+        default=None,
+        primary_key=True,
+        sa_column_kwargs={"autoincrement": True}
     )
+    match_cycle: str = Field(primary_key=True)
+
+    program_stream_id: str = Field(index=True)
 
     changed_at: datetime = Field(
         default_factory=datetime.utcnow,
@@ -60,4 +112,112 @@ class ProgramChangeLog(SQLModel, table=True):
     )
 
     old_hash: Optional[str] = None
-    new_hash: str
\ No newline at end of file
+    new_hash: str
+
+
+class ProgramVersion(SQLModel, table=True):
+    """One revision of a program description (see app.program_versions)."""
+    __table_args__ = (
+        ForeignKeyConstraint(
+            ["match_cycle", "program_stream_id"],
+            ["program.match_cycle", "program.program_stream_id"],
+        ),
+    )
+
+    match_cycle: str = Field(primary_key=True)
+    program_stream_id: str = Field(primary_key=True)
+    version: int = Field(primary_key=True)  # 1-based, per program
+    description_hash: Optional[str] = None
+    # zlib full text if is_snapshot, else a delta against the previous version
+    is_snapshot: bool
+    payload: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class RawRecordFingerprint(SQLModel, table=True):
+    """
+    Content hash of each raw scraped record as of its last successful load,
+    or as of the run that skipped it (``skip_reason`` set) because its
+    header couldn't be parsed.
+    """
+    record_id: str = Field(primary_key=True)
+    content_hash: str
+    loaded_at: datetime = Field(default_factory=datetime.utcnow)
+    skip_reason: str | None = None
+
+
+class EmbeddingCache(SQLModel, table=True):
+    """Embedding of a piece of text, keyed by its sha256 and the model used."""
+    content_hash: str = Field(primary_key=True)
+    model: str = Field(primary_key=True)
+    embedding: list[float] = Field(
+        sa_column=Column(Vector(1536), nullable=False)
+    )
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ProgramChunk(SQLModel, table=True):
+    """One ``#``/``##`` section of a program description, embedded on its own."""
+    __table_args__ = (
+        UniqueConstraint("match_cycle", "program_stream_id", "chunk_index"),
+        ForeignKeyConstraint(
+            ["match_cycle", "program_stream_id"],
+            ["program.match_cycle", "program.program_stream_id"],
+        ),
+        Index(
+            "ix_programchunk_embedding_hnsw",
+            "embedding",
+            postgresql_using="hnsw",
+            postgresql_ops={"embedding": "vector_cosine_ops"},
+        ),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    match_cycle: str
+    program_stream_id: str = Field(index=True)
+    chunk_index: int
+    section: str = Field(index=True)
+    content: str
+    content_hash: str = Field(index=True)
+    # description the chunks were cut from; stale once Program.description_hash moves on
+    description_hash: str
+    embedding: Optional[list[float]] = Field(
+        sa_column=Column(Vector(1536))
+    )
+
+
+class ProgramFacts(SQLModel, table=True):
+    """Analytics facts extracted once per distinct description (see app.program_facts)."""
+    description_hash: str = Field(primary_key=True)
+    application_bucket: Optional[str] = Field(default=None, index=True)
+    interview_offer_bucket: Optional[str] = Field(default=None, index=True)
+    # program_facts.FACTS_VERSION the row was extracted with
+    extractor_version: int
+    extracted_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class ProgramInterviewDate(SQLModel, table=True):
+    description_hash: str = Field(
+        foreign_key="programfacts.description_hash",
+        primary_key=True
+    )
+    date_text: str = Field(primary_key=True)  # as written, e.g. "January 23, 2025"
+    interview_date: Optional[date] = Field(default=None, index=True)
+
+
+class ProgramInterviewCriterion(SQLModel, table=True):
+    id: Optional[int] = Field(default=None, primary_key=True)
+    description_hash: str = Field(
+        foreign_key="programfacts.description_hash",
+        index=True
+    )
+    criterion: str = Field(index=True)
+    evaluated: bool
+
+
+class DescriptionSignature(SQLModel, table=True):
+    """MinHash signature of one distinct description (see pipeline.dedup)."""
+    description_hash: str = Field(primary_key=True)
+    signature: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    # dedup.MINHASH_VERSION the signature was computed with
+    minhash_version: int
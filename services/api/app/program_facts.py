@@ -0,0 +1,235 @@
+"""
+Interview and application facts extracted from program descriptions.
+
+Shared by the pipeline (which extracts them once per description hash
+into the ProgramFacts tables) and the analytics endpoints (which only
+aggregate those tables).
+"""
+import re
+from datetime import date, datetime
+
+# bump when the extraction below changes so stored facts are re-extracted
+FACTS_VERSION = 1
+
+# ── Section keywords (EN + FR, SQL LIKE patterns) ───────────────────
+
+INTERVIEW_SECTION_KEYWORDS = [
+    "%# Interview%",
+    # French
+    "%# Entrevue%",
+    "%# Entretien%",
+    "%#d'examen%",
+]
+
+APPLICATION_STATS_KEYWORDS = [
+    "%average number of applications%",
+    # French
+    "%nombre moyen de demandes%",
+    "%nombre moyen de candidatures%",
+]
+
+EVALUATION_CRITERIA_KEYWORDS = [
+    "%interview evaluation criteria%",
+    # French
+    "%évaluation pour les entrevues%",
+    "%critères d'évaluation%",
+    "%critères de sélection%",
+
+]
+
+INTERVIEW_OFFER_PCT_KEYWORDS = [
+    "%average percentage of applicants offered interviews%",
+    # French
+    "%pourcentage moyen%invités en entrevue%",
+    "%pourcentage moyen%offert%entrevue%",
+    "%nombre moyen de demandes%"
+]
+
+# ── Canonical values ────────────────────────────────────────────────
+
+# French to English mapping for interview evaluation criteria
+FR_TO_EN_CRITERIA: dict[str, str] = {
+    "Activités savantes":          "Scholarly activities",
+    "Collégialité":                "Collegiality",
+    "Compétences en collaboration":"Collaboration skills",
+    "Compétences en communication":"Communication skills",
+    "Compétences en leadership":   "Leadership skills",
+    "Intérêt envers la discipline":"Interest in the discipline",
+    "Intérêt envers le programme": "Interest in the program",
+    "Professionnalisme":           "Professionalism",
+    "Promotion de la santé":       "Health advocacy",
+    "Autres composants d'entrevue":"Other interview component(s)",
+}
+
+# Standard criteria (canonical English names, used for charts)
+STANDARD_CRITERIA = [
+    "Collaboration skills",
+    "Collegiality",
+    "Communication skills",
+    "Health advocacy",
+    "Interest in the discipline",
+    "Interest in the program",
+    "Leadership skills",
+    "Professionalism",
+    "Scholarly activities",
+]
+
+# Canonical application-count buckets (order matters for charts)
+APP_COUNT_ORDER = ["0 - 50", "51 - 200", "201 - 400", "401 - 600", "601 +"]
+
+# Canonical interview-offer-percentage buckets
+PCT_ORDER = ["0 - 25 %", "26 - 50 %", "51 - 75 %", "76 - 100 %"]
+
+_APPLICATIONS_RES = [
+    re.compile(r"Average number of applications received by our program in the last five years\s*:\s*(.+?)(?:\n|$)"),
+    re.compile(r"Nombre moyen de demandes soumises au programme pendant les cinq dernières années\s*:\s*(.+?)(?:\n|$)"),
+]
+
+_OFFER_PCT_RES = [
+    re.compile(r"Average percentage of applicants offered interviews\s*:\s*(.+?)(?:\n|$)"),
+    re.compile(r"Pourcentage moyen de candidats invités à une entrevue\s*:\s*(.+?)(?:\n|$)"),
+]
+
+
+# ── Helpers ─────────────────────────────────────────────────────────
+
+def _like_any(text: str, patterns: list[str]) -> bool:
+    """Python equivalent of ``OR``-ed ``ILIKE`` filters on ``%``-only patterns."""
+    text = text.lower()
+    for pattern in patterns:
+        pos = 0
+        for part in pattern.lower().strip("%").split("%"):
+            pos = text.find(part, pos)
+            if pos < 0:
+                break
+            pos += len(part)
+        else:
+            return True
+    return False
+
+
+def _first_match(regexes: list[re.Pattern], description: str) -> str | None:
+    for regex in regexes:
+        m = regex.search(description)
+        if m:
+            return m.group(1).strip().rstrip("  ")
+    return None
+
+
+def _bucket(raw: str, order: list[str]) -> str:
+    """Canonical bucket contained in ``raw``, or ``raw`` itself."""
+    return next((bucket for bucket in order if bucket in raw), raw)
+
+
+def parse_interview_criteria(description: str) -> list[dict]:
+    """Return list of {criterion, evaluated} dicts from the criteria table.
+
+    Handles both English and French table formats and normalises French
+    criterion names to their English equivalents via ``FR_TO_EN_CRITERIA``.
+    """
+    results: list[dict] = []
+    match = re.search(
+        r"Interview evaluation criteria\s*:\s*\n(.*?)(?:\n\n|\n#|\n\*\*|\Z)",
+        description, re.DOTALL,
+    )
+    if not match:
+        match = re.search(
+            r"[éÉe]valuation pour les entrevues\s*:\s*\n(.*?)(?:\n\n|\n#|\n\*\*|\Z)",
+            description, re.DOTALL,
+        )
+    if not match:
+        return results
+
+    skip = {"Interview components", "Composants d'entrevue"}
+
+    for line in match.group(1).split("\n"):
+        line = line.strip()
+        if "|" not in line or line.startswith("---"):
+            continue
+        parts = line.split("|", 1)
+        criterion = parts[0].strip()
+        detail = parts[1].strip() if len(parts) > 1 else ""
+        if not criterion or criterion in skip:
+            continue
+
+        # Normalise French → English
+        criterion = FR_TO_EN_CRITERIA.get(criterion, criterion)
+
+        if criterion not in STANDARD_CRITERIA:
+            continue
+
+        not_evaluated = any( # If any of the keywords are in the detail, the criterion is not evaluated
+            kw in detail.lower()
+            for kw in [
+                "do not evaluate", "not formally", "not evaluated", "n/a", "do not offer"
+                # French equivalents
+                "nous n'évaluons pas", "non évalué", "s/o",
+            ]
+        )
+        results.append({"criterion": criterion, "evaluated": not not_evaluated})
+    return results
+
+
+def parse_interview_dates(description: str) -> list[str]:
+    """Extract interview dates (e.g. 'January 23, 2025') from the Interviews section."""
+    # Try English then French section headers
+    m = re.search(r"# (?:Interviews|Entrevues|Entretiens)\s*\nDates?\s*:\s*\n(.*?)(?:Details|Détails|$)", description, re.DOTALL)
+    if not m:
+        return []
+    return re.findall(r"(\w+ \d+, \d{4})", m.group(1))
+
+
+def normalise_pct(raw: str) -> str:
+    """Normalise dash variants so '26–50 %' becomes '26 - 50 %'."""
+    return re.sub(r"\s*[–—-]\s*", " - ", raw).strip()
+
+
+def _to_date(text: str) -> date | None:
+    try:
+        return datetime.strptime(text, "%B %d, %Y").date()
+    except ValueError:
+        return None
+
+
+# ── Extraction ──────────────────────────────────────────────────────
+
+def extract_facts(description: str) -> dict:
+    """
+    All analytics facts of one description, gated by the same section
+    keywords the endpoints used to filter on:
+
+    - ``interview_dates``: unique (text, date or None) pairs, in order
+    - ``application_bucket`` / ``interview_offer_bucket``: canonical
+      bucket, the raw value if it fits none, or None if not stated
+    - ``criteria``: {criterion, evaluated} rows of the criteria table
+    """
+    facts = {
+        "interview_dates": [],
+        "application_bucket": None,
+        "interview_offer_bucket": None,
+        "criteria": [],
+    }
+    if not description:
+        return facts
+
+    if _like_any(description, INTERVIEW_SECTION_KEYWORDS):
+        seen: set[str] = set() # To avoid counting the same date multiple times
+        for d in parse_interview_dates(description):
+            if d not in seen:
+                seen.add(d)
+                facts["interview_dates"].append((d, _to_date(d)))
+
+    if _like_any(description, APPLICATION_STATS_KEYWORDS):
+        raw = _first_match(_APPLICATIONS_RES, description)
+        if raw is not None:
+            facts["application_bucket"] = _bucket(raw, APP_COUNT_ORDER)
+
+    if _like_any(description, INTERVIEW_OFFER_PCT_KEYWORDS):
+        raw = _first_match(_OFFER_PCT_RES, description)
+        if raw is not None:
+            facts["interview_offer_bucket"] = _bucket(normalise_pct(raw), PCT_ORDER)
+
+    if _like_any(description, EVALUATION_CRITERIA_KEYWORDS):
+        facts["criteria"] = parse_interview_criteria(description)
+
+    return facts
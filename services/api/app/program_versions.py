@@ -0,0 +1,112 @@
+"""
+Compressed revision history of program descriptions.
+
+Every description a program has had is stored in ProgramVersion, either
+as a full snapshot or as a line delta against the previous version. A
+snapshot is written every ``SNAPSHOT_EVERY`` versions, so rebuilding any
+version decompresses at most that many rows.
+
+Payloads are zlib-compressed: a snapshot is the UTF-8 text, a delta is a
+JSON list whose items are either ``[start, end]`` (copy those lines of
+the previous version) or a string (inserted text).
+"""
+import difflib
+import json
+import zlib
+
+# version 1 and every SNAPSHOT_EVERY-th version after it are full copies
+SNAPSHOT_EVERY = 10
+
+_LEVEL = 9
+
+
+def is_snapshot_version(version: int) -> bool:
+    return (version - 1) % SNAPSHOT_EVERY == 0
+
+
+def encode_snapshot(text: str) -> bytes:
+    return zlib.compress(text.encode("utf-8"), _LEVEL)
+
+
+def encode_delta(old: str, new: str) -> bytes:
+    """Line delta turning ``old`` into ``new``."""
+    old_lines = old.splitlines(keepends=True)
+    new_lines = new.splitlines(keepends=True)
+
+    ops: list = []
+    matcher = difflib.SequenceMatcher(None, old_lines, new_lines, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            ops.append([i1, i2])
+        elif j2 > j1:  # replace / insert; deletes need no op
+            ops.append("".join(new_lines[j1:j2]))
+
+    return zlib.compress(json.dumps(ops, ensure_ascii=False, separators=(",", ":")).encode("utf-8"), _LEVEL)
+
+
+def encode_version(version: int, old: str | None, new: str) -> bytes:
+    """Payload of ``version``: a snapshot when one is due (or there is no base)."""
+    if old is None or is_snapshot_version(version):
+        return encode_snapshot(new)
+    return encode_delta(old, new)
+
+
+def apply_delta(old: str, payload: bytes) -> str:
+    old_lines = old.splitlines(keepends=True)
+    parts = []
+    for op in json.loads(zlib.decompress(payload)):
+        if isinstance(op, str):
+            parts.append(op)
+        else:
+            start, end = op
+            parts.extend(old_lines[start:end])
+    return "".join(parts)
+
+
+def reconstruct(rows) -> str:
+    """
+    Text of the last of ``rows``: (is_snapshot, payload) pairs in version
+    order, starting at a snapshot.
+    """
+    text = None
+    for is_snapshot, payload in rows:
+        if is_snapshot:
+            text = zlib.decompress(payload).decode("utf-8")
+        elif text is None:
+            raise ValueError("Version chain does not start with a snapshot")
+        else:
+            text = apply_delta(text, payload)
+    if text is None:
+        raise ValueError("No versions to reconstruct")
+    return text
+
+
+def new_versions(
+    last_version: int | None,
+    old: str | None,
+    old_hash: str | None,
+    new: str,
+    new_hash: str,
+) -> list[dict]:
+    """
+    ProgramVersion fields for a description change. Programs loaded before
+    versions were kept get their previous text recorded first as version 1.
+    """
+    rows = []
+    if last_version is None and old is not None:
+        rows.append({
+            "version": 1,
+            "description_hash": old_hash,
+            "is_snapshot": True,
+            "payload": encode_snapshot(old),
+        })
+        last_version = 1
+
+    version = (last_version or 0) + 1
+    rows.append({
+        "version": version,
+        "description_hash": new_hash,
+        "is_snapshot": old is None or is_snapshot_version(version),
+        "payload": encode_version(version, old, new),
+    })
+    return rows
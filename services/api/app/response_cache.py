@@ -0,0 +1,165 @@
+"""
+In-memory response cache for the read-only program and analytics routes.
+
+Responses are keyed on the request path and query string plus a *data
+version*: the newest write timestamps / ids of the tables the pipeline
+touches. Once a load, fact extraction, embedding run or view refresh
+lands, the version changes and every older entry simply stops matching,
+so nothing has to be invalidated explicitly. Pipeline writes to program
+rows that don't change the description (dimension reassignment, cluster
+ids) bump ``updated_at`` so they move the version too. Entries live in a
+bounded LRU and also expire after ``RESPONSE_CACHE_TTL_SECONDS`` as a
+backstop for writes made outside the pipeline.
+
+Each cached body carries a strong ETag (a hash of its bytes); a request
+whose ``If-None-Match`` matches it, by the weak comparison RFC 9110 asks
+for (``W/`` prefixes ignored, ``*`` matches anything), gets an empty 304.
+"""
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+from sqlmodel import Session, func, select
+from starlette.concurrency import run_in_threadpool
+
+from .analytics_views import program_summary_view
+from .config import RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS
+from .database import engine
+from .models import EmbeddingCache, Program, ProgramChangeLog, ProgramFacts
+
+# how long a computed data version is reused before asking Postgres again
+_VERSION_TTL_SECONDS = 2.0
+
+# headers that describe the cached body rather than the endpoint's output
+_SKIP_HEADERS = {"content-length", "content-type", "etag", "cache-control"}
+
+
+@dataclass
+class _Entry:
+    body: bytes
+    headers: list[tuple[str, str]]
+    media_type: str | None
+    etag: str
+    stored_at: float
+
+
+class ResponseCache:
+    """Thread-safe LRU of response bodies with a per-entry TTL."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple) -> _Entry | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.monotonic() - entry.stored_at > self.ttl_seconds:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: tuple, entry: _Entry) -> None:
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS)
+
+_version_lock = threading.Lock()
+_version: tuple[float, str] | None = None  # (computed at, version)
+
+
+def _query_data_version() -> str:
+    """One round trip: the newest write markers of the tables the routes read."""
+    with Session(engine) as session:
+        row = session.exec(select(
+            select(func.max(Program.updated_at)).scalar_subquery(),
+            select(func.max(ProgramChangeLog.id)).scalar_subquery(),
+            select(func.max(ProgramFacts.extracted_at)).scalar_subquery(),
+            select(func.max(EmbeddingCache.created_at)).scalar_subquery(),
+            select(func.max(program_summary_view.c.refreshed_at)).scalar_subquery(),
+        )).one()
+    return "|".join("" if value is None else str(value) for value in row)
+
+
+def data_version() -> str:
+    global _version
+    now = time.monotonic()
+    with _version_lock:
+        if _version is not None and now - _version[0] < _VERSION_TTL_SECONDS:
+            return _version[1]
+    version = _query_data_version()
+    with _version_lock:
+        _version = (now, version)
+    return version
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """Weak comparison (RFC 9110 13.1.2): a ``W/`` tag matches its strong form."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return etag.removeprefix("W/") in candidates
+
+
+def _respond(entry: _Entry, request: Request, cache_status: str) -> Response:
+    headers = {"ETag": entry.etag, "Cache-Control": "no-cache", "X-Cache": cache_status}
+    if _etag_matches(request.headers.get("if-none-match"), entry.etag):
+        return Response(status_code=304, headers=headers)
+    response = Response(content=entry.body, media_type=entry.media_type, headers=headers)
+    for name, value in entry.headers:
+        response.headers.append(name, value)
+    return response
+
+
+class CachedRoute(APIRoute):
+    """Route class serving GETs from ``response_cache`` with ETag revalidation."""
+
+    def get_route_handler(self) -> Callable:
+        handler = super().get_route_handler()
+
+        async def cached_handler(request: Request) -> Response:
+            if request.method != "GET":
+                return await handler(request)
+
+            version = await run_in_threadpool(data_version)
+            key = (request.url.path, tuple(sorted(request.query_params.multi_items())), version)
+
+            entry = response_cache.get(key)
+            if entry is not None:
+                return _respond(entry, request, "HIT")
+
+            response = await handler(request)
+            body = getattr(response, "body", None)
+            if response.status_code != 200 or body is None:
+                return response
+
+            entry = _Entry(
+                body=body,
+                headers=[
+                    (name, value) for name, value in response.headers.items()
+                    if name not in _SKIP_HEADERS
+                ],
+                media_type=response.headers.get("content-type"),
+                etag='"' + hashlib.sha256(body).hexdigest()[:32] + '"',
+                stored_at=time.monotonic(),
+            )
+            response_cache.put(key, entry)
+            return _respond(entry, request, "MISS")
+
+        return cached_handler
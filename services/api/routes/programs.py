@@ -1,14 +1,41 @@
 from __future__ import annotations
 
-import re
-from collections import Counter
-from fastapi import APIRouter, Depends
+import difflib
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query, Response
 from sqlmodel import Session, select, func
+from services.api.app.analytics_views import (
+    changes_per_day_view,
+    discipline_count_view,
+    program_summary_view,
+    school_count_view,
+    stream_count_view,
+)
+from services.api.app.cycles import cycle_sort_key, latest_match_cycle
 from services.api.app.database import get_session
-from services.api.app.models import Program, Discipline, ProgramChangeLog, School, ProgramStream
-from sqlalchemy import or_
-from sqlalchemy import cast, Date
-from datetime import datetime as dt
+from services.api.app.models import (
+    Program,
+    Discipline,
+    ProgramChangeLog,
+    ProgramFacts,
+    ProgramInterviewCriterion,
+    ProgramInterviewDate,
+    School,
+    ProgramStream,
+    ProgramVersion,
+)
+from services.api.app.program_facts import (
+    APP_COUNT_ORDER,
+    APPLICATION_STATS_KEYWORDS,
+    EVALUATION_CRITERIA_KEYWORDS,
+    INTERVIEW_SECTION_KEYWORDS,
+    PCT_ORDER,
+    STANDARD_CRITERIA,
+)
+from services.api.app.program_versions import reconstruct
+from services.api.app.response_cache import CachedRoute
+from sqlalchemy import case, literal, or_
 from fastapi import HTTPException
 # ── Shared keyword lists (EN + FR) ─────────────────────────────────
 
@@ -22,138 +49,395 @@ _CITIZENSHIP_KEYWORDS = [
     "%résidence permanente%",
 ]
 
-_INTERVIEW_SECTION_KEYWORDS = [
-    "%# Interview%",
-    # French
-    "%# Entrevue%",
-    "%# Entretien%",
-    "%#d'examen%",
-]
+router = APIRouter(route_class=CachedRoute)
 
-_APPLICATION_STATS_KEYWORDS = [
-    "%average number of applications%",
-    # French
-    "%nombre moyen de demandes%",
-    "%nombre moyen de candidatures%",
-]
 
-_EVALUATION_CRITERIA_KEYWORDS = [
-    "%interview evaluation criteria%",
-    # French
-    "%évaluation pour les entrevues%",
-    "%critères d'évaluation%",
-    "%critères de sélection%",
-    
-]
+def selected_cycle(
+    cycle: str | None = None,
+    session: Session = Depends(get_session),
+) -> str | None:
+    """The ``cycle`` query parameter, or the latest match cycle loaded.
 
-_INTERVIEW_OFFER_PCT_KEYWORDS = [
-    "%average percentage of applicants offered interviews%",
-    # French
-    "%pourcentage moyen%invités en entrevue%",
-    "%pourcentage moyen%offert%entrevue%",
-    "%nombre moyen de demandes%"
-]
+    Every query then filters on ``Program.match_cycle`` so Postgres only
+    scans that cycle's partition.
+    """
+    if cycle:
+        return cycle
+    return latest_match_cycle(session)
 
-router = APIRouter()
+
+def _resolve_name_ids(session: Session, model, value: str, match: str) -> list[int]:
+    """
+    Ids of the dimension rows whose name matches ``value``: ``contains`` is a
+    case-insensitive substring match, ``fuzzy`` a pg_trgm word similarity
+    match that tolerates typos ("cardiolgy" -> "Cardiology"). Both are
+    served by the trigram index on ``name``.
+    """
+    if match == "fuzzy":
+        condition = literal(value).op("<%")(model.name)
+    else:
+        condition = model.name.ilike(f"%{value}%")
+    return list(session.exec(select(model.id).where(condition)).all())
+
+
+# columns /programs can return; description is opt-in and embedding/search_vector never leave the DB
+_PROGRAM_FIELDS = {
+    "match_cycle": Program.match_cycle,
+    "program_stream_id": Program.program_stream_id,
+    "name": Program.name,
+    "site": Program.site,
+    "url": Program.url,
+    "discipline_id": Program.discipline_id,
+    "school_id": Program.school_id,
+    "stream_id": Program.stream_id,
+    "updated_at": Program.updated_at,
+    "cluster_id": Program.cluster_id,
+    "description": Program.description,
+}
+_DEFAULT_PROGRAM_FIELDS = [name for name in _PROGRAM_FIELDS if name != "description"]
 
 
 @router.get("/programs")
 def get_programs(
+    response: Response,
     program_stream_id: str | None = None,
     discipline: str | None = None,
     school: str | None = None,
     stream: str | None = None,
-    limit: int = 50,
+    match: Literal["contains", "fuzzy"] = "contains",
+    fields: str | None = None,
+    cursor: str | None = None,
+    limit: int = Query(50, ge=1, le=1000),
+    cycle: str | None = Depends(selected_cycle),
     session: Session = Depends(get_session),
 ):
-        query = select(Program)
-    
+        """Programs of a cycle in ``program_stream_id`` order, one page at a time.
+
+        ``fields`` is a comma-separated projection (default: everything but
+        ``description``); only those columns are read. Pages are keyset
+        paginated: pass the ``X-Next-Cursor`` response header back as
+        ``cursor`` to get the next page, which stays an index range scan on
+        the primary key however deep the page is. The header is absent on
+        the last page.
+        """
+        names = [f.strip() for f in fields.split(",") if f.strip()] if fields else _DEFAULT_PROGRAM_FIELDS
+        unknown = [name for name in names if name not in _PROGRAM_FIELDS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields {', '.join(unknown)}. Use any of: {', '.join(_PROGRAM_FIELDS)}",
+            )
+        # the cursor column is always selected
+        names = ["program_stream_id"] + [name for name in dict.fromkeys(names) if name != "program_stream_id"]
+
+        query = select(*[_PROGRAM_FIELDS[name] for name in names]).where(Program.match_cycle == cycle)
+
         if program_stream_id:
             query = query.where(Program.program_stream_id == program_stream_id)
+        if cursor:
+            query = query.where(Program.program_stream_id > cursor)
+
+        # names resolve to ids on the (small, trigram-indexed) dimension tables first,
+        # then programs are filtered on their indexed foreign keys
+        for value, model, fk in (
+            (discipline, Discipline, Program.discipline_id),
+            (school, School, Program.school_id),
+            (stream, ProgramStream, Program.stream_id),
+        ):
+            if value:
+                ids = _resolve_name_ids(session, model, value, match)
+                if not ids:
+                    return []
+                query = query.where(fk.in_(ids))
+
+        # one extra row tells whether there is a next page
+        rows = session.exec(query.order_by(Program.program_stream_id).limit(limit + 1)).all()
+        if len(rows) > limit:
+            rows = rows[:limit]
+            response.headers["X-Next-Cursor"] = rows[-1].program_stream_id
+
+        return [dict(zip(names, row)) for row in rows]
+
+
+# ts_headline options: up to two short fragments around the matched words
+_HEADLINE_OPTIONS = "StartSel=<mark>, StopSel=</mark>, MaxFragments=2, MaxWords=25, MinWords=8, FragmentDelimiter= … "
+
+
+@router.get("/programs/search")
+def search_programs(
+    q: str,
+    limit: int = Query(20, ge=1, le=100),
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
+    """Full-text search over program names and descriptions, best matches first.
 
-        if discipline:
-            query = query.join(Discipline).where(Discipline.name.ilike(f"%{discipline}%"))
+    ``q`` takes web-search syntax ("quoted phrases", or, -excluded) and is
+    matched in English and French, so "interviews" and "entrevues" both
+    find their stems. Uses the GIN index on ``Program.search_vector``.
+    """
+    en_query = func.websearch_to_tsquery("english", q)
+    fr_query = func.websearch_to_tsquery("french", q)
+    query = en_query.op("||")(fr_query)
+    rank = func.ts_rank(Program.search_vector, query)
+
+    # rank with the index first; headlines are costly so only the top rows get one
+    top = (
+        select(Program.match_cycle, Program.program_stream_id, rank.label("rank"))
+        .where(Program.match_cycle == cycle)
+        .where(Program.search_vector.op("@@")(query))
+        .order_by(rank.desc())
+        .limit(limit)
+        .subquery()
+    )
 
-        if school:
-            query = query.join(School).where(School.name.ilike(f"%{school}%"))
+    snippet = case(
+        (
+            func.to_tsvector("english", Program.description).op("@@")(en_query),
+            func.ts_headline("english", Program.description, en_query, _HEADLINE_OPTIONS),
+        ),
+        else_=func.ts_headline("french", Program.description, fr_query, _HEADLINE_OPTIONS),
+    )
 
-        if stream:
-            query = query.join(ProgramStream).where(ProgramStream.name.ilike(f"%{stream}%"))
+    result = session.exec(
+        select(
+            Program.program_stream_id,
+            Program.name,
+            Program.site,
+            Discipline.name.label("discipline"),
+            School.name.label("school"),
+            top.c.rank,
+            snippet,
+        )
+        .join(
+            top,
+            (top.c.match_cycle == Program.match_cycle)
+            & (top.c.program_stream_id == Program.program_stream_id),
+        )
+        .join(Discipline)
+        .join(School)
+        .where(Program.match_cycle == cycle)
+        .order_by(top.c.rank.desc(), Program.program_stream_id)
+    ).all()
+
+    return [
+        {
+            "program_stream_id": pid,
+            "name": name,
+            "site": site,
+            "discipline": discipline,
+            "school": school,
+            "rank": round(float(score), 4),
+            "snippet": text,
+        }
+        for pid, name, site, discipline, school, score, text in result
+    ]
 
-        results = session.exec(query.limit(limit)).all()
 
-        # Exclude embedding (numpy array) from JSON response
-        return [
-            r.model_dump(exclude={"embedding", "description_hash"}) for r in results
-        ]
+# ── Description history ─────────────────────────────────────────────
 
 
-@router.get("/analytics/summary")
-def summary(session: Session = Depends(get_session)):
-    """High-level counts for the whole dataset."""
-    total = session.exec(select(func.count(Program.program_stream_id))).one()
-    with_desc = session.exec(
-        select(func.count(Program.program_stream_id))
-        .where(Program.description.isnot(None))
+def _of_program(cycle: str | None, program_stream_id: str):
+    return (
+        (ProgramVersion.match_cycle == cycle)
+        & (ProgramVersion.program_stream_id == program_stream_id)
+    )
+
+
+def _version_text(session: Session, cycle: str | None, program_stream_id: str, version: int) -> str:
+    """Rebuild one version from its nearest snapshot and the deltas after it."""
+    of_program = _of_program(cycle, program_stream_id)
+    snapshot = session.exec(
+        select(func.max(ProgramVersion.version))
+        .where(of_program)
+        .where(ProgramVersion.is_snapshot)
+        .where(ProgramVersion.version <= version)
     ).one()
-    disciplines = session.exec(select(func.count(Discipline.id))).one()
-    schools = session.exec(select(func.count(School.id))).one()
-    streams = session.exec(select(func.count(ProgramStream.id))).one()
-    french_programs = session.exec(select(func.count(Program.program_stream_id)).where(Program.description.ilike("%Langue de candidature%"))).one()
-    english_programs = session.exec(select(func.count(Program.program_stream_id)).where(Program.description.ilike("%Program application language%"))).one()
-    return {
-        "total_programs": total,
-        "with_description": with_desc,
-        "disciplines": disciplines,
-        "schools": schools,
-        "streams": streams,
-        "french_programs": french_programs,
-        "english_programs": english_programs,
-    }
+    rows = session.exec(
+        select(ProgramVersion.version, ProgramVersion.is_snapshot, ProgramVersion.payload)
+        .where(of_program)
+        .where(ProgramVersion.version.between(snapshot, version))
+        .order_by(ProgramVersion.version)
+    ).all() if snapshot is not None else []
+
+    if not rows or rows[-1][0] != version:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No version {version} of program {program_stream_id} in cycle {cycle}",
+        )
+    return reconstruct((is_snapshot, payload) for _, is_snapshot, payload in rows)
 
 
-@router.get("/analytics/discipline-count")
-def discipline_counts(session: Session = Depends(get_session)):
+def _latest_version(session: Session, cycle: str | None, program_stream_id: str) -> int:
+    latest = session.exec(
+        select(func.max(ProgramVersion.version)).where(_of_program(cycle, program_stream_id))
+    ).one()
+    if latest is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No versions of program {program_stream_id} in cycle {cycle}",
+        )
+    return latest
+
+
+@router.get("/programs/{program_stream_id}/versions")
+def program_versions(
+    program_stream_id: str,
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
+    """Description revisions of a program, oldest first (without their text)."""
     result = session.exec(
         select(
-            Discipline.name,
-            func.count(Program.program_stream_id)
+            ProgramVersion.version,
+            ProgramVersion.created_at,
+            ProgramVersion.description_hash,
+            ProgramVersion.is_snapshot,
+            func.octet_length(ProgramVersion.payload),
         )
-        .join(Program)
-        .group_by(Discipline.name)
+        .where(_of_program(cycle, program_stream_id))
+        .order_by(ProgramVersion.version)
     ).all()
 
+    return [
+        {
+            "version": version,
+            "created_at": str(created_at),
+            "description_hash": description_hash,
+            "is_snapshot": is_snapshot,
+            "stored_bytes": stored_bytes,
+        }
+        for version, created_at, description_hash, is_snapshot, stored_bytes in result
+    ]
+
+
+@router.get("/programs/{program_stream_id}/versions/{version}")
+def program_version(
+    program_stream_id: str,
+    version: int,
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
+    """The full description as of one version."""
+    return {
+        "program_stream_id": program_stream_id,
+        "match_cycle": cycle,
+        "version": version,
+        "description": _version_text(session, cycle, program_stream_id, version),
+    }
+
+
+@router.get("/programs/{program_stream_id}/diff")
+def program_diff(
+    program_stream_id: str,
+    from_version: int | None = None,
+    to_version: int | None = None,
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
+    """Unified diff between two versions (default: the latest change)."""
+    if to_version is None:
+        to_version = _latest_version(session, cycle, program_stream_id)
+    if from_version is None:
+        from_version = max(to_version - 1, 1)
+
+    old = _version_text(session, cycle, program_stream_id, from_version)
+    new = _version_text(session, cycle, program_stream_id, to_version)
+    diff = difflib.unified_diff(
+        old.splitlines(keepends=True),
+        new.splitlines(keepends=True),
+        fromfile=f"v{from_version}",
+        tofile=f"v{to_version}",
+    )
+
+    return {
+        "program_stream_id": program_stream_id,
+        "match_cycle": cycle,
+        "from_version": from_version,
+        "to_version": to_version,
+        "diff": "".join(diff),
+    }
+
+
+@router.get("/analytics/cycles")
+def cycles(session: Session = Depends(get_session)):
+    """Match cycles loaded, newest first, with their program counts."""
+    result = session.exec(
+        select(Program.match_cycle, func.count(Program.program_stream_id))
+        .group_by(Program.match_cycle)
+    ).all()
+    result = sorted(result, key=lambda row: cycle_sort_key(row[0]), reverse=True)
+    return [{"match_cycle": cycle, "programs": cnt} for cycle, cnt in result]
+
+
+@router.get("/analytics/summary")
+def summary(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
+    """
+    High-level counts for one match cycle (precomputed in mv_program_summary).
+    disciplines / schools / streams count the whole dimension tables.
+    """
+    row = session.exec(
+        select(program_summary_view).where(program_summary_view.c.match_cycle == cycle)
+    ).first()
+    counts = {
+        name: getattr(row, name) if row else 0
+        for name in (
+            "total_programs", "with_description", "disciplines", "schools",
+            "streams", "french_programs", "english_programs",
+        )
+    }
+    return {
+        "match_cycle": cycle,
+        **counts,
+        # None until the first refresh_analytics_views run after loading the cycle
+        "refreshed_at": str(row.refreshed_at) if row else None,
+    }
+
+
+@router.get("/analytics/discipline-count")
+def discipline_counts(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
+    result = session.exec(
+        select(discipline_count_view.c.discipline, discipline_count_view.c.programs)
+        .where(discipline_count_view.c.match_cycle == cycle)
+    ).all()
     return [{"discipline": name, "count": count} for name, count in result]
 
 
 @router.get("/analytics/school-count")
-def school_counts(session: Session = Depends(get_session)):
+def school_counts(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     result = session.exec(
-        select(
-            School.name,
-            func.count(Program.program_stream_id)
-        )
-        .join(Program)
-        .group_by(School.name)
+        select(school_count_view.c.school, school_count_view.c.programs)
+        .where(school_count_view.c.match_cycle == cycle)
     ).all()
     return [{"school": name, "count": count} for name, count in result]
 
 
 @router.get("/analytics/stream-count")
-def stream_counts(session: Session = Depends(get_session)):
+def stream_counts(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     result = session.exec(
-        select(
-            ProgramStream.name,
-            func.count(Program.program_stream_id)
-        )
-        .join(Program)
-        .group_by(ProgramStream.name)
+        select(stream_count_view.c.stream, stream_count_view.c.programs)
+        .where(stream_count_view.c.match_cycle == cycle)
     ).all()
     return [{"stream": name, "count": count} for name, count in result]
 
 
 @router.get("/analytics/citizenship-mentions")
-def citizenship_mentions(session: Session = Depends(get_session)):
+def citizenship_mentions(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     """Programs whose description mentions Canadian citizenship / permanent residency."""
     
     filters = or_(*[Program.description.ilike(kw) for kw in _CITIZENSHIP_KEYWORDS])
@@ -168,6 +452,7 @@ def citizenship_mentions(session: Session = Depends(get_session)):
         )
         .join(Discipline)
         .join(School)
+        .where(Program.match_cycle == cycle)
         .where(Program.description.isnot(None))
         .where(filters)
     ).all()
@@ -186,240 +471,116 @@ def citizenship_mentions(session: Session = Depends(get_session)):
         ],
     }
 
-# ── Interview helpers ───────────────────────────────────────────────
-
-# French to English mapping for interview evaluation criteria
-_FR_TO_EN_CRITERIA: dict[str, str] = {
-    "Activités savantes":          "Scholarly activities",
-    "Collégialité":                "Collegiality",
-    "Compétences en collaboration":"Collaboration skills",
-    "Compétences en communication":"Communication skills",
-    "Compétences en leadership":   "Leadership skills",
-    "Intérêt envers la discipline":"Interest in the discipline",
-    "Intérêt envers le programme": "Interest in the program",
-    "Professionnalisme":           "Professionalism",
-    "Promotion de la santé":       "Health advocacy",
-    "Autres composants d'entrevue":"Other interview component(s)",
-}
-
-# Standard criteria (canonical English names, used for charts)
-_STANDARD_CRITERIA = [
-    "Collaboration skills",
-    "Collegiality",
-    "Communication skills",
-    "Health advocacy",
-    "Interest in the discipline",
-    "Interest in the program",
-    "Leadership skills",
-    "Professionalism",
-    "Scholarly activities",
-]
-
-# Canonical application-count buckets (order matters for charts)
-_APP_COUNT_ORDER = ["0 - 50", "51 - 200", "201 - 400", "401 - 600", "601 +"]
-
-# Canonical interview-offer-percentage buckets
-_PCT_ORDER = ["0 - 25 %", "26 - 50 %", "51 - 75 %", "76 - 100 %"]
-
-def _parse_interview_criteria(description: str) -> list[dict]:
-    """Return list of {criterion, evaluated} dicts from the criteria table.
-
-    Handles both English and French table formats and normalises French
-    criterion names to their English equivalents via ``_FR_TO_EN_CRITERIA``.
-    """
-    results: list[dict] = []
-    match = re.search(
-        r"Interview evaluation criteria\s*:\s*\n(.*?)(?:\n\n|\n#|\n\*\*|\Z)",
-        description, re.DOTALL,
-    )
-    if not match:
-        match = re.search(
-            r"[éÉe]valuation pour les entrevues\s*:\s*\n(.*?)(?:\n\n|\n#|\n\*\*|\Z)",
-            description, re.DOTALL,
-        )
-    if not match:
-        return results
-
-    skip = {"Interview components", "Composants d'entrevue"}
-
-    for line in match.group(1).split("\n"):
-        line = line.strip()
-        if "|" not in line or line.startswith("---"):
-            continue
-        parts = line.split("|", 1)
-        criterion = parts[0].strip()
-        detail = parts[1].strip() if len(parts) > 1 else ""
-        if not criterion or criterion in skip:
-            continue
-
-        # Normalise French → English
-        criterion = _FR_TO_EN_CRITERIA.get(criterion, criterion)
-
-        if criterion not in _STANDARD_CRITERIA:
-            continue
-
-        not_evaluated = any( # If any of the keywords are in the detail, the criterion is not evaluated
-            kw in detail.lower() 
-            for kw in [
-                "do not evaluate", "not formally", "not evaluated", "n/a", "do not offer" 
-                # French equivalents
-                "nous n'évaluons pas", "non évalué", "s/o",
-            ]
-        )
-        results.append({"criterion": criterion, "evaluated": not not_evaluated})
-    return results
-
-
-def _parse_interview_dates(description: str) -> list[str]:
-    """Extract interview dates (e.g. 'January 23, 2025') from the Interviews section."""
-    # Try English then French section headers
-    m = re.search(r"# (?:Interviews|Entrevues|Entretiens)\s*\nDates?\s*:\s*\n(.*?)(?:Details|Détails|$)", description, re.DOTALL)
-    if not m:
-        return []
-    return re.findall(r"(\w+ \d+, \d{4})", m.group(1))
-
-
-def _normalise_pct(raw: str) -> str:
-    """Normalise dash variants so '26–50 %' becomes '26 - 50 %'."""
-    return re.sub(r"\s*[–—-]\s*", " - ", raw).strip()
-
-
 # ── Interview endpoints ─────────────────────────────────────────────
 
 
 @router.get("/analytics/interview-dates")
-def interview_dates(session: Session = Depends(get_session)):
+def interview_dates(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     """Number of programs interviewing on each date."""
-    interview_filter = or_(*[Program.description.ilike(kw) for kw in _INTERVIEW_SECTION_KEYWORDS])
-    programs = session.exec(
-        select(Program).where(interview_filter)
+    result = session.exec(
+        select(
+            ProgramInterviewDate.date_text,
+            func.count(Program.program_stream_id),
+        )
+        .join(Program, Program.description_hash == ProgramInterviewDate.description_hash)
+        .where(Program.match_cycle == cycle)
+        .group_by(ProgramInterviewDate.date_text, ProgramInterviewDate.interview_date)
+        .order_by(ProgramInterviewDate.interview_date.asc().nulls_last(), ProgramInterviewDate.date_text) # Sort by date
     ).all()
 
-    counter: Counter[str] = Counter()
-    for p in programs:
-        seen: set[str] = set() # To avoid counting the same date multiple times
-        for d in _parse_interview_dates(p.description or ""):
-            if d not in seen:
-                seen.add(d)
-                counter[d] += 1
-
-    def _sort_key(item: tuple[str, int]) -> dt:
-        try:
-            return dt.strptime(item[0], "%B %d, %Y") # datetime obj
-        except ValueError:
-            return dt.max
-
-    return [
-        {"date": date, "programs": cnt}
-        for date, cnt in sorted(counter.items(), key=_sort_key) # Sort by date
-    ]
+    return [{"date": date, "programs": cnt} for date, cnt in result]
 
 
 @router.get("/analytics/applications-received")
-def applications_received(session: Session = Depends(get_session)):
+def applications_received(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     """Distribution of 'Average number of applications received' ranges."""
-    app_filter = or_(*[Program.description.ilike(kw) for kw in _APPLICATION_STATS_KEYWORDS])
-    programs = session.exec(
-        select(Program).where(app_filter)
-    ).all()
-
-    counter: Counter[str] = Counter()
-    for p in programs:
-        m = re.search(
-            r"Average number of applications received by our program in the last five years\s*:\s*(.+?)(?:\n|$)",
-            p.description or "",
-        )
-        if not m:
-           m = re.search(
-               r"Nombre moyen de demandes soumises au programme pendant les cinq dernières années\s*:\s*(.+?)(?:\n|$)",
-               p.description or "",
-           )
-        if m:
-            raw = m.group(1).strip().rstrip("  ")
-            # Map to canonical bucket
-            for bucket in _APP_COUNT_ORDER:
-                if bucket in raw:
-                    counter[bucket] += 1
-                    break
-            else:
-                counter[raw] += 1  # keep as-is if no match
+    counts = dict(session.exec(
+        select(ProgramFacts.application_bucket, func.count(Program.program_stream_id))
+        .join(Program, Program.description_hash == ProgramFacts.description_hash)
+        .where(Program.match_cycle == cycle)
+        .where(ProgramFacts.application_bucket.in_(APP_COUNT_ORDER))
+        .group_by(ProgramFacts.application_bucket)
+    ).all())
 
     # Return in canonical order
     return [
-        {"range": bucket, "count": counter.get(bucket, 0)}
-        for bucket in _APP_COUNT_ORDER
-        if counter.get(bucket, 0) > 0
+        {"range": bucket, "count": counts[bucket]}
+        for bucket in APP_COUNT_ORDER
+        if counts.get(bucket, 0) > 0
     ]
 
 
 @router.get("/analytics/applications-received-by-discipline")
-def applications_received_by_discipline(session: Session = Depends(get_session)):
+def applications_received_by_discipline(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     """Application-count ranges broken down by discipline."""
-    app_filter = or_(*[Program.description.ilike(kw) for kw in _APPLICATION_STATS_KEYWORDS])
-    programs = session.exec(
-        select(Program, Discipline.name.label("discipline_name"))
-        .join(Discipline)
-        .where(app_filter)
+    result = session.exec(
+        select(
+            Discipline.name,
+            ProgramFacts.application_bucket,
+            func.count(Program.program_stream_id),
+        )
+        .join(Program, Program.discipline_id == Discipline.id)
+        .join(ProgramFacts, ProgramFacts.description_hash == Program.description_hash)
+        .where(Program.match_cycle == cycle)
+        .where(ProgramFacts.application_bucket.in_(APP_COUNT_ORDER))
+        .group_by(Discipline.name, ProgramFacts.application_bucket)
     ).all()
 
-    data: dict[str, Counter[str]] = {}
-    for prog, disc_name in programs:
-        m = re.search(
-            r"Average number of applications received by our program in the last five years\s*:\s*(.+?)(?:\n|$)",
-            prog.description or "",
-        )
-        if not m:
-            m = re.search(
-                r"Nombre moyen de demandes soumises au programme pendant les cinq dernières années\s*:\s*(.+?)(?:\n|$)",
-                prog.description or "",
-            )
-        if not m:
-            continue
-        raw = m.group(1).strip().rstrip("  ")
-        bucket = raw
-        for b in _APP_COUNT_ORDER:
-            if b in raw:
-                bucket = b
-                break
-        data.setdefault(disc_name, Counter())[bucket] += 1
-
-    rows = []
-    for disc in sorted(data):
-        for bucket in _APP_COUNT_ORDER:
-            cnt = data[disc].get(bucket, 0)
-            if cnt:
-                rows.append({"discipline": disc, "range": bucket, "count": cnt})
-    return rows
+    order = {bucket: i for i, bucket in enumerate(APP_COUNT_ORDER)}
+    return [
+        {"discipline": disc, "range": bucket, "count": cnt}
+        for disc, bucket, cnt in sorted(result, key=lambda r: (r[0], order[r[1]]))
+    ]
+
 
 @router.get("/analytics/description-coverage")
-def description_coverage(session: Session = Depends(get_session)):
+def description_coverage(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     """How many programs have each structured section in their description."""
     total = session.exec(
         select(func.count(Program.program_stream_id))
+        .where(Program.match_cycle == cycle)
     ).one()
     with_desc = session.exec(
         select(func.count(Program.program_stream_id))
+        .where(Program.match_cycle == cycle)
         .where(Program.description.isnot(None))
     ).one()
     with_interviews = session.exec(
         select(func.count(Program.program_stream_id))
-        .where(or_(*[Program.description.ilike(kw) for kw in _INTERVIEW_SECTION_KEYWORDS]))
+        .where(Program.match_cycle == cycle)
+        .where(or_(*[Program.description.ilike(kw) for kw in INTERVIEW_SECTION_KEYWORDS]))
     ).one()
     with_apps = session.exec(
         select(func.count(Program.program_stream_id))
-        .where(or_(*[Program.description.ilike(kw) for kw in _APPLICATION_STATS_KEYWORDS]))
+        .where(Program.match_cycle == cycle)
+        .where(or_(*[Program.description.ilike(kw) for kw in APPLICATION_STATS_KEYWORDS]))
     ).one()
     with_criteria = session.exec(
         select(func.count(Program.program_stream_id))
-        .where(or_(*[Program.description.ilike(kw) for kw in _EVALUATION_CRITERIA_KEYWORDS]))
+        .where(Program.match_cycle == cycle)
+        .where(or_(*[Program.description.ilike(kw) for kw in EVALUATION_CRITERIA_KEYWORDS]))
     ).one()
     with_citizenship = session.exec(
         select(func.count(Program.program_stream_id))
+        .where(Program.match_cycle == cycle)
         .where(Program.description.isnot(None))
         .where(or_(*[Program.description.ilike(kw) for kw in _CITIZENSHIP_KEYWORDS]))
     ).one()
     with_embedding = session.exec(
         select(func.count(Program.program_stream_id))
+        .where(Program.match_cycle == cycle)
         .where(Program.embedding.isnot(None))
     ).one()
 
@@ -439,6 +600,7 @@ def description_coverage(session: Session = Depends(get_session)):
 @router.get("/analytics/missing-section")
 def missing_section(
     section: str = "interview",
+    cycle: str | None = Depends(selected_cycle),
     session: Session = Depends(get_session),
 ):
     """Return program IDs that are missing a given description section.
@@ -447,9 +609,9 @@ def missing_section(
       interview | applications | criteria | citizenship
     """
     section_filters = {
-        "interview": or_(*[Program.description.ilike(kw) for kw in _INTERVIEW_SECTION_KEYWORDS]),
-        "applications": or_(*[Program.description.ilike(kw) for kw in _APPLICATION_STATS_KEYWORDS]),
-        "criteria": or_(*[Program.description.ilike(kw) for kw in _EVALUATION_CRITERIA_KEYWORDS]),
+        "interview": or_(*[Program.description.ilike(kw) for kw in INTERVIEW_SECTION_KEYWORDS]),
+        "applications": or_(*[Program.description.ilike(kw) for kw in APPLICATION_STATS_KEYWORDS]),
+        "criteria": or_(*[Program.description.ilike(kw) for kw in EVALUATION_CRITERIA_KEYWORDS]),
         "citizenship": or_(*[Program.description.ilike(kw) for kw in _CITIZENSHIP_KEYWORDS]),
     }
 
@@ -464,6 +626,8 @@ def missing_section(
 
     # IDs of programs that DO have the section
     sub = select(Program.program_stream_id).where(
+        Program.match_cycle == cycle
+    ).where(
         Program.description.isnot(None)
     ).where(has_filter)
 
@@ -478,6 +642,7 @@ def missing_section(
         )
         .join(Discipline)
         .join(School)
+        .where(Program.match_cycle == cycle)
         .where(Program.program_stream_id.notin_(sub))
         .order_by(Program.program_stream_id)
     ).all()
@@ -499,157 +664,131 @@ def missing_section(
 
 
 @router.get("/analytics/interview-offer-pct")
-def interview_offer_pct(session: Session = Depends(get_session)):
+def interview_offer_pct(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     """Distribution of 'Average percentage of applicants offered interviews'."""
-    pct_filter = or_(*[Program.description.ilike(kw) for kw in _INTERVIEW_OFFER_PCT_KEYWORDS])
-    programs = session.exec(
-        select(Program).where(pct_filter)
-    ).all()
+    counts = dict(session.exec(
+        select(ProgramFacts.interview_offer_bucket, func.count(Program.program_stream_id))
+        .join(Program, Program.description_hash == ProgramFacts.description_hash)
+        .where(Program.match_cycle == cycle)
+        .where(ProgramFacts.interview_offer_bucket.isnot(None))
+        .group_by(ProgramFacts.interview_offer_bucket)
+    ).all())
 
-    counter: Counter[str] = Counter()
-    for p in programs:
-        m = re.search(
-            r"Average percentage of applicants offered interviews\s*:\s*(.+?)(?:\n|$)",
-            p.description or "",
-        )
-        if not m:
-            m = re.search(
-                r"Pourcentage moyen de candidats invités à une entrevue\s*:\s*(.+?)(?:\n|$)",
-                p.description or "",
-            )
-        if m:
-            raw = _normalise_pct(m.group(1).strip().rstrip("  "))
-            for bucket in _PCT_ORDER:
-                if bucket in raw:
-                    counter[bucket] += 1
-                    break
-            else:
-                counter[raw] += 1
-
-    total = sum(counter.values())
+    # non-canonical answers count towards the total but aren't listed
+    total = sum(counts.values())
 
     return {
         "total_programs": total,
         "distribution": [
             {
                 "range": bucket,
-                "count": counter.get(bucket, 0),
+                "count": counts[bucket],
                 "percentage": round(
-                    counter.get(bucket, 0) / total * 100, 2
+                    counts[bucket] / total * 100, 2
                 ) if total else 0
             }
-            for bucket in _PCT_ORDER
-            if counter.get(bucket, 0) > 0
+            for bucket in PCT_ORDER
+            if counts.get(bucket, 0) > 0
         ]
     }
 
 
 @router.get("/analytics/interview-offer-pct-by-discipline")
-def interview_offer_pct_by_discipline(session: Session = Depends(get_session)):
+def interview_offer_pct_by_discipline(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     """Interview-offer percentage ranges broken down by discipline."""
-    pct_filter = or_(*[Program.description.ilike(kw) for kw in _INTERVIEW_OFFER_PCT_KEYWORDS])
-    programs = session.exec(
-        select(Program, Discipline.name.label("discipline_name"))
-        .join(Discipline)
-        .where(pct_filter)
+    result = session.exec(
+        select(
+            Discipline.name,
+            ProgramFacts.interview_offer_bucket,
+            func.count(Program.program_stream_id),
+        )
+        .join(Program, Program.discipline_id == Discipline.id)
+        .join(ProgramFacts, ProgramFacts.description_hash == Program.description_hash)
+        .where(Program.match_cycle == cycle)
+        .where(ProgramFacts.interview_offer_bucket.in_(PCT_ORDER))
+        .group_by(Discipline.name, ProgramFacts.interview_offer_bucket)
     ).all()
 
-    data: dict[str, Counter[str]] = {}
-    for prog, disc_name in programs:
-        m = re.search(
-            r"Average percentage of applicants offered interviews\s*:\s*(.+?)(?:\n|$)",
-            prog.description or "",
-        )
-        if not m:
-            m = re.search(
-                r"Pourcentage moyen de candidats invités à une entrevue\s*:\s*(.+?)(?:\n|$)",
-                prog.description or "",
-            )
-        if not m:
-            continue
-        raw = _normalise_pct(m.group(1).strip().rstrip("  "))
-        bucket = raw
-        for b in _PCT_ORDER:
-            if b in raw:
-                bucket = b
-                break
-        data.setdefault(disc_name, Counter())[bucket] += 1
-
-    rows = []
-    for disc in sorted(data):
-        for bucket in _PCT_ORDER:
-            cnt = data[disc].get(bucket, 0)
-            if cnt:
-                rows.append({"discipline": disc, "range": bucket, "count": cnt})
-    return rows
+    order = {bucket: i for i, bucket in enumerate(PCT_ORDER)}
+    return [
+        {"discipline": disc, "range": bucket, "count": cnt}
+        for disc, bucket, cnt in sorted(result, key=lambda r: (r[0], order[r[1]]))
+    ]
 
 
 @router.get("/analytics/interview-criteria")
-def interview_criteria_counts(session: Session = Depends(get_session)):
+def interview_criteria_counts(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     """How many programs evaluate each standard interview criterion."""
-    criteria_filter = or_(*[Program.description.ilike(kw) for kw in _EVALUATION_CRITERIA_KEYWORDS])
-    programs = session.exec(
-        select(Program).where(criteria_filter)
+    result = session.exec(
+        select(
+            ProgramInterviewCriterion.criterion,
+            ProgramInterviewCriterion.evaluated,
+            func.count(Program.program_stream_id),
+        )
+        .join(Program, Program.description_hash == ProgramInterviewCriterion.description_hash)
+        .where(Program.match_cycle == cycle)
+        .group_by(ProgramInterviewCriterion.criterion, ProgramInterviewCriterion.evaluated)
     ).all()
 
-    evaluated_counter: Counter[str] = Counter()
-    not_evaluated_counter: Counter[str] = Counter()
-
-    for p in programs:
-        for item in _parse_interview_criteria(p.description or ""):
-            if item["evaluated"]:
-                evaluated_counter[item["criterion"]] += 1
-            else:
-                not_evaluated_counter[item["criterion"]] += 1
-
+    counts = {(crit, evaluated): cnt for crit, evaluated, cnt in result}
     return [
         {
             "criterion": crit,
-            "evaluated": evaluated_counter.get(crit, 0),
-            "not_evaluated": not_evaluated_counter.get(crit, 0),
+            "evaluated": counts.get((crit, True), 0),
+            "not_evaluated": counts.get((crit, False), 0),
         }
-        for crit in _STANDARD_CRITERIA
+        for crit in STANDARD_CRITERIA
     ]
 
 
 @router.get("/analytics/interview-criteria-by-discipline")
-def interview_criteria_by_discipline(session: Session = Depends(get_session)):
+def interview_criteria_by_discipline(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     """Count of programs evaluating each criterion, grouped by discipline."""
-    criteria_filter = or_(*[Program.description.ilike(kw) for kw in _EVALUATION_CRITERIA_KEYWORDS])
-    programs = session.exec(
-        select(Program, Discipline.name.label("discipline_name"))
-        .join(Discipline)
-        .where(criteria_filter)
+    result = session.exec(
+        select(
+            Discipline.name,
+            ProgramInterviewCriterion.criterion,
+            func.count(Program.program_stream_id),
+        )
+        .join(Program, Program.discipline_id == Discipline.id)
+        .join(
+            ProgramInterviewCriterion,
+            ProgramInterviewCriterion.description_hash == Program.description_hash,
+        )
+        .where(Program.match_cycle == cycle)
+        .where(ProgramInterviewCriterion.evaluated)
+        .group_by(Discipline.name, ProgramInterviewCriterion.criterion)
+        .order_by(Discipline.name, ProgramInterviewCriterion.criterion)
     ).all()
 
-    # {discipline: {criterion: evaluated_count}}
-    data: dict[str, Counter[str]] = {}
-    for prog, disc_name in programs:
-        if disc_name not in data:
-            data[disc_name] = Counter()
-        for item in _parse_interview_criteria(prog.description or ""):
-            if item["evaluated"]:
-                data[disc_name][item["criterion"]] += 1
-
-    rows = []
-    for disc, counts in sorted(data.items()):
-        for crit, cnt in counts.items():
-            rows.append({"discipline": disc, "criterion": crit, "count": cnt})
+    return [
+        {"discipline": disc, "criterion": crit, "count": cnt}
+        for disc, crit, cnt in result
+    ]
 
-    return rows
 
 @router.get("/analytics/changes-over-time")
-def changes_over_time(session: Session = Depends(get_session)):
+def changes_over_time(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     """Description changes grouped by date."""
-    
-
     result = session.exec(
-        select(
-            cast(ProgramChangeLog.changed_at, Date).label("date"),
-            func.count().label("changes"),
-        )
-        .group_by("date")
-        .order_by("date")
+        select(changes_per_day_view.c.date, changes_per_day_view.c.changes)
+        .where(changes_per_day_view.c.match_cycle == cycle)
+        .order_by(changes_per_day_view.c.date)
     ).all()
 
     return [
@@ -659,10 +798,14 @@ def changes_over_time(session: Session = Depends(get_session)):
 
 
 @router.get("/analytics/recent-changes")
-def recent_changes(session: Session = Depends(get_session)):
+def recent_changes(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     """The 50 most recent description changes."""
     logs = session.exec(
         select(ProgramChangeLog)
+        .where(ProgramChangeLog.match_cycle == cycle)
         .order_by(ProgramChangeLog.changed_at.desc())
         .limit(50)
     ).all()
@@ -679,13 +822,17 @@ def recent_changes(session: Session = Depends(get_session)):
 
 
 @router.get("/analytics/most-changed-programs")
-def most_changed_programs(session: Session = Depends(get_session)):
+def most_changed_programs(
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
     """Programs with the most description changes."""
     result = session.exec(
         select(
             ProgramChangeLog.program_stream_id,
             func.count().label("changes"),
         )
+        .where(ProgramChangeLog.match_cycle == cycle)
         .group_by(ProgramChangeLog.program_stream_id)
         .order_by(func.count().desc())
         .limit(30)
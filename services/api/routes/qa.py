@@ -3,6 +3,7 @@ from pydantic import BaseModel
 from sqlmodel import Session
 from services.api.app.llm.qa import ask_hybrid, qa
 from services.api.app.database import get_session
+from services.api.routes.programs import selected_cycle
 
 router = APIRouter()
 
@@ -10,5 +11,9 @@ class QuestionRequest(BaseModel):
     question: str
  
 @router.post("/qa")
-def ask_question(request: QuestionRequest, session: Session = Depends(get_session)):
-    return ask_hybrid(session, request.question)
\ No newline at end of file
+def ask_question(
+    request: QuestionRequest,
+    cycle: str | None = Depends(selected_cycle),
+    session: Session = Depends(get_session),
+):
+    return ask_hybrid(session, request.question, cycle)
\ No newline at end of file
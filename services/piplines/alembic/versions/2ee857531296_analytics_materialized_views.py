@@ -0,0 +1,86 @@
+"""analytics materialized views
+
+Revision ID: 2ee857531296
+Revises: 71373c709ad8
+Create Date: 2026-10-17 15:41:27.306915
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '2ee857531296'
+down_revision: Union[str, Sequence[str], None] = '71373c709ad8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# name -> (query, columns of its unique index), as of this revision
+_VIEWS = {
+    "mv_program_summary": (
+        """
+        SELECT match_cycle,
+               count(*) AS total_programs,
+               count(description) AS with_description,
+               (SELECT count(*) FROM discipline) AS disciplines,
+               (SELECT count(*) FROM school) AS schools,
+               (SELECT count(*) FROM programstream) AS streams,
+               count(*) FILTER (WHERE description ILIKE '%Langue de candidature%') AS french_programs,
+               count(*) FILTER (WHERE description ILIKE '%Program application language%') AS english_programs,
+               now() AS refreshed_at
+        FROM program
+        GROUP BY match_cycle
+        """,
+        ("match_cycle",),
+    ),
+    "mv_discipline_count": (
+        """
+        SELECT p.match_cycle, d.name AS discipline, count(*) AS programs
+        FROM program p
+        JOIN discipline d ON d.id = p.discipline_id
+        GROUP BY p.match_cycle, d.name
+        """,
+        ("match_cycle", "discipline"),
+    ),
+    "mv_school_count": (
+        """
+        SELECT p.match_cycle, s.name AS school, count(*) AS programs
+        FROM program p
+        JOIN school s ON s.id = p.school_id
+        GROUP BY p.match_cycle, s.name
+        """,
+        ("match_cycle", "school"),
+    ),
+    "mv_stream_count": (
+        """
+        SELECT p.match_cycle, st.name AS stream, count(*) AS programs
+        FROM program p
+        JOIN programstream st ON st.id = p.stream_id
+        GROUP BY p.match_cycle, st.name
+        """,
+        ("match_cycle", "stream"),
+    ),
+    "mv_changes_per_day": (
+        """
+        SELECT match_cycle, changed_at::date AS date, count(*) AS changes
+        FROM programchangelog
+        GROUP BY match_cycle, changed_at::date
+        """,
+        ("match_cycle", "date"),
+    ),
+}
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for name, (query, unique_columns) in _VIEWS.items():
+        op.execute(f"CREATE MATERIALIZED VIEW {name} AS {query}")
+        # REFRESH ... CONCURRENTLY needs a unique index
+        op.execute(f"CREATE UNIQUE INDEX ux_{name} ON {name} ({', '.join(unique_columns)})")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for name in reversed(list(_VIEWS)):
+        op.execute(f"DROP MATERIALIZED VIEW IF EXISTS {name}")
@@ -0,0 +1,29 @@
+"""fingerprint skip reason
+
+Revision ID: 4b6e2d91c7a3
+Revises: 9de718597fa0
+Create Date: 2026-10-17 18:05:12.640291
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4b6e2d91c7a3'
+down_revision: Union[str, Sequence[str], None] = '9de718597fa0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('rawrecordfingerprint', sa.Column('skip_reason', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('rawrecordfingerprint', 'skip_reason')
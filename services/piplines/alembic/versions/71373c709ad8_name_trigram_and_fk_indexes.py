@@ -0,0 +1,39 @@
+"""name trigram and fk indexes
+
+Revision ID: 71373c709ad8
+Revises: 95eecd22521c
+Create Date: 2026-10-17 15:02:44.913027
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '71373c709ad8'
+down_revision: Union[str, Sequence[str], None] = '95eecd22521c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_DIMENSIONS = ('discipline', 'school', 'programstream')
+_PROGRAM_FKS = ('discipline_id', 'school_id', 'stream_id')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for table in _DIMENSIONS:
+        op.create_index(f'ix_{table}_name_trgm', table, ['name'], unique=False,
+                        postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'})
+    # created on the partitioned parent, so every cycle partition gets them
+    for column in _PROGRAM_FKS:
+        op.create_index(op.f(f'ix_program_{column}'), 'program', [column], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    for column in _PROGRAM_FKS:
+        op.drop_index(op.f(f'ix_program_{column}'), table_name='program')
+    for table in _DIMENSIONS:
+        op.drop_index(f'ix_{table}_name_trgm', table_name=table)
@@ -0,0 +1,43 @@
+"""program search vector
+
+Revision ID: 95eecd22521c
+Revises: 9e9ee90ba123
+Create Date: 2026-10-17 14:30:09.581264
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '95eecd22521c'
+down_revision: Union[str, Sequence[str], None] = '9e9ee90ba123'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # rewrites every program partition once to fill the stored column
+    op.add_column('program', sa.Column(
+        'search_vector',
+        postgresql.TSVECTOR(),
+        sa.Computed(
+            "setweight(to_tsvector('english'::regconfig, coalesce(name, '')), 'A') || "
+            "setweight(to_tsvector('english'::regconfig, coalesce(description, '')), 'B') || "
+            "setweight(to_tsvector('french'::regconfig, coalesce(description, '')), 'B')",
+            persisted=True,
+        ),
+        nullable=True,
+    ))
+    op.create_index('ix_program_search_vector', 'program', ['search_vector'], unique=False,
+                    postgresql_using='gin')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_program_search_vector', table_name='program')
+    op.drop_column('program', 'search_vector')
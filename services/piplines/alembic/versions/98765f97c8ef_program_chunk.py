@@ -0,0 +1,50 @@
+"""program chunk
+
+Revision ID: 98765f97c8ef
+Revises: e3fa53a62a3e
+Create Date: 2026-10-17 10:48:02.114736
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+import pgvector.sqlalchemy
+
+# revision identifiers, used by Alembic.
+revision: str = '98765f97c8ef'
+down_revision: Union[str, Sequence[str], None] = 'e3fa53a62a3e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('programchunk',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('program_stream_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('chunk_index', sa.Integer(), nullable=False),
+    sa.Column('section', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('content', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('content_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('description_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('embedding', pgvector.sqlalchemy.vector.VECTOR(dim=1536), nullable=True),
+    sa.ForeignKeyConstraint(['program_stream_id'], ['program.program_stream_id'], ),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('program_stream_id', 'chunk_index')
+    )
+    op.create_index(op.f('ix_programchunk_program_stream_id'), 'programchunk', ['program_stream_id'], unique=False)
+    op.create_index(op.f('ix_programchunk_section'), 'programchunk', ['section'], unique=False)
+    op.create_index(op.f('ix_programchunk_content_hash'), 'programchunk', ['content_hash'], unique=False)
+    op.create_index('ix_programchunk_embedding_hnsw', 'programchunk', ['embedding'], unique=False,
+                    postgresql_using='hnsw', postgresql_ops={'embedding': 'vector_cosine_ops'})
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_programchunk_embedding_hnsw', table_name='programchunk')
+    op.drop_index(op.f('ix_programchunk_content_hash'), table_name='programchunk')
+    op.drop_index(op.f('ix_programchunk_section'), table_name='programchunk')
+    op.drop_index(op.f('ix_programchunk_program_stream_id'), table_name='programchunk')
+    op.drop_table('programchunk')
@@ -0,0 +1,63 @@
+"""program facts
+
+Revision ID: 9c3dd9b8a249
+Revises: 98765f97c8ef
+Create Date: 2026-10-17 11:36:27.550913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9c3dd9b8a249'
+down_revision: Union[str, Sequence[str], None] = '98765f97c8ef'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('programfacts',
+    sa.Column('description_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('application_bucket', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('interview_offer_bucket', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('extractor_version', sa.Integer(), nullable=False),
+    sa.Column('extracted_at', sa.DateTime(), nullable=False),
+    sa.PrimaryKeyConstraint('description_hash')
+    )
+    op.create_index(op.f('ix_programfacts_application_bucket'), 'programfacts', ['application_bucket'], unique=False)
+    op.create_index(op.f('ix_programfacts_interview_offer_bucket'), 'programfacts', ['interview_offer_bucket'], unique=False)
+    op.create_table('programinterviewdate',
+    sa.Column('description_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('date_text', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('interview_date', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['description_hash'], ['programfacts.description_hash'], ),
+    sa.PrimaryKeyConstraint('description_hash', 'date_text')
+    )
+    op.create_index(op.f('ix_programinterviewdate_interview_date'), 'programinterviewdate', ['interview_date'], unique=False)
+    op.create_table('programinterviewcriterion',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('description_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('criterion', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('evaluated', sa.Boolean(), nullable=False),
+    sa.ForeignKeyConstraint(['description_hash'], ['programfacts.description_hash'], ),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_programinterviewcriterion_description_hash'), 'programinterviewcriterion', ['description_hash'], unique=False)
+    op.create_index(op.f('ix_programinterviewcriterion_criterion'), 'programinterviewcriterion', ['criterion'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_programinterviewcriterion_criterion'), table_name='programinterviewcriterion')
+    op.drop_index(op.f('ix_programinterviewcriterion_description_hash'), table_name='programinterviewcriterion')
+    op.drop_table('programinterviewcriterion')
+    op.drop_index(op.f('ix_programinterviewdate_interview_date'), table_name='programinterviewdate')
+    op.drop_table('programinterviewdate')
+    op.drop_index(op.f('ix_programfacts_interview_offer_bucket'), table_name='programfacts')
+    op.drop_index(op.f('ix_programfacts_application_bucket'), table_name='programfacts')
+    op.drop_table('programfacts')
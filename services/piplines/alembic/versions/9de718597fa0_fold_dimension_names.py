@@ -0,0 +1,124 @@
+"""fold dimension names
+
+Revision ID: 9de718597fa0
+Revises: 2ee857531296
+Create Date: 2026-10-17 16:20:31.518204
+
+"""
+import unicodedata
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9de718597fa0'
+down_revision: Union[str, Sequence[str], None] = '2ee857531296'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# French -> English names as of this revision, keyed by _fold(name). Frozen
+# here so later edits to the parser's normalization tables don't change
+# what this revision does.
+_SCHOOL_NAMES = {
+    'universite mcgill': 'McGill University',
+    "universite d'ottawa": 'University of Ottawa',
+    'universite de montreal': 'University of Montreal',
+    'universite de sherbrooke': 'University of Sherbrooke',
+}
+_DISCIPLINE_NAMES = {
+    'anesthesiologie': 'Anesthesiology',
+    'chirurgie cardiaque': 'Cardiac Surgery',
+    'chirurgie generale': 'General Surgery',
+    'chirurgie orthopedique': 'Orthopedic Surgery',
+    'chirurgie plastique': 'Plastic Surgery',
+    'chirurgie vasculaire': 'Vascular Surgery',
+    'dermatologie': 'Dermatology',
+    'genetique et genomique medicales': 'Medical Genetics and Genomics',
+    "medecine d'urgence": 'Emergency Medicine',
+    'medecine familiale': 'Family Medicine',
+    'medecine interne': 'Internal Medicine',
+    'medecine nucleaire': 'Nuclear Medicine',
+    'medecine physique et readaptation': 'Physical Medicine & Rehabilitation',
+    'neurochirurgie': 'Neurosurgery',
+    'neurologie': 'Neurology',
+    "neurologie chez l'enfant": 'Neurology',
+    'obstetrique et gynecologie': 'Obstetrics and Gynecology',
+    'ophtalmologie': 'Ophthalmology',
+    'oto-rhino-laryngologie et chirurgie cervico': 'Otolaryngology',
+    'oto-rhino-laryngologie et chirurgie cervico-faciale': 'Otolaryngology',
+    'oto-rhino-laryngologie et chirurgie cervico- faciale': 'Otolaryngology',
+    'oto-rhino-laryngologie': 'Otolaryngology',
+    'pathologie diagnostique et moleculaire': 'Pathology',
+    'pediatrie': 'Pediatrics',
+    'psychiatrie': 'Psychiatry',
+    'sante publique et medecine preventive': 'Public Health and Preventive Medicine',
+    'urologie': 'Urology',
+    'radio-oncologie': 'Radiation Oncology',
+    'radiologie diagnostic': 'Diagnostic Radiology',
+}
+_STREAM_NAMES = {
+    'groupe regulier pour tous': 'Regular Stream for All',
+    'groupe regulier incluant motp/mmtp pour tous': 'Regular Stream including MOTP/MMTP for All',
+    'groupe regulier - service post-formation pour tous': 'Regular RoS Stream for All',
+    'groupe dcm pour dcm': 'CMG Stream for CMG',
+    'groupe regulier incluant pimm/pmem pour tous': 'Regular Stream including MOTP/MMTP for All',
+    'groupe dcm incluant pimm/pmem pour dcm': 'CMG Stream including MOTP/MMTP for CMG',
+}
+
+# dimension table -> (program column, names)
+_DIMENSIONS = {
+    'school': ('school_id', _SCHOOL_NAMES),
+    'discipline': ('discipline_id', _DISCIPLINE_NAMES),
+    'programstream': ('stream_id', _STREAM_NAMES),
+}
+
+_VIEWS = ('mv_program_summary', 'mv_discipline_count', 'mv_school_count', 'mv_stream_count')
+
+
+def _fold(text: str) -> str:
+    """NFKC, case-folded, accents removed, apostrophes straightened, whitespace collapsed."""
+    text = unicodedata.normalize('NFKC', text).strip().casefold().replace('’', "'")
+    text = ''.join(ch for ch in unicodedata.normalize('NFKD', text) if not unicodedata.combining(ch))
+    return ' '.join(text.split())
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The parser now folds case and accents before translating, so e.g.
+    # 'Université de Montréal' parses to 'University of Montreal' where it
+    # used to be kept as written. Reloads only touch changed records, so
+    # move every program onto the English row and drop the French one.
+    conn = op.get_bind()
+    for table, (column, names) in _DIMENSIONS.items():
+        rows = conn.execute(sa.text(f'SELECT id, name FROM {table}')).all()
+        for old_id, name in rows:
+            english = names.get(_fold(name))
+            if not english or english == name:
+                continue
+            conn.execute(
+                sa.text(f'INSERT INTO {table} (name) VALUES (:name) ON CONFLICT (name) DO NOTHING'),
+                {'name': english},
+            )
+            new_id = conn.execute(
+                sa.text(f'SELECT id FROM {table} WHERE name = :name'), {'name': english}
+            ).scalar_one()
+            conn.execute(
+                sa.text(
+                    f"UPDATE program SET {column} = :new_id, updated_at = now() AT TIME ZONE 'utc' "
+                    f"WHERE {column} = :old_id"
+                ),
+                {'new_id': new_id, 'old_id': old_id},
+            )
+            conn.execute(sa.text(f'DELETE FROM {table} WHERE id = :old_id'), {'old_id': old_id})
+
+    for view in _VIEWS:
+        op.execute(f'REFRESH MATERIALIZED VIEW {view}')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # the French rows were merged into the English ones and which programs
+    # pointed at them is not kept, so there is nothing to restore from
+    raise NotImplementedError('9de718597fa0 merges French dimension rows and cannot be reversed')
@@ -0,0 +1,38 @@
+"""description clusters
+
+Revision ID: 9e9ee90ba123
+Revises: c3e84ee91f9c
+Create Date: 2026-10-17 13:52:48.207715
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9e9ee90ba123'
+down_revision: Union[str, Sequence[str], None] = 'c3e84ee91f9c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('descriptionsignature',
+    sa.Column('description_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('signature', sa.LargeBinary(), nullable=False),
+    sa.Column('minhash_version', sa.Integer(), nullable=False),
+    sa.PrimaryKeyConstraint('description_hash')
+    )
+    op.add_column('program', sa.Column('cluster_id', sqlmodel.sql.sqltypes.AutoString(), nullable=True))
+    op.create_index(op.f('ix_program_cluster_id'), 'program', ['cluster_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_program_cluster_id'), table_name='program')
+    op.drop_column('program', 'cluster_id')
+    op.drop_table('descriptionsignature')
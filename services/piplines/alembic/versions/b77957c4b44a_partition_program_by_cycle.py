@@ -0,0 +1,191 @@
+"""partition program by cycle
+
+Revision ID: b77957c4b44a
+Revises: 9c3dd9b8a249
+Create Date: 2026-10-17 12:21:40.318502
+
+"""
+import re
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b77957c4b44a'
+down_revision: Union[str, Sequence[str], None] = '9c3dd9b8a249'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# programs loaded before the cycle was tracked and without a fingerprint
+DEFAULT_CYCLE = '1503'
+
+
+def _create_partitions(cycles) -> None:
+    for cycle in cycles:
+        if not re.match(r"^\w+$", cycle):
+            raise ValueError(f"Invalid match cycle: {cycle!r}")
+        for table in ('program', 'programchangelog'):
+            op.execute(
+                f'CREATE TABLE "{table}_{cycle}" PARTITION OF {table} '
+                f"FOR VALUES IN ('{cycle}')"
+            )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # cycle of every existing program, from the raw record ids it was loaded from
+    op.execute(f"""
+        CREATE TEMP TABLE program_cycle ON COMMIT DROP AS
+        SELECT p.program_stream_id,
+               COALESCE(
+                   (SELECT max(btrim(split_part(f.record_id, '|', 1)))
+                    FROM rawrecordfingerprint f
+                    WHERE btrim(split_part(f.record_id, '|', 2)) = p.program_stream_id),
+                   '{DEFAULT_CYCLE}'
+               ) AS match_cycle
+        FROM program p
+    """)
+
+    op.drop_constraint('programchunk_program_stream_id_fkey', 'programchunk', type_='foreignkey')
+    op.drop_constraint('programchunk_program_stream_id_chunk_index_key', 'programchunk', type_='unique')
+
+    # move the old tables out of the way; index names are schema-wide
+    op.execute("ALTER TABLE program RENAME TO program_unpartitioned")
+    op.execute("ALTER TABLE program_unpartitioned RENAME CONSTRAINT program_pkey TO program_unpartitioned_pkey")
+    op.execute("ALTER TABLE programchangelog RENAME TO programchangelog_unpartitioned")
+    op.execute(
+        "ALTER TABLE programchangelog_unpartitioned "
+        "RENAME CONSTRAINT programchangelog_pkey TO programchangelog_unpartitioned_pkey"
+    )
+    for index in (
+        'ix_program_description_hash',
+        'ix_program_updated_at',
+        'ix_programchangelog_program_stream_id',
+        'ix_programchangelog_changed_at',
+    ):
+        op.execute(f"DROP INDEX IF EXISTS {index}")
+
+    op.execute("""
+        CREATE TABLE program (
+            match_cycle VARCHAR NOT NULL,
+            LIKE program_unpartitioned INCLUDING DEFAULTS,
+            PRIMARY KEY (match_cycle, program_stream_id),
+            FOREIGN KEY (discipline_id) REFERENCES discipline (id),
+            FOREIGN KEY (school_id) REFERENCES school (id),
+            FOREIGN KEY (stream_id) REFERENCES programstream (id)
+        ) PARTITION BY LIST (match_cycle)
+    """)
+    op.execute("""
+        CREATE TABLE programchangelog (
+            match_cycle VARCHAR NOT NULL,
+            LIKE programchangelog_unpartitioned INCLUDING DEFAULTS,
+            PRIMARY KEY (id, match_cycle)
+        ) PARTITION BY LIST (match_cycle)
+    """)
+    # keep the id sequence (and its position) when the old table is dropped
+    op.execute("ALTER SEQUENCE programchangelog_id_seq OWNED BY programchangelog.id")
+
+    cycles = [row[0] for row in op.get_bind().execute(
+        sa.text("SELECT DISTINCT match_cycle FROM program_cycle ORDER BY 1")
+    )]
+    _create_partitions(cycles)
+
+    op.execute("""
+        INSERT INTO program
+        SELECT c.match_cycle, p.*
+        FROM program_unpartitioned p
+        JOIN program_cycle c USING (program_stream_id)
+    """)
+    op.execute("""
+        INSERT INTO programchangelog
+        SELECT c.match_cycle, l.*
+        FROM programchangelog_unpartitioned l
+        JOIN program_cycle c USING (program_stream_id)
+    """)
+
+    op.add_column('programchunk', sa.Column('match_cycle', sa.VARCHAR(), nullable=True))
+    op.execute("""
+        UPDATE programchunk ch
+        SET match_cycle = c.match_cycle
+        FROM program_cycle c
+        WHERE c.program_stream_id = ch.program_stream_id
+    """)
+    op.alter_column('programchunk', 'match_cycle', nullable=False)
+
+    op.drop_table('programchangelog_unpartitioned')
+    op.drop_table('program_unpartitioned')
+
+    op.create_index(op.f('ix_program_description_hash'), 'program', ['description_hash'], unique=False)
+    op.create_index(op.f('ix_program_updated_at'), 'program', ['updated_at'], unique=False)
+    op.create_index(op.f('ix_programchangelog_program_stream_id'), 'programchangelog', ['program_stream_id'], unique=False)
+    op.create_index(op.f('ix_programchangelog_changed_at'), 'programchangelog', ['changed_at'], unique=False)
+    op.create_foreign_key(
+        None, 'programchangelog', 'program',
+        ['match_cycle', 'program_stream_id'], ['match_cycle', 'program_stream_id'],
+    )
+    op.create_foreign_key(
+        None, 'programchunk', 'program',
+        ['match_cycle', 'program_stream_id'], ['match_cycle', 'program_stream_id'],
+    )
+    op.create_unique_constraint(None, 'programchunk', ['match_cycle', 'program_stream_id', 'chunk_index'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # one row per program stream again: the latest cycle wins
+    op.drop_constraint('programchunk_match_cycle_program_stream_id_fkey', 'programchunk', type_='foreignkey')
+    op.drop_constraint('programchunk_match_cycle_program_stream_id_chunk_index_key', 'programchunk', type_='unique')
+    op.execute("""
+        DELETE FROM programchunk ch
+        WHERE ch.match_cycle <> (
+            SELECT max(p.match_cycle) FROM program p WHERE p.program_stream_id = ch.program_stream_id
+        )
+    """)
+    op.drop_column('programchunk', 'match_cycle')
+
+    op.execute("ALTER TABLE program RENAME TO program_partitioned")
+    op.execute("ALTER TABLE programchangelog RENAME TO programchangelog_partitioned")
+
+    op.execute("""
+        CREATE TABLE program AS
+        SELECT DISTINCT ON (program_stream_id)
+               program_stream_id, name, site, url, description,
+               discipline_id, school_id, stream_id, description_hash, embedding, updated_at
+        FROM program_partitioned
+        ORDER BY program_stream_id, match_cycle DESC
+    """)
+    op.execute("""
+        CREATE TABLE programchangelog AS
+        SELECT l.id, l.program_stream_id, l.changed_at, l.old_hash, l.new_hash
+        FROM programchangelog_partitioned l
+        WHERE l.match_cycle = (
+            SELECT max(p2.match_cycle) FROM program_partitioned p2
+            WHERE p2.program_stream_id = l.program_stream_id
+        )
+    """)
+    op.execute("ALTER TABLE programchangelog ALTER COLUMN id SET DEFAULT nextval('programchangelog_id_seq')")
+    op.execute("ALTER SEQUENCE programchangelog_id_seq OWNED BY programchangelog.id")
+
+    # drops the partitions and frees the constraint and index names
+    op.drop_table('programchangelog_partitioned')
+    op.drop_table('program_partitioned')
+
+    for column in ('name', 'site', 'discipline_id', 'school_id', 'stream_id', 'updated_at'):
+        op.alter_column('program', column, nullable=False)
+    for column in ('id', 'program_stream_id', 'changed_at', 'new_hash'):
+        op.alter_column('programchangelog', column, nullable=False)
+    op.create_primary_key('program_pkey', 'program', ['program_stream_id'])
+    op.create_primary_key('programchangelog_pkey', 'programchangelog', ['id'])
+
+    op.create_foreign_key(None, 'program', 'discipline', ['discipline_id'], ['id'])
+    op.create_foreign_key(None, 'program', 'school', ['school_id'], ['id'])
+    op.create_foreign_key(None, 'program', 'programstream', ['stream_id'], ['id'])
+    op.create_foreign_key(None, 'programchangelog', 'program', ['program_stream_id'], ['program_stream_id'])
+    op.create_foreign_key(None, 'programchunk', 'program', ['program_stream_id'], ['program_stream_id'])
+    op.create_unique_constraint(None, 'programchunk', ['program_stream_id', 'chunk_index'])
+    op.create_index(op.f('ix_program_description_hash'), 'program', ['description_hash'], unique=False)
+    op.create_index(op.f('ix_program_updated_at'), 'program', ['updated_at'], unique=False)
+    op.create_index(op.f('ix_programchangelog_program_stream_id'), 'programchangelog', ['program_stream_id'], unique=False)
+    op.create_index(op.f('ix_programchangelog_changed_at'), 'programchangelog', ['changed_at'], unique=False)
@@ -0,0 +1,62 @@
+"""program version
+
+Revision ID: c3e84ee91f9c
+Revises: b77957c4b44a
+Create Date: 2026-10-17 13:05:12.640388
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+import sqlmodel
+
+from services.api.app.program_versions import encode_snapshot
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3e84ee91f9c'
+down_revision: Union[str, Sequence[str], None] = 'b77957c4b44a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+_BATCH_SIZE = 500
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    version = op.create_table('programversion',
+    sa.Column('match_cycle', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('program_stream_id', sqlmodel.sql.sqltypes.AutoString(), nullable=False),
+    sa.Column('version', sa.Integer(), nullable=False),
+    sa.Column('description_hash', sqlmodel.sql.sqltypes.AutoString(), nullable=True),
+    sa.Column('is_snapshot', sa.Boolean(), nullable=False),
+    sa.Column('payload', sa.LargeBinary(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['match_cycle', 'program_stream_id'], ['program.match_cycle', 'program.program_stream_id'], ),
+    sa.PrimaryKeyConstraint('match_cycle', 'program_stream_id', 'version')
+    )
+
+    # current descriptions become version 1; earlier text was never stored
+    result = op.get_bind().execute(sa.text(
+        "SELECT match_cycle, program_stream_id, description, description_hash, updated_at "
+        "FROM program WHERE description IS NOT NULL"
+    ))
+    while rows := result.fetchmany(_BATCH_SIZE):
+        op.bulk_insert(version, [
+            {
+                'match_cycle': cycle,
+                'program_stream_id': pid,
+                'version': 1,
+                'description_hash': description_hash,
+                'is_snapshot': True,
+                'payload': encode_snapshot(description),
+                'created_at': updated_at,
+            }
+            for cycle, pid, description, description_hash, updated_at in rows
+        ])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('programversion')
@@ -0,0 +1,162 @@
+"""
+Synthetic CaRMS-style program descriptions for scaling benchmarks.
+
+Records have the shape of the scraped ``*_markdown_program_descriptions``
+files (``id``, ``page_content``, ``metadata.source``) and the header,
+match-iteration line, stream line and ``##`` sections that
+``parse_program_records`` expects, in English and French. Generation is
+deterministic for a given seed.
+"""
+import json
+import random
+from pathlib import Path
+from typing import Iterator
+
+from ..pipeline.normalization import DISCIPLINE_FR_TO_EN, KNOWN_DISCIPLINES
+
+EN_SCHOOLS = [
+    "University of British Columbia",
+    "University of Alberta",
+    "University of Calgary",
+    "University of Saskatchewan",
+    "University of Manitoba",
+    "Northern Ontario School of Medicine",
+    "Western University",
+    "McMaster University",
+    "University of Toronto",
+    "Queen's University",
+    "University of Ottawa",
+    "Dalhousie University",
+    "Memorial University of Newfoundland",
+]
+FR_SCHOOLS = [
+    "Université de Montréal",
+    "Université de Sherbrooke",
+    "Université Laval",
+    "Université McGill",
+]
+
+EN_SITES = ["Vancouver", "Edmonton", "Calgary", "Saskatoon", "Winnipeg", "Sudbury",
+            "London", "Hamilton", "Toronto", "Kingston", "Ottawa", "Halifax", "St. John's"]
+FR_SITES = ["Montréal", "Sherbrooke", "Québec", "Gatineau", "Trois-Rivières", "Saguenay"]
+
+EN_STREAMS = ["CMG Stream for CMG", "IMG Stream for IMG", "Regular Stream for All"]
+FR_STREAMS = ["Groupe régulier pour tous", "Groupe DCM pour DCM"]
+
+EN_CRITERIA = ["Collaboration skills", "Collegiality", "Communication skills", "Health advocacy",
+               "Interest in the discipline", "Interest in the program", "Leadership skills",
+               "Professionalism", "Scholarly activities"]
+FR_CRITERIA = ["Compétences en collaboration", "Collégialité", "Compétences en communication",
+               "Promotion de la santé", "Intérêt envers la discipline", "Intérêt envers le programme",
+               "Compétences en leadership", "Professionnalisme", "Activités savantes"]
+
+APP_BUCKETS = ["0 - 50", "51 - 200", "201 - 400", "401 - 600", "601 +"]
+PCT_BUCKETS = ["0 - 25 %", "26 - 50 %", "51 - 75 %", "76 - 100 %"]
+MONTHS = ["January", "February", "March"]
+
+_FILLER = (
+    "Residents rotate through community and academic sites with graduated responsibility "
+    "and protected academic time. "
+)
+_FILLER_FR = (
+    "Les résidents effectuent des stages dans des milieux communautaires et universitaires "
+    "avec une autonomie croissante. "
+)
+
+_EN_DISCIPLINES = sorted(KNOWN_DISCIPLINES)
+_FR_DISCIPLINES = sorted(DISCIPLINE_FR_TO_EN)
+
+
+def _interview_dates(rng: random.Random, year: int) -> list[str]:
+    return [f"{rng.choice(MONTHS)} {rng.randint(1, 28)}, {year}" for _ in range(rng.randint(1, 4))]
+
+
+def _english_record(rng: random.Random, body_paragraphs: int, year: int) -> tuple[str, str]:
+    school = rng.choice(EN_SCHOOLS)
+    header = f"# {school} - {rng.choice(_EN_DISCIPLINES)} - {rng.choice(EN_SITES)}"
+    criteria = "\n".join(
+        f"{c} | {'We do not evaluate this' if rng.random() < 0.2 else 'Evaluated during the interview'}"
+        for c in rng.sample(EN_CRITERIA, rng.randint(3, len(EN_CRITERIA)))
+    )
+    sections = [
+        "## Program Overview\n" + _FILLER * body_paragraphs,
+        "## Return of Service\nNo return of service is required.",
+        "## Interviews\n# Interviews\nDates:\n" + "\n".join(_interview_dates(rng, year))
+        + "\nDetails\nInterviews are held virtually.",
+        "## Selection Criteria\n"
+        "Average number of applications received by our program in the last five years: "
+        f"{rng.choice(APP_BUCKETS)}\n"
+        f"Average percentage of applicants offered interviews: {rng.choice(PCT_BUCKETS)}\n"
+        f"Interview evaluation criteria:\n{criteria}",
+        "## Program application language\nEnglish",
+    ]
+    return header, f"{rng.choice(EN_STREAMS)}\n\n" + "\n\n".join(sections)
+
+
+def _french_record(rng: random.Random, body_paragraphs: int, year: int) -> tuple[str, str]:
+    school = rng.choice(FR_SCHOOLS)
+    header = f"# {school} - {rng.choice(_FR_DISCIPLINES)} - {rng.choice(FR_SITES)}"
+    criteria = "\n".join(
+        f"{c} | {'Nous n’évaluons pas' if rng.random() < 0.2 else 'Évalué en entrevue'}"
+        for c in rng.sample(FR_CRITERIA, rng.randint(3, len(FR_CRITERIA)))
+    )
+    sections = [
+        "## Aperçu du programme\n" + _FILLER_FR * body_paragraphs,
+        "## Entrevues\n# Entrevues\nDates :\n" + "\n".join(_interview_dates(rng, year))
+        + "\nDétails\nLes entrevues ont lieu en personne.",
+        "## Critères de sélection\n"
+        "Nombre moyen de demandes soumises au programme pendant les cinq dernières années : "
+        f"{rng.choice(APP_BUCKETS)}\n"
+        f"Pourcentage moyen de candidats invités à une entrevue : {rng.choice(PCT_BUCKETS)}\n"
+        f"Critères d'évaluation pour les entrevues :\n{criteria}",
+        "## Langue de candidature\nFrançais",
+    ]
+    return header, f"{rng.choice(FR_STREAMS)}\n\n" + "\n\n".join(sections)
+
+
+def generate_records(
+    n: int,
+    seed: int = 0,
+    match_cycle: str = "1503",
+    french_share: float = 0.2,
+    body_paragraphs: int = 8,
+    first_stream_id: int = 27000,
+) -> Iterator[dict]:
+    """Yield ``n`` raw records with unique program stream ids."""
+    rng = random.Random(seed)
+    year = 2025
+
+    for i in range(n):
+        make = _french_record if rng.random() < french_share else _english_record
+        header, body = make(rng, rng.randint(1, body_paragraphs), year)
+        iteration = ("2025 R-1 Jumelage principal des résidents - premier tour"
+                     if make is _french_record else "2025 R-1 Main Residency Match - first iteration")
+        stream_id = first_stream_id + i
+        yield {
+            "id": f"{match_cycle}|{stream_id}",
+            # scraped markdown has runs of blank lines that staging collapses
+            "page_content": f"{header}\n\n\n#  {iteration}\n\n{body}\n\n",
+            "metadata": {
+                "source": f"https://www.carms.ca/match/r-1/program/{match_cycle}/{stream_id}",
+            },
+        }
+
+
+def write_corpus(path: str | Path, n: int, **kwargs) -> Path:
+    """Write a corpus as a JSON array, or NDJSON for ``*.ndjson`` / ``*.jsonl``."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    ndjson = path.suffix.lower() in {".ndjson", ".jsonl"}
+
+    with open(path, "w", encoding="utf-8") as f:
+        if not ndjson:
+            f.write("[\n")
+        for i, record in enumerate(generate_records(n, **kwargs)):
+            line = json.dumps(record, ensure_ascii=False)
+            if ndjson:
+                f.write(line + "\n")
+            else:
+                f.write(("" if i == 0 else ",\n") + line)
+        if not ndjson:
+            f.write("\n]\n")
+    return path
@@ -1,45 +1,67 @@
 import json
-import re
 import sys
 import hashlib
+import time
+from collections import Counter
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
 
-from dagster import asset, asset_check, AssetExecutionContext, AssetCheckResult
-from sqlmodel import select
+from dagster import asset, AssetExecutionContext, Config
+from sqlalchemy import bindparam, delete, func, insert, or_, text, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select
 from langchain_openai import OpenAIEmbeddings
 
 # ── Project root on sys.path so cross-service imports work ─────────
 BASE_DIR = Path(__file__).resolve().parents[3]
 sys.path.insert(0, str(BASE_DIR))
 
+from services.api.app.analytics_views import ANALYTICS_VIEWS  # noqa: E402
 from services.api.app.models import (  # noqa: E402
+    DescriptionSignature,
     Discipline,
+    EmbeddingCache,
     Program,
     ProgramChangeLog,
+    ProgramChunk,
+    ProgramFacts,
+    ProgramInterviewCriterion,
+    ProgramInterviewDate,
     ProgramStream,
+    ProgramVersion,
+    RawRecordFingerprint,
     School,
 )
-from services.api.app.database import engine, Session  # noqa: E402
-from .normalization import DISCIPLINE_FR_TO_EN, SCHOOL_FR_TO_EN
-from .parsing_helpers import (
-    _clean_discipline_name,
-    _extract_stream,
-    _is_metadata_line,
-    _next_nonempty,
-    _take_until_metadata,
-    normalize_text,
-    split_discipline_and_site,
+from services.api.app.program_facts import FACTS_VERSION, extract_facts  # noqa: E402
+from services.api.app.program_versions import new_versions  # noqa: E402
+from .bulk_load import bulk_load_programs
+from .chunking import build_chunks
+from .dedup import MINHASH_VERSION, cluster, from_bytes, minhash, to_bytes
+from .embedding_scheduler import EmbeddingItem, EmbeddingScheduler
+from .instrumentation import instrumented
+from .io_managers import RecordTable
+from .ingest import (
+    RecordSource,
+    filter_changed,
+    iter_raw_records,
+    iter_staged_records,
+    scan_records,
 )
-from sqlalchemy import text
-from sqlmodel import SQLModel
-with engine.connect() as conn:
-    conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
-    conn.commit()
-SQLModel.metadata.create_all(engine)
+from .parsing import iter_parsed_records, parse_records_parallel, record_school
+from .partitions import (
+    ensure_cycle_partitions,
+    match_cycle_of,
+    partition_of,
+    partitions_of,
+    program_partitions,
+    register_partitions,
+)
+from .resources import PostgresResource
 
 # ── Constants ──────────────────────────────────────────────────────
-DATA_PATH = BASE_DIR / "data" / "1503_markdown_program_descriptions_v2.json"
+DATA_DIR = BASE_DIR / "data"
+DATA_PATH = DATA_DIR / "1503_markdown_program_descriptions_v2.json"
 
 
 # ═══════════════════════════════════════════════════════════════════
@@ -47,350 +69,439 @@ DATA_PATH = BASE_DIR / "data" / "1503_markdown_program_descriptions_v2.json"
 # ═══════════════════════════════════════════════════════════════════
 
 
-@asset
-def raw_program_descriptions(context: AssetExecutionContext):
-    """Load raw scraped program-descriptions JSON."""
+class IngestConfig(Config):
+    # iterate records lazily instead of loading the whole file into memory
+    streaming: bool = False
+    # defaults to DATA_PATH; *.ndjson / *.jsonl files are read line by line
+    data_path: str | None = None
+    # several scrape files read as one batch (set by the raw data sensor)
+    data_paths: list[str] | None = None
+
+
+@asset(io_manager_key="parquet_io_manager")
+@instrumented
+def raw_program_descriptions(context: AssetExecutionContext, config: IngestConfig):
+    """Load raw scraped program-descriptions JSON.
+
+    In streaming mode only a RecordSource handle is returned and the
+    records are read one at a time by the downstream assets.
+    """
+
+    if config.data_paths:
+        paths = [Path(p) for p in config.data_paths]
+    else:
+        paths = [Path(config.data_path) if config.data_path else DATA_PATH]
+
+    if config.streaming:
+        source = scan_records(*paths)
+        context.add_output_metadata({
+            "records_count": source.records_count,
+            "sample_id": source.sample_id,
+            "streaming": True,
+        })
+        return source
 
-    with open(DATA_PATH) as f:
-        data = json.load(f)
+    data = []
+    for path in paths:
+        if path.suffix.lower() == ".json":
+            with open(path) as f:
+                data.extend(json.load(f))
+        else:
+            data.extend(iter_raw_records(path))
 
     context.add_output_metadata({
         "records_count": len(data),
         "sample_id": data[0].get("id") if data else None,
+        "files": [str(p) for p in paths],
     })
     return data
 
 
-@asset
-def staging_program_descriptions(raw_program_descriptions):
-    """Clean markdown and extract structured fields."""
+def _load_fingerprint_manifest(engine) -> dict[str, str]:
+    """record_id -> content hash of every record loaded so far."""
+    with Session(engine) as session:
+        rows = session.exec(
+            select(RawRecordFingerprint.record_id, RawRecordFingerprint.content_hash)
+        ).all()
+    return dict(rows)
 
-    cleaned = []
 
-    for record in raw_program_descriptions:
-        program_id = record.get("id")
-        text = record.get("page_content", "")
-        source = record.get("metadata", {}).get("source")
+def _record_fingerprints(session, records: list[dict], skip_reason: str | None = None) -> None:
+    """
+    Upsert the manifest entries of the records just loaded, or of staged
+    records that were skipped (``skip_reason``) so they aren't staged again
+    until they change.
+    """
+    id_key = "program_id" if skip_reason else "record_id"
+    rows = [
+        {
+            "record_id": r[id_key],
+            "content_hash": r["fingerprint"],
+            "loaded_at": datetime.utcnow(),
+            "skip_reason": skip_reason,
+        }
+        for r in records
+        if r.get("fingerprint")
+    ]
+    if not rows:
+        return
+    stmt = pg_insert(RawRecordFingerprint).values(rows)
+    session.execute(
+        stmt.on_conflict_do_update(
+            index_elements=[RawRecordFingerprint.record_id],
+            set_={
+                "content_hash": stmt.excluded.content_hash,
+                "loaded_at": stmt.excluded.loaded_at,
+                "skip_reason": stmt.excluded.skip_reason,
+            },
+        )
+    )
 
-        # Remove excessive newlines
-        text = re.sub(r"\n+", "\n", text)
 
-        cleaned.append({
-            "program_id": program_id,
-            "source_url": source,
-            "clean_text": text.strip(),
+def _record_skipped(db, records: list[dict], reason: str) -> None:
+    """Fingerprint staged records that won't be loaded, in their own transaction."""
+    if not records:
+        return
+    with db.session() as session:
+        _record_fingerprints(session, records, skip_reason=reason)
+        session.commit()
+
+
+class StagingConfig(Config):
+    # re-stage every record instead of only new or changed ones
+    full_refresh: bool = False
+
+
+@asset(io_manager_key="parquet_io_manager")
+@instrumented
+def staging_program_descriptions(
+    context: AssetExecutionContext,
+    config: StagingConfig,
+    db: PostgresResource,
+    raw_program_descriptions,
+):
+    """Clean markdown and extract structured fields.
+
+    By default only records whose fingerprint differs from the manifest of
+    the last successful load are passed on. Match cycles and schools seen
+    in the staged records are registered as program partitions, and the
+    (match cycle, school) pairs that have staged records are listed in the
+    ``partitions`` output metadata for the raw data sensor to fan out to.
+    Records whose header names no school belong to no partition; they are
+    fingerprinted as skipped here, since no load will ever record them.
+    """
+
+    manifest = {} if config.full_refresh else _load_fingerprint_manifest(db.get_engine())
+
+    # streaming: staging is applied lazily when the records are iterated,
+    # here we only work out which ids changed
+    if isinstance(raw_program_descriptions, RecordSource):
+        source = raw_program_descriptions.as_staged()
+        if not config.full_refresh:
+            changed = frozenset(r["program_id"] for r in filter_changed(source.iter_records(), manifest))
+            source = replace(source, only_ids=changed)
+        staged_count = source.records_count if source.only_ids is None else len(source.only_ids)
+        unplaced = []
+        partitions = sorted(partitions_of(source.iter_records(), unplaced))
+        _record_skipped(db, unplaced, "no school in header")
+        added = register_partitions(
+            context.instance,
+            {cycle for cycle, _ in partitions},
+            {school for _, school in partitions},
+        )
+        context.add_output_metadata({
+            "staged_count": staged_count,
+            "unchanged_count": source.records_count - staged_count,
+            "full_refresh": config.full_refresh,
+            "partitions": [list(key) for key in partitions],
+            "unplaced_count": len(unplaced),
+            **{f"new_{name}_partitions": len(keys) for name, keys in added.items()},
         })
+        return source
+
+    cleaned = list(filter_changed(iter_staged_records(raw_program_descriptions), manifest))
+
+    # partition key columns, sorted on so each partition run reads only the
+    # Parquet row groups holding its records instead of the whole batch
+    for record in cleaned:
+        record["match_cycle"] = match_cycle_of(record["program_id"])
+        record["school"] = record_school(record)
+    cleaned.sort(key=lambda r: (r["match_cycle"], r["school"] or ""))
 
-    print(len(cleaned))
-    print(cleaned[0])
+    if cleaned:
+        context.log.debug(f"First staged record: {cleaned[0]}")
 
+    added = register_partitions(
+        context.instance,
+        {r["match_cycle"] for r in cleaned},
+        {r["school"] for r in cleaned if r["school"]},
+    )
+    partitions = sorted({(r["match_cycle"], r["school"]) for r in cleaned if r["school"]})
+    unplaced = [r for r in cleaned if not r["school"]]
+    _record_skipped(db, unplaced, "no school in header")
+    context.add_output_metadata({
+        "staged_count": len(cleaned),
+        "unchanged_count": len(raw_program_descriptions) - len(cleaned),
+        "full_refresh": config.full_refresh,
+        "partitions": [list(key) for key in partitions],
+        "unplaced_count": len(unplaced),
+        **{f"new_{name}_partitions": len(keys) for name, keys in added.items()},
+    })
     return cleaned
 
-@asset
-def parse_program_records(staging_program_descriptions):
+
+class ParseConfig(Config):
+    # shard records across a process pool instead of parsing in-process
+    parallel: bool = False
+    # defaults to the number of CPUs
+    max_workers: int | None = None
+    chunk_size: int = 100
+
+
+@asset(partitions_def=program_partitions, io_manager_key="parquet_io_manager")
+@instrumented
+def parse_program_records(
+    context: AssetExecutionContext,
+    config: ParseConfig,
+    db: PostgresResource,
+    staging_program_descriptions,
+):
     """
     Parse program records in two passes:
     1. First pass: Parse all records (may include cities in discipline names)
     2. Second pass: Analyze parsed data to identify common discipline bases,
        then extract city suffixes from disciplines that share the same base
+
+    Only the records of this partition's match cycle and school are kept.
+    Records the header parser skips are fingerprinted as skipped, so later
+    incremental runs don't stage them again until they change.
     """
-    parsed = []
     skipped_headers = []
-
-    for record in staging_program_descriptions:
-        # keep original lines for description joining
-        raw_lines = record["clean_text"].split("\n")
-
-        # cleaned lines for header detection
-        lines = [ln.strip() for ln in raw_lines if ln.strip()]
-
-        # Find the header line
-        header_index = next(
-            (
-                i
-                for i, line in enumerate(lines)
-                if line.lstrip().startswith("#") and not line.lstrip().startswith("##")
-            ),
-            None
-        ) # header index is the index of the line that starts with "#" and does not start with "##"
-
-        if header_index is None:
-            skipped_headers.append("NO HEADER")
-            continue
-
-        header_line = lines[header_index].lstrip("# ").strip() 
-
-        # Handle header continuation: if header ends with "-", next line is site 
-        # This handles cases like:
-        # # School - Discipline -
-        # St. John's
-        site_continuation = None
-        if header_line.endswith("-"):
-            j = _next_nonempty(lines, header_index + 1) # next non empty line after header index
-            if j is not None:
-                next_line = lines[j].strip()
-                # Only accept if it's NOT another header and NOT metadata
-                if not next_line.startswith("#") and not _is_metadata_line(next_line):
-                    site_continuation = next_line
-                    # Remove the trailing "-" from header_line
-                    header_line = header_line.rstrip("-").strip()
-
-        # Normalize dash spacing
-        header_line = header_line.replace("–", "-").replace("—", "-")
-        header_line = re.sub(r"\s+-\s+", " - ", header_line)
-
-        # clean extra spaces
-        header_line = re.sub(r"\s+", " ", header_line).strip()
-
-        # split header line into parts by " - "
-        parts = [p.strip() for p in header_line.split(" - ") if p.strip()]
-        if len(parts) < 2: #bad header line
-            skipped_headers.append(header_line)
-            continue
-
-        # school is the first part in header like "McGill University - Medicine - Montreal"
-        school_name = parts[0].strip()
-        school_norm = normalize_text(school_name)
-        school_name = SCHOOL_FR_TO_EN.get(school_norm, school_name)
-
-        # discipline and site are the remaining parts in header like "Medicine - Montreal"
-        # use known disciplines to identify where discipline ends and site begins (a bit hardcoded)
-        remainder = parts[1:]
-        if not remainder:
-            skipped_headers.append(header_line)
-            continue
-        
-        discipline_name, site_str = split_discipline_and_site(remainder)
-        
-        # If we found a site continuation (header ended with "-"), append it to site
-        if site_continuation:
-            if site_str:
-                site_str = f"{site_str} {site_continuation}".strip()
-            else:
-                site_str = site_continuation
-        
-        site_parts = [site_str] if site_str else []
-        
-        if not discipline_name:
-            skipped_headers.append(header_line)
-            continue
-
-        # Clean discipline name (fallback for edge cases - split_discipline_and_site should handle most)
-        discipline_name = _clean_discipline_name(discipline_name)
-
-        # take site parts until metadata line (no "Residency Match" hardcode)
-        site_parts = _take_until_metadata(site_parts)
-        program_site = " - ".join(site_parts).strip() if site_parts else ""
-
-        # special case for Family Medicine integrated variants
-        first_lower = discipline_name.lower()
-        if first_lower.startswith("family medicine") or first_lower.startswith("médecine familiale"):
-            discipline_base = "Family Medicine"
-            allowed_integrated = {
-                "integrated clinician scholar",
-                "integrated emergency medicine",
-            }
-            #if program site contains an allowed integrated variant, add it to the discipline name
-            if program_site and program_site.strip().lower() in allowed_integrated:
-                discipline_name = f"{discipline_base} {program_site.strip()}"
-                program_site = "" #make program site empty for now, we will add it back later
-            else:
-                discipline_name = discipline_base
-
-        # French to English discipline mapping
-        # Try full match first
-        discipline_norm = normalize_text(discipline_name)
-        discipline_name = DISCIPLINE_FR_TO_EN.get(discipline_norm, discipline_name)
-        # if no match, try matching parts (for multi-part French disciplines)
-        # for example "Oto-rhino-laryngologie et chirurgie cervico-faciale" -> "Oto-rhino-laryngologie and cervico-facial surgery"
-        if discipline_name == discipline_norm:  # No translation happened
-            # Split by " - " to check individual parts
-            parts = discipline_name.split(" - ")
-            translated_parts = []
-            changed = False
-            
-            for part in parts:
-                part_norm = normalize_text(part)
-                translated_part = DISCIPLINE_FR_TO_EN.get(part_norm, part) #try matching again
-                
-                # Also try partial matches (for cases like "Oto-rhino-laryngologie et chirurgie cervico")
-                if translated_part == part:
-                    # Try to find a French discipline that starts with this part
-                    for fr_name, en_name in DISCIPLINE_FR_TO_EN.items():
-                        fr_norm = normalize_text(fr_name)
-                        # Check if this part is the start of a French discipline name
-                        if fr_norm.startswith(part_norm) or part_norm.startswith(fr_norm[:20]):
-                            translated_part = en_name
-                            changed = True
-                            break
-                
-                if translated_part != part: #if the part was translated, add it to the translated parts
-                    changed = True
-                
-                translated_parts.append(translated_part)
-            
-            # If any part was translated, reconstruct
-            if changed:
-                discipline_name = " - ".join(translated_parts)
-            
-            # Clean up any city names or location suffixes that might have been included in French discipline names
-            # (e.g., "Oto-rhino-laryngologie et chirurgie cervico- faciale - Sherbrooke faciale")
-            # structural approach: if a part appears after what looks like a complete discipline,
-            # and it's short/capitalized, it's likely a city suffix that got included
-            final_parts = discipline_name.split(" - ") #split discipline name into parts by " - " like "Oto-rhino-laryngologie and cervico-facial surgery" -> ["Oto-rhino-laryngologie", "and", "cervico-facial", "surgery"]
-            cleaned_parts = []
-            
-            # Work through parts, keeping discipline parts and removing city-like suffixes
-            for i, part in enumerate(final_parts):
-                # Skip very short parts that appear at the end (likely city suffixes)
-                # This handles cases like "faciale", "cervico" that are anatomical terms
-                # but also cases where city names got included
-                words = part.split()
-                
-                # If it's a very short part (1 word, <= 8 chars) at the end, might be a suffix (like "faciale", "cervico")
-                # But only if we already have substantial discipline content (more than 15 chars)
-                if i == len(final_parts) - 1 and len(words) == 1 and len(part) <= 8:
-                    # Check if previous parts already form a substantial discipline name
-                    prev_text = " - ".join(final_parts[:i])
-                    if len(prev_text) > 15:  
-                        continue
-                
-                cleaned_parts.append(part)
-            
-            if len(cleaned_parts) < len(final_parts): #if we removed some parts, join the remaining parts back together
-                discipline_name = " - ".join(cleaned_parts).strip()
-
-        # program stream id
-        raw_id = record["program_id"]
-        id_parts = raw_id.split("|") 
-        if len(id_parts) != 2:
-            raise ValueError(f"Invalid program_id format: {raw_id}")
-        program_stream_id = id_parts[1].strip() #program stream id is the second part of the program_id after "|"
-
-        # program stream is the stream of the program (IMG / CMG etc)
-        program_stream = _extract_stream(lines, header_index)
-
-        # program description
-        description_start = next(
-            (i for i, ln in enumerate(raw_lines) if ln.strip().startswith("##")),
-            None
-        )
-        program_description = (
-            "\n".join(raw_lines[description_start:]).strip()
-            if description_start is not None
-            else record["clean_text"].strip()
+    translation_stats = Counter()
+    match_cycle, school = partition_of(context)
+
+    staged = staging_program_descriptions
+    if isinstance(staged, RecordTable) and {"match_cycle", "school"} <= set(staged.column_names):
+        # rows selected on the staged partition columns before any becomes a dict
+        records = staged.where(match_cycle=match_cycle, school=school)
+    else:
+        records = staged.iter_records() if isinstance(staged, RecordSource) else staged
+
+        # the cycle is in the record id and the school in the header, so other
+        # partitions' records are dropped before the (much costlier) full parse
+        records = (
+            r for r in records
+            if match_cycle_of(r["program_id"]) == match_cycle and record_school(r) == school
         )
 
-        program_name = f"{school_name}/{discipline_name}/{program_site or ''}".rstrip("/")
-
-        parsed.append({
-            "program_stream_id": program_stream_id,
-            "school_name": school_name,
-            "discipline_name": discipline_name,
-            "program_site": program_site,
-            "program_stream": program_stream,
-            "program_name": program_name,
-            "program_description": program_description,
-            "source_url": record["source_url"],
-        })
+    # id -> fingerprint of the partition's records, to find the skipped ones
+    seen: dict[str, str | None] = {}
+
+    def tracked(records):
+        for record in records:
+            seen[record["program_id"]] = record.get("fingerprint")
+            yield record
+
+    records = tracked(records)
+
+    if config.parallel:
+        parsed = parse_records_parallel(
+            records,
+            skipped_headers,
+            translation_stats,
+            max_workers=config.max_workers,
+            chunk_size=config.chunk_size,
+        )
+    else:
+        parsed = list(iter_parsed_records(records, skipped_headers, translation_stats))
 
     # Don't fail the whole pipeline if a few are weird
     if skipped_headers:
-        print(f"[parse_program_records] skipped={len(skipped_headers)} sample={skipped_headers[:5]}")
+        context.log.warning(f"Skipped {len(skipped_headers)} records, sample={skipped_headers[:5]}")
+        parsed_ids = {r["record_id"] for r in parsed}
+        _record_skipped(
+            db,
+            [
+                {"program_id": record_id, "fingerprint": fingerprint}
+                for record_id, fingerprint in seen.items()
+                if record_id not in parsed_ids
+            ],
+            "header not parsed",
+        )
 
-    print("Total parsed:", len(parsed))
+    context.add_output_metadata({
+        "parsed_count": len(parsed),
+        "skipped_count": len(skipped_headers),
+        "match_cycle": match_cycle,
+        "school": school,
+        # exact / prefix hits and misses of the French -> English lookups
+        **{f"translation_{k}": v for k, v in sorted(translation_stats.items())},
+    })
     return parsed
-@asset
-def load_programs_to_db(context: AssetExecutionContext, parse_program_records):
 
-   
+
+def _get_or_create(session, model, name: str):
+    """
+    Get-or-create a dimension row by its unique name. Uses ON CONFLICT so
+    partitions loading in parallel don't trip over each other's inserts.
+    """
+    row = session.exec(select(model).where(model.name == name)).first()
+    if row:
+        return row
+
+    session.execute(
+        pg_insert(model).values(name=name).on_conflict_do_nothing(index_elements=["name"])
+    )
+    return session.exec(select(model).where(model.name == name)).one()
+
+
+def _load_programs_row_by_row(session, records: list[dict]) -> dict[str, int]:
+    """
+    Get-or-create dimensions and upsert each program one record at a time.
+    A program listed more than once is loaded from its last entry, as in the
+    bulk merge, and its extra entries are counted as duplicates.
+    """
+
     inserted = 0
     updated = 0
     skipped = 0
     change_logs = 0
+    reassigned = 0
 
-    with Session(engine) as session:
-        try:
-            for record in parse_program_records:
-
-                # --- Compute hash ---
-                new_hash = hashlib.sha256(
-                    record["program_description"].encode("utf-8")
-                ).hexdigest()
-
-                # --- Get or create school ---
-                school = session.exec(
-                    select(School).where(School.name == record["school_name"])
-                ).first()
-
-                if not school:
-                    school = School(name=record["school_name"])
-                    session.add(school)
-                    session.flush()
-
-                # --- Get or create discipline ---
-                discipline = session.exec(
-                    select(Discipline).where(
-                        Discipline.name == record["discipline_name"]
-                    )
-                ).first()
+    # (cycle, program stream id) -> record; the last entry wins
+    latest = {(r["match_cycle"], r["program_stream_id"]): r for r in records}
 
-                if not discipline:
-                    discipline = Discipline(name=record["discipline_name"])
-                    session.add(discipline)
-                    session.flush()
+    for record in latest.values():
 
-                # --- Get or create stream ---
-                stream = session.exec(
-                    select(ProgramStream).where(
-                        ProgramStream.name == record["program_stream"]
-                    )
-                ).first()
-
-                if not stream:
-                    stream = ProgramStream(name=record["program_stream"])
-                    session.add(stream)
-                    session.flush()
-
-                # --- Get existing program ---
-                program = session.get(Program, record["program_stream_id"])
-
-                if not program:
-                    program = Program(
-                        program_stream_id=record["program_stream_id"],
-                        name=record["program_name"],
-                        site=record["program_site"],
-                        url=record["source_url"],
-                        description=record["program_description"],
-                        description_hash=new_hash,
-                        school_id=school.id,
-                        discipline_id=discipline.id,
-                        stream_id=stream.id,
+        # --- Compute hash ---
+        new_hash = hashlib.sha256(
+            record["program_description"].encode("utf-8")
+        ).hexdigest()
+
+        # --- Get or create school / discipline / stream ---
+        school = _get_or_create(session, School, record["school_name"])
+        discipline = _get_or_create(session, Discipline, record["discipline_name"])
+        stream = _get_or_create(session, ProgramStream, record["program_stream"])
+
+        # --- Get existing program ---
+        program = session.get(
+            Program,
+            {"match_cycle": record["match_cycle"], "program_stream_id": record["program_stream_id"]},
+        )
+
+        if not program:
+            program = Program(
+                match_cycle=record["match_cycle"],
+                program_stream_id=record["program_stream_id"],
+                name=record["program_name"],
+                site=record["program_site"],
+                url=record["source_url"],
+                description=record["program_description"],
+                description_hash=new_hash,
+                school_id=school.id,
+                discipline_id=discipline.id,
+                stream_id=stream.id,
+            )
+            session.add(program)
+            for version in new_versions(None, None, None, record["program_description"], new_hash):
+                session.add(ProgramVersion(
+                    match_cycle=program.match_cycle,
+                    program_stream_id=program.program_stream_id,
+                    **version,
+                ))
+            inserted += 1
+
+        else:
+            # Behaviour change: lookups fold case and accents, so French names
+            # such as "Université de Montréal" now parse to the English name.
+            # Move programs loaded before that onto the English rows.
+            dimension_ids = (school.id, discipline.id, stream.id)
+            if (program.school_id, program.discipline_id, program.stream_id) != dimension_ids:
+                program.school_id, program.discipline_id, program.stream_id = dimension_ids
+                program.updated_at = datetime.utcnow()
+                reassigned += 1
+
+            if program.description_hash != new_hash:
+
+                session.add(
+                    ProgramChangeLog(
+                        match_cycle=program.match_cycle,
+                        program_stream_id=program.program_stream_id,
+                        old_hash=program.description_hash,
+                        new_hash=new_hash,
                     )
-                    session.add(program)
-                    inserted += 1
+                )
+
+                last_version = session.exec(
+                    select(func.max(ProgramVersion.version))
+                    .where(ProgramVersion.match_cycle == program.match_cycle)
+                    .where(ProgramVersion.program_stream_id == program.program_stream_id)
+                ).one()
+                for version in new_versions(
+                    last_version,
+                    program.description,
+                    program.description_hash,
+                    record["program_description"],
+                    new_hash,
+                ):
+                    session.add(ProgramVersion(
+                        match_cycle=program.match_cycle,
+                        program_stream_id=program.program_stream_id,
+                        **version,
+                    ))
+
+                program.description = record["program_description"]
+                program.description_hash = new_hash
+                program.embedding = None  # stale, re-embedded by embed_programs
+                program.updated_at = datetime.utcnow()
+                updated += 1
+                change_logs += 1
+
+            else:
+                skipped += 1
+
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "skipped": skipped,
+        "duplicates": len(records) - len(latest),
+        "change_logs": change_logs,
+        "reassigned": reassigned,
+    }
+
 
-                else:
-                    if program.description_hash != new_hash:
+class LoadConfig(Config):
+    # COPY into a staging table and merge with set-based SQL
+    bulk: bool = False
 
-                        session.add(
-                            ProgramChangeLog(
-                                program_stream_id=program.program_stream_id,
-                                old_hash=program.description_hash,
-                                new_hash=new_hash,
-                            )
-                        )
 
-                        program.description = record["program_description"]
-                        program.description_hash = new_hash
-                        program.updated_at = datetime.utcnow()
-                        updated += 1
-                        change_logs += 1
+@asset(partitions_def=program_partitions)
+@instrumented
+def load_programs_to_db(
+    context: AssetExecutionContext,
+    config: LoadConfig,
+    db: PostgresResource,
+    parse_program_records,
+):
 
-                    else:
-                        skipped += 1
+    # a partition's records, read several times below
+    parse_program_records = list(parse_program_records)
 
+    new_partitions = ensure_cycle_partitions(
+        db.get_engine(), {r["match_cycle"] for r in parse_program_records}
+    )
+    if new_partitions:
+        context.log.info(f"Created table partitions {new_partitions}")
+
+    with db.session() as session:
+        try:
+            if config.bulk:
+                counts = bulk_load_programs(session, parse_program_records)
+            else:
+                counts = _load_programs_row_by_row(session, parse_program_records)
 
+            # same transaction, so a failed load is retried on the next run
+            _record_fingerprints(session, parse_program_records)
             session.commit()
 
         except Exception:
@@ -398,105 +509,453 @@ def load_programs_to_db(context: AssetExecutionContext, parse_program_records):
             raise
 
     context.add_output_metadata({
-        "inserted": inserted,
-        "updated": updated,
-        "skipped": skipped,
-        "change_logs": change_logs,
+        **counts,
         "total_processed": len(parse_program_records)
     })
 
-    return {
-        "inserted": inserted,
-        "updated": updated,
-        "skipped": skipped,
-        "change_logs": change_logs,
-    }
-
-@asset_check(asset=load_programs_to_db)
-def check_program_count(context):
-    """Verify the expected number of programs ended up in the database."""
-
+    return counts
+
+
+class EmbeddingConfig(Config):
+    model: str = "text-embedding-3-small"
+    # point at an OpenAI-compatible server (e.g. a local fake) instead of api.openai.com
+    base_url: str | None = None
+    max_batch_tokens: int = 100_000
+    max_batch_size: int = 100
+    max_in_flight: int = 4
+    requests_per_minute: int = 3000
+    tokens_per_minute: int = 1_000_000
+    max_retries: int = 5
+
+
+def _fill_from_cache(engine, table, hash_column: str, model: str, row_filter=None) -> int:
+    """Give rows without a vector the cached embedding of their text."""
+    cache = EmbeddingCache.__table__
+    stmt = (
+        update(table)
+        .where(table.c.embedding.is_(None))
+        .where(table.c[hash_column] == cache.c.content_hash)
+        .where(cache.c.model == model)
+        .values(embedding=cache.c.embedding)
+    )
+    if row_filter is not None:
+        stmt = stmt.where(row_filter)
     with Session(engine) as session:
-        count = session.exec(select(Program)).all()
+        reused = session.connection().execute(stmt).rowcount
+        session.commit()
+    return reused
+
 
-    return AssetCheckResult(
-        passed=len(count) == 815,
-        metadata={"db_program_count": len(count)}
+def _write_embeddings(engine, table, hash_column: str, model: str):
+    """
+    Build the per-batch commit callback. Each vector is cached under its
+    text hash and copied to every row that still has that exact text and no
+    vector, so replaying a batch is harmless.
+    """
+    cache_stmt = pg_insert(EmbeddingCache).on_conflict_do_nothing()
+    rows_stmt = (
+        update(table)
+        .where(table.c[hash_column] == bindparam("b_content_hash"))
+        .where(table.c.embedding.is_(None))
+        .values(embedding=bindparam("b_embedding"))
     )
 
-@asset
-def embed_programs(context: AssetExecutionContext, load_programs_to_db):
-    """Generate vector embeddings for programs that don't have one yet."""
+    def on_batch_done(batch: list[EmbeddingItem], vectors: list[list[float]]) -> None:
+        with Session(engine) as session:
+            conn = session.connection()
+            conn.execute(cache_stmt, [
+                {"content_hash": item.content_hash, "model": model, "embedding": vector}
+                for item, vector in zip(batch, vectors)
+            ])
+            conn.execute(rows_stmt, [
+                {"b_content_hash": item.content_hash, "b_embedding": vector}
+                for item, vector in zip(batch, vectors)
+            ])
+            session.commit()
+
+    return on_batch_done
+
+
+def _embed_missing(
+    context,
+    config: EmbeddingConfig,
+    engine,
+    table,
+    text_column: str,
+    hash_column: str,
+    row_filter=None,
+) -> None:
+    """
+    Fill every row of ``table`` (matching ``row_filter``, if given) that has
+    no embedding yet.
+
+    Embeddings are cached by (text hash, model): rows sharing a text are
+    embedded once, and text that was embedded before is never re-sent.
+    """
 
     import os
     openai_api_key = os.getenv("OPENAI_API_KEY")
+    if not openai_api_key and config.base_url:
+        openai_api_key = "unused"  # local OpenAI-compatible servers don't check it
     if not openai_api_key:
         raise RuntimeError(
             "OPENAI_API_KEY environment variable is required for embedding generation. "
             "Please set it in your environment or docker-compose.yaml"
         )
-    
+
+    # batching, retries and token checks are handled by the scheduler
     embeddings = OpenAIEmbeddings(
-        model="text-embedding-3-small",
+        model=config.model,
         api_key=openai_api_key,
+        base_url=config.base_url,
+        max_retries=0,
+        check_embedding_ctx_length=False,
     )
 
-    embedded = 0
-    skipped = 0
-
+    # identical text (same hash) already embedded with this model: reuse it
+    reused = _fill_from_cache(engine, table, hash_column, config.model, row_filter)
+
+    # one request item per distinct text, shared by every row using it
+    text_col, hash_col = table.c[text_column], table.c[hash_column]
+    missing = (
+        select(hash_col, func.min(text_col))
+        .where(table.c.embedding.is_(None))
+        .where(hash_col.isnot(None))
+        .where(text_col != "")
+        .group_by(hash_col)
+    )
+    if row_filter is not None:
+        missing = missing.where(row_filter)
     with Session(engine) as session:
+        rows = session.connection().execute(missing).all()
+
+    if not rows:
+        context.add_output_metadata({"embedded": 0, "reused": reused, "failed": 0, "total": 0})
+        return
+
+    scheduler = EmbeddingScheduler(
+        embeddings.embed_documents,
+        model=config.model,
+        max_batch_tokens=config.max_batch_tokens,
+        max_batch_size=config.max_batch_size,
+        max_in_flight=config.max_in_flight,
+        requests_per_minute=config.requests_per_minute,
+        tokens_per_minute=config.tokens_per_minute,
+        max_retries=config.max_retries,
+        log=context.log,
+    )
+    stats = scheduler.run(
+        (EmbeddingItem(key=h, text=t, content_hash=h) for h, t in rows),
+        on_batch_done=_write_embeddings(engine, table, hash_column, config.model),
+    )
 
-        programs = session.exec(
-            select(Program).where(Program.embedding.is_(None))
-        ).all()
+    context.add_output_metadata({
+        "embedded": stats.embedded,
+        "reused": reused,
+        "failed": stats.failed_items,
+        "total": len(rows),
+        "batches": stats.batches,
+        "retries": stats.retries,
+        "truncated": stats.truncated,
+    })
+
+    # finished batches are already committed; a rerun picks up the rest
+    if stats.failed_batches:
+        raise RuntimeError(
+            f"{stats.failed_batches} embedding batches ({stats.failed_items} texts) failed: "
+            f"{stats.errors[:3]}"
+        )
 
-        programs_to_embed = [p for p in programs if p.embedding is None]
-
-        if not programs_to_embed:
-            context.add_output_metadata({
-                "embedded": 0,
-                "skipped": len(programs),
-                "total": len(programs),
-            })
-            return 
-        
-        # Batch embeddings to avoid rate limits (OpenAI allows ~3000 req/min)
-        batch_size = 100
-        total_batches = (len(programs_to_embed) + batch_size - 1) // batch_size
-        
-        context.log.info(f"Embedding {len(programs_to_embed)} programs in {total_batches} batches of {batch_size}")
-        
-        for batch_idx in range(0, len(programs_to_embed), batch_size):
-            batch = programs_to_embed[batch_idx:batch_idx + batch_size]
-            texts = [p.description for p in batch if p.description]
-            
-            if not texts:
-                continue
-                
-            try:
-                context.log.info(f"Processing batch {batch_idx // batch_size + 1}/{total_batches} ({len(texts)} texts)")
-                vectors = embeddings.embed_documents(texts)
-                
-                # Assign back
-                text_idx = 0
-                for program in batch:
-                    if program.description:
-                        program.embedding = vectors[text_idx]
-                        text_idx += 1
-                
-                session.commit()
-                embedded += len(texts)
-                context.log.info(f"Batch {batch_idx // batch_size + 1} complete. Total embedded: {embedded}")
-                
-            except Exception as e:
-                context.log.error(f"Error embedding batch {batch_idx // batch_size + 1}: {e}")
-                session.rollback()
-                raise
-
-        skipped = len(programs) - embedded
 
-        context.add_output_metadata({
-                "embedded": embedded,
-                "skipped": skipped,
-                "total": len(programs),
-            })
\ No newline at end of file
+def _partition_program_filter(match_cycle: str, school: str):
+    """Rows of one (match cycle, school) partition; the cycle prunes to one table partition."""
+    program = Program.__table__
+    return (program.c.match_cycle == match_cycle) & program.c.school_id.in_(
+        select(School.id).where(School.name == school)
+    )
+
+
+@asset(partitions_def=program_partitions)
+@instrumented
+def embed_programs(
+    context: AssetExecutionContext,
+    config: EmbeddingConfig,
+    db: PostgresResource,
+    load_programs_to_db,
+):
+    """Generate vector embeddings for programs that don't have one yet."""
+
+    _embed_missing(
+        context,
+        config,
+        db.get_engine(),
+        Program.__table__,
+        "description",
+        "description_hash",
+        row_filter=_partition_program_filter(*partition_of(context)),
+    )
+
+
+@asset(deps=[load_programs_to_db])
+@instrumented
+def chunk_programs(context: AssetExecutionContext, db: PostgresResource):
+    """Split descriptions into one chunk per markdown section.
+
+    Only programs whose chunks were cut from an older description (or that
+    have none yet) are re-chunked.
+    """
+
+    current_chunks = (
+        select(ProgramChunk.program_stream_id)
+        .where(ProgramChunk.match_cycle == Program.match_cycle)
+        .where(ProgramChunk.program_stream_id == Program.program_stream_id)
+        .where(ProgramChunk.description_hash == Program.description_hash)
+        .exists()
+    )
+
+    with db.session() as session:
+        try:
+            stale = session.exec(
+                select(
+                    Program.match_cycle,
+                    Program.program_stream_id,
+                    Program.name,
+                    Program.description,
+                    Program.description_hash,
+                )
+                .where(Program.description.isnot(None))
+                .where(~current_chunks)
+            ).all()
+
+            stale_keys = [(cycle, pid) for cycle, pid, _, _, _ in stale]
+            if stale_keys:
+                session.execute(
+                    delete(ProgramChunk).where(
+                        tuple_(ProgramChunk.match_cycle, ProgramChunk.program_stream_id).in_(stale_keys)
+                    )
+                )
+
+            chunk_rows = [
+                {**chunk, "match_cycle": cycle, "program_stream_id": pid, "description_hash": h}
+                for cycle, pid, name, description, h in stale
+                for chunk in build_chunks(name, description)
+            ]
+            if chunk_rows:
+                session.connection().execute(insert(ProgramChunk), chunk_rows)
+
+            session.commit()
+
+        except Exception:
+            session.rollback()
+            raise
+
+    context.add_output_metadata({
+        "rechunked_programs": len(stale),
+        "chunks_written": len(chunk_rows),
+    })
+
+
+@asset(deps=[chunk_programs])
+@instrumented
+def embed_program_chunks(context: AssetExecutionContext, config: EmbeddingConfig, db: PostgresResource):
+    """Generate vector embeddings for description chunks that don't have one yet."""
+
+    _embed_missing(context, config, db.get_engine(), ProgramChunk.__table__, "content", "content_hash")
+
+
+@asset(deps=[load_programs_to_db])
+@instrumented
+def extract_program_facts(context: AssetExecutionContext, db: PostgresResource):
+    """Extract interview / application facts once per description hash.
+
+    Hashes without facts (or with facts from an older FACTS_VERSION) are
+    extracted; facts no program points at any more are dropped.
+    """
+
+    current = select(ProgramFacts.description_hash).where(ProgramFacts.extractor_version == FACTS_VERSION)
+    in_use = select(Program.description_hash).where(Program.description_hash.isnot(None))
+
+    with db.session() as session:
+        try:
+            pending = session.exec(
+                select(Program.description_hash, func.min(Program.description))
+                .where(Program.description_hash.isnot(None))
+                .where(Program.description_hash.notin_(current))
+                .group_by(Program.description_hash)
+            ).all()
+            pending_hashes = [h for h, _ in pending]
+
+            stale = session.exec(
+                select(ProgramFacts.description_hash).where(
+                    or_(
+                        ProgramFacts.description_hash.notin_(in_use),
+                        ProgramFacts.description_hash.in_(pending_hashes),
+                    )
+                )
+            ).all()
+            if stale:
+                for model in (ProgramInterviewDate, ProgramInterviewCriterion, ProgramFacts):
+                    session.execute(delete(model).where(model.description_hash.in_(stale)))
+
+            fact_rows, date_rows, criterion_rows = [], [], []
+            for h, description in pending:
+                facts = extract_facts(description or "")
+                fact_rows.append({
+                    "description_hash": h,
+                    "application_bucket": facts["application_bucket"],
+                    "interview_offer_bucket": facts["interview_offer_bucket"],
+                    "extractor_version": FACTS_VERSION,
+                    "extracted_at": datetime.utcnow(),
+                })
+                date_rows.extend(
+                    {"description_hash": h, "date_text": text, "interview_date": d}
+                    for text, d in facts["interview_dates"]
+                )
+                criterion_rows.extend({"description_hash": h, **c} for c in facts["criteria"])
+
+            conn = session.connection()
+            for model, rows in (
+                (ProgramFacts, fact_rows),
+                (ProgramInterviewDate, date_rows),
+                (ProgramInterviewCriterion, criterion_rows),
+            ):
+                if rows:
+                    conn.execute(insert(model), rows)
+
+            session.commit()
+
+        except Exception:
+            session.rollback()
+            raise
+
+    context.add_output_metadata({
+        "extracted": len(fact_rows),
+        "dropped": len(set(stale) - set(pending_hashes)),
+        "interview_dates": len(date_rows),
+        "criteria": len(criterion_rows),
+        "facts_version": FACTS_VERSION,
+    })
+
+
+class DedupConfig(Config):
+    # estimated Jaccard similarity of word shingles above which descriptions are near-duplicates
+    threshold: float = 0.8
+
+
+@asset(deps=[load_programs_to_db])
+@instrumented
+def cluster_program_descriptions(context: AssetExecutionContext, config: DedupConfig, db: PostgresResource):
+    """Group near-duplicate descriptions and store a cluster id per program.
+
+    MinHash signatures are computed once per description hash; LSH banding
+    and clustering then run over all stored signatures, which is cheap.
+    """
+
+    current = select(DescriptionSignature.description_hash).where(
+        DescriptionSignature.minhash_version == MINHASH_VERSION
+    )
+    in_use = select(Program.description_hash).where(Program.description_hash.isnot(None))
+
+    with db.session() as session:
+        try:
+            pending = session.exec(
+                select(Program.description_hash, func.min(Program.description))
+                .where(Program.description_hash.isnot(None))
+                .where(Program.description_hash.notin_(current))
+                .group_by(Program.description_hash)
+            ).all()
+
+            if pending:
+                stmt = pg_insert(DescriptionSignature).values([
+                    {
+                        "description_hash": h,
+                        "signature": to_bytes(minhash(description or "")),
+                        "minhash_version": MINHASH_VERSION,
+                    }
+                    for h, description in pending
+                ])
+                session.execute(stmt.on_conflict_do_update(
+                    index_elements=[DescriptionSignature.description_hash],
+                    set_={
+                        "signature": stmt.excluded.signature,
+                        "minhash_version": stmt.excluded.minhash_version,
+                    },
+                ))
+
+            dropped = session.execute(
+                delete(DescriptionSignature).where(DescriptionSignature.description_hash.notin_(in_use))
+            ).rowcount
+
+            signatures = {
+                h: from_bytes(sig)
+                for h, sig in session.exec(
+                    select(DescriptionSignature.description_hash, DescriptionSignature.signature)
+                ).all()
+            }
+            clusters = cluster(signatures, config.threshold)
+
+            # only rewrite programs whose cluster moved; updated_at moves too, so
+            # the API's response cache (keyed on max(updated_at)) sees the change
+            assigned = dict(session.exec(
+                select(Program.description_hash, func.min(Program.cluster_id))
+                .where(Program.description_hash.isnot(None))
+                .group_by(Program.description_hash)
+            ).all())
+            moved = [
+                {"h": h, "c": cluster_id}
+                for h, cluster_id in clusters.items()
+                if assigned.get(h) != cluster_id
+            ]
+            if moved:
+                session.connection().execute(
+                    update(Program.__table__)
+                    .where(Program.__table__.c.description_hash == bindparam("h"))
+                    .values(cluster_id=bindparam("c"), updated_at=datetime.utcnow()),
+                    moved,
+                )
+
+            session.commit()
+
+        except Exception:
+            session.rollback()
+            raise
+
+    sizes = Counter(clusters.values())
+    context.add_output_metadata({
+        "new_signatures": len(pending),
+        "dropped_signatures": dropped,
+        "descriptions": len(clusters),
+        "clusters": len(sizes),
+        "near_duplicate_clusters": sum(1 for n in sizes.values() if n > 1),
+        "largest_cluster": max(sizes.values(), default=0),
+        "reassigned_descriptions": len(moved),
+    })
+
+
+@asset(deps=[load_programs_to_db])
+@instrumented
+def refresh_analytics_views(context: AssetExecutionContext, db: PostgresResource):
+    """Refresh the analytics materialized views.
+
+    Each view is refreshed CONCURRENTLY in its own short transaction, so the
+    API keeps reading the previous contents until the new ones are swapped in.
+    """
+
+    engine = db.get_engine()
+    durations = {}
+    for name in ANALYTICS_VIEWS:
+        start = time.perf_counter()
+        with engine.begin() as conn:
+            # a view created WITH NO DATA can't be refreshed concurrently the first time
+            populated = conn.execute(
+                text("SELECT ispopulated FROM pg_matviews WHERE matviewname = :name"),
+                {"name": name},
+            ).scalar()
+            concurrently = "CONCURRENTLY " if populated else ""
+            conn.execute(text(f"REFRESH MATERIALIZED VIEW {concurrently}{name}"))
+        durations[f"{name}_refresh_s"] = round(time.perf_counter() - start, 3)
+
+    context.add_output_metadata({
+        **durations,
+        "refreshed_at": datetime.utcnow().isoformat(timespec="seconds"),
+    })
@@ -0,0 +1,253 @@
+"""
+Set-based loading of parsed program records.
+
+The whole batch is COPYed into a temporary staging table and merged into
+the dimension, program and change-log tables with a handful of
+statements, instead of several SELECTs and flushes per record. Only the
+description versions are built in Python (they are zlib-compressed and
+deltas need the old text): the new text is already in hand, so only the
+previous text of changed programs is read back.
+"""
+import csv
+import hashlib
+import io
+from datetime import datetime
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from services.api.app.models import ProgramVersion
+from services.api.app.program_versions import new_versions
+
+_STAGING_COLUMNS = (
+    "seq",
+    "match_cycle",
+    "program_stream_id",
+    "school_name",
+    "discipline_name",
+    "program_stream",
+    "program_name",
+    "program_site",
+    "source_url",
+    "program_description",
+    "description_hash",
+)
+
+_CREATE_STAGING = """
+CREATE TEMP TABLE program_load_staging (
+    seq integer NOT NULL,
+    match_cycle text NOT NULL,
+    program_stream_id text NOT NULL,
+    school_name text NOT NULL,
+    discipline_name text NOT NULL,
+    program_stream text NOT NULL,
+    program_name text NOT NULL,
+    program_site text,
+    source_url text,
+    program_description text NOT NULL,
+    description_hash text NOT NULL
+) ON COMMIT DROP
+"""
+
+# last occurrence wins when a program appears twice in one batch
+_CREATE_LATEST = """
+CREATE TEMP TABLE program_load_latest ON COMMIT DROP AS
+SELECT DISTINCT ON (match_cycle, program_stream_id) *
+FROM program_load_staging
+ORDER BY match_cycle, program_stream_id, seq DESC
+"""
+
+_INSERT_DIMENSIONS = [
+    """
+    INSERT INTO school (name)
+    SELECT DISTINCT school_name FROM program_load_latest
+    ON CONFLICT (name) DO NOTHING
+    """,
+    """
+    INSERT INTO discipline (name)
+    SELECT DISTINCT discipline_name FROM program_load_latest
+    ON CONFLICT (name) DO NOTHING
+    """,
+    """
+    INSERT INTO programstream (name)
+    SELECT DISTINCT program_stream FROM program_load_latest
+    ON CONFLICT (name) DO NOTHING
+    """,
+]
+
+# must run before the update below: batch size after de-duplication, and how
+# many of those programs already exist with the same description
+_COUNT_LATEST = """
+SELECT count(*), count(*) FILTER (WHERE p.description_hash = l.description_hash)
+FROM program_load_latest l
+LEFT JOIN program p ON p.match_cycle = l.match_cycle AND p.program_stream_id = l.program_stream_id
+"""
+
+# must run before the update below, while program still has the old hash
+_INSERT_CHANGE_LOGS = """
+INSERT INTO programchangelog (match_cycle, program_stream_id, changed_at, old_hash, new_hash)
+SELECT p.match_cycle, p.program_stream_id, now() AT TIME ZONE 'utc', p.description_hash, l.description_hash
+FROM program_load_latest l
+JOIN program p ON p.match_cycle = l.match_cycle AND p.program_stream_id = l.program_stream_id
+WHERE p.description_hash IS DISTINCT FROM l.description_hash
+"""
+
+# both must run before the update / insert below; the new text is taken
+# from the records, only the previous text of changed programs is read
+_SELECT_CHANGED = """
+SELECT l.match_cycle, l.program_stream_id, p.description, p.description_hash,
+       (SELECT max(v.version) FROM programversion v
+        WHERE v.match_cycle = p.match_cycle AND v.program_stream_id = p.program_stream_id)
+FROM program_load_latest l
+JOIN program p ON p.match_cycle = l.match_cycle AND p.program_stream_id = l.program_stream_id
+WHERE p.description_hash IS DISTINCT FROM l.description_hash
+"""
+
+_SELECT_NEW = """
+SELECT l.match_cycle, l.program_stream_id
+FROM program_load_latest l
+WHERE NOT EXISTS (
+    SELECT 1 FROM program p
+    WHERE p.match_cycle = l.match_cycle AND p.program_stream_id = l.program_stream_id
+)
+"""
+
+_UPDATE_PROGRAMS = """
+UPDATE program p
+SET description = l.program_description,
+    description_hash = l.description_hash,
+    embedding = NULL,
+    updated_at = now() AT TIME ZONE 'utc'
+FROM program_load_latest l
+WHERE p.match_cycle = l.match_cycle
+  AND p.program_stream_id = l.program_stream_id
+  AND p.description_hash IS DISTINCT FROM l.description_hash
+"""
+
+# existing programs whose school / discipline / stream name now resolves to
+# another row. Behaviour change: lookups fold case and accents, so French
+# names such as 'Université de Montréal' now parse to the English name;
+# programs loaded before that are moved onto the English rows here (and by
+# migration 9de718597fa0), and counted as "reassigned".
+_UPDATE_DIMENSION_IDS = """
+UPDATE program p
+SET school_id = s.id, discipline_id = d.id, stream_id = st.id,
+    updated_at = now() AT TIME ZONE 'utc'
+FROM program_load_latest l
+JOIN school s ON s.name = l.school_name
+JOIN discipline d ON d.name = l.discipline_name
+JOIN programstream st ON st.name = l.program_stream
+WHERE p.match_cycle = l.match_cycle
+  AND p.program_stream_id = l.program_stream_id
+  AND (p.school_id, p.discipline_id, p.stream_id) IS DISTINCT FROM (s.id, d.id, st.id)
+"""
+
+_INSERT_PROGRAMS = """
+INSERT INTO program (
+    match_cycle, program_stream_id, name, site, url, description, description_hash,
+    school_id, discipline_id, stream_id, updated_at
+)
+SELECT
+    l.match_cycle, l.program_stream_id, l.program_name, l.program_site, l.source_url,
+    l.program_description, l.description_hash,
+    s.id, d.id, st.id, now() AT TIME ZONE 'utc'
+FROM program_load_latest l
+JOIN school s ON s.name = l.school_name
+JOIN discipline d ON d.name = l.discipline_name
+JOIN programstream st ON st.name = l.program_stream
+ON CONFLICT (match_cycle, program_stream_id) DO NOTHING
+"""
+
+
+def _staging_csv(records, hashes: list[str]) -> io.StringIO:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    for seq, (record, description_hash) in enumerate(zip(records, hashes)):
+        writer.writerow([
+            seq,
+            record["match_cycle"],
+            record["program_stream_id"],
+            record["school_name"],
+            record["discipline_name"],
+            record["program_stream"],
+            record["program_name"],
+            record["program_site"],
+            record["source_url"],
+            record["program_description"],
+            description_hash,
+        ])
+    buf.seek(0)
+    return buf
+
+
+def bulk_load_programs(session, records: list[dict]) -> dict[str, int]:
+    """
+    Merge parsed records into the database in one transaction's worth of
+    set-based statements. Does not commit; the caller owns the transaction.
+
+    Returns the same counts, under the same keys, as the row-by-row loader:
+    a changed description counts as one update and one change log, an
+    unchanged one as skipped. A program listed more than once in the batch
+    is merged (the last entry wins) and its extra entries are counted as
+    duplicates.
+    """
+    if not records:
+        return {"inserted": 0, "updated": 0, "skipped": 0, "change_logs": 0, "reassigned": 0, "duplicates": 0}
+
+    hashes = [hashlib.sha256(r["program_description"].encode("utf-8")).hexdigest() for r in records]
+    # (cycle, program stream id) -> (description, hash); the last entry wins, as in the merge
+    latest = {
+        (r["match_cycle"], r["program_stream_id"]): (r["program_description"], h)
+        for r, h in zip(records, hashes)
+    }
+
+    session.execute(text(_CREATE_STAGING))
+
+    # COPY goes through the raw psycopg2 cursor of the session's connection;
+    # FORCE_NOT_NULL keeps empty strings from being read back as NULL
+    raw_conn = session.connection().connection
+    with raw_conn.cursor() as cur:
+        cur.copy_expert(
+            f"COPY program_load_staging ({', '.join(_STAGING_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv, FORCE_NOT_NULL ("
+            "match_cycle, school_name, discipline_name, program_stream, program_name, "
+            "program_site, program_description))",
+            _staging_csv(records, hashes),
+        )
+
+    session.execute(text(_CREATE_LATEST))
+    distinct, unchanged = session.execute(text(_COUNT_LATEST)).one()
+    for statement in _INSERT_DIMENSIONS:
+        session.execute(text(statement))
+
+    versions = [
+        {"match_cycle": cycle, "program_stream_id": pid, **version}
+        for cycle, pid, old, old_hash, last_version in session.execute(text(_SELECT_CHANGED))
+        for version in new_versions(last_version, old, old_hash, *latest[cycle, pid])
+    ]
+    versions += [
+        {"match_cycle": cycle, "program_stream_id": pid, **version}
+        for cycle, pid in session.execute(text(_SELECT_NEW))
+        for version in new_versions(None, None, None, *latest[cycle, pid])
+    ]
+    created_at = datetime.utcnow()
+    for version in versions:
+        version["created_at"] = created_at
+
+    change_logs = session.execute(text(_INSERT_CHANGE_LOGS)).rowcount
+    updated = session.execute(text(_UPDATE_PROGRAMS)).rowcount
+    reassigned = session.execute(text(_UPDATE_DIMENSION_IDS)).rowcount
+    inserted = session.execute(text(_INSERT_PROGRAMS)).rowcount
+    if versions:
+        # a Core insert with a parameter list is sent as multi-row VALUES
+        # batches (insertmanyvalues), not one statement per version
+        session.execute(pg_insert(ProgramVersion).on_conflict_do_nothing(), versions)
+
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "skipped": unchanged,
+        "duplicates": len(records) - distinct,
+        "change_logs": change_logs,
+        "reassigned": reassigned,
+    }
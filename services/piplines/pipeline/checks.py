@@ -0,0 +1,176 @@
+"""
+Data quality checks for the program tables.
+
+Every check is aggregate SQL pushed down to Postgres; no ORM
+rows (and none of the 1536-dim embeddings) are loaded into Python.
+"""
+from dagster import AssetCheckResult, AssetCheckSeverity, AssetIn, asset_check
+from sqlalchemy import func, or_, tuple_
+from sqlmodel import select
+
+from services.api.app.models import (
+    Discipline,
+    Program,
+    ProgramChangeLog,
+    ProgramStream,
+    School,
+)
+from .assets import _partition_program_filter, embed_programs, load_programs_to_db
+from .partitions import partition_of
+from .resources import PostgresResource
+
+
+def _checked_partition(context) -> tuple[str, str] | None:
+    """(match_cycle, school) of the partition the check runs for, if any."""
+    op_context = context.op_execution_context
+    return partition_of(op_context) if op_context.has_partition_key else None
+
+
+@asset_check(
+    asset=load_programs_to_db,
+    additional_ins={
+        "parse_program_records": AssetIn(metadata={"columns": ["match_cycle", "program_stream_id"]}),
+    },
+)
+def check_program_count(context, db: PostgresResource, parse_program_records):
+    """
+    Every program parsed for the partition has a row in the program table.
+
+    The expected size is the parse output of the same partition (distinct
+    program ids), read independently of the loader's own counts; the
+    partition's total program count is reported alongside. An incremental
+    run that parsed nothing has nothing to compare, which is a warning.
+    """
+
+    partition = _checked_partition(context)
+    expected = {(r["match_cycle"], r["program_stream_id"]) for r in parse_program_records}
+
+    with db.session() as session:
+        found = 0
+        if expected:
+            found = session.exec(
+                select(func.count())
+                .select_from(Program)
+                .where(tuple_(Program.match_cycle, Program.program_stream_id).in_(list(expected)))
+            ).one()
+        programs = select(func.count()).select_from(Program)
+        if partition:
+            programs = programs.where(_partition_program_filter(*partition))
+        program_count = session.exec(programs).one()
+
+    metadata = {
+        "parsed_programs": len(expected),
+        "parsed_programs_in_db": found,
+        "program_count": program_count,
+    }
+    if partition:
+        metadata.update({"match_cycle": partition[0], "school": partition[1]})
+
+    if not expected:
+        return AssetCheckResult(
+            passed=False,
+            severity=AssetCheckSeverity.WARN,
+            description="No records were parsed for this partition; nothing to compare",
+            metadata=metadata,
+        )
+    return AssetCheckResult(passed=found == len(expected), metadata=metadata)
+
+
+@asset_check(asset=load_programs_to_db)
+def check_program_descriptions(context, db: PostgresResource):
+    """No program has a null or blank description."""
+
+    with db.session() as session:
+        empty = session.exec(
+            select(func.count())
+            .select_from(Program)
+            .where(or_(Program.description.is_(None), func.btrim(Program.description) == ""))
+        ).one()
+
+    return AssetCheckResult(
+        passed=empty == 0,
+        severity=AssetCheckSeverity.WARN,
+        metadata={"empty_descriptions": empty},
+    )
+
+
+@asset_check(asset=load_programs_to_db)
+def check_orphaned_foreign_keys(context, db: PostgresResource):
+    """Programs and change logs only point at rows that exist."""
+
+    def _orphans(session, model, target, on_clause, target_column) -> int:
+        return session.exec(
+            select(func.count())
+            .select_from(model)
+            .outerjoin(target, on_clause)
+            .where(target_column.is_(None))
+        ).one()
+
+    with db.session() as session:
+        orphans = {
+            "orphaned_school": _orphans(
+                session, Program, School, Program.school_id == School.id, School.id
+            ),
+            "orphaned_discipline": _orphans(
+                session, Program, Discipline, Program.discipline_id == Discipline.id, Discipline.id
+            ),
+            "orphaned_stream": _orphans(
+                session, Program, ProgramStream, Program.stream_id == ProgramStream.id, ProgramStream.id
+            ),
+            "orphaned_change_logs": _orphans(
+                session,
+                ProgramChangeLog,
+                Program,
+                (ProgramChangeLog.match_cycle == Program.match_cycle)
+                & (ProgramChangeLog.program_stream_id == Program.program_stream_id),
+                Program.program_stream_id,
+            ),
+        }
+
+    return AssetCheckResult(passed=not any(orphans.values()), metadata=orphans)
+
+
+@asset_check(asset=load_programs_to_db)
+def check_duplicate_program_names(context, db: PostgresResource):
+    """
+    No program name appears twice for the same school and stream in one cycle.
+    (The same program is legitimately listed once per stream, e.g. CMG and IMG.)
+    """
+
+    with db.session() as session:
+        duplicates = (
+            select(Program.match_cycle, Program.school_id, Program.stream_id, Program.name)
+            .group_by(Program.match_cycle, Program.school_id, Program.stream_id, Program.name)
+            .having(func.count() > 1)
+            .subquery()
+        )
+        duplicate_groups = session.exec(select(func.count()).select_from(duplicates)).one()
+
+    return AssetCheckResult(
+        passed=duplicate_groups == 0,
+        severity=AssetCheckSeverity.WARN,
+        metadata={"duplicate_name_groups": duplicate_groups},
+    )
+
+
+@asset_check(asset=embed_programs)
+def check_missing_embeddings(context, db: PostgresResource):
+    """Every program with a description (in the partition just embedded) has an embedding."""
+
+    partition = _checked_partition(context)
+    query = (
+        select(func.count())
+        .select_from(Program)
+        .where(Program.description.isnot(None))
+        .where(Program.embedding.is_(None))
+    )
+    if partition:
+        query = query.where(_partition_program_filter(*partition))
+
+    with db.session() as session:
+        missing = session.exec(query).one()
+
+    metadata = {"missing_embeddings": missing}
+    if partition:
+        metadata.update({"match_cycle": partition[0], "school": partition[1]})
+    return AssetCheckResult(passed=missing == 0, metadata=metadata)
@@ -0,0 +1,53 @@
+"""
+Split program descriptions into section chunks for retrieval.
+
+Descriptions are markdown with a section per ``#`` / ``##`` heading
+(Program overview, Interviews, evaluation criteria, application stats...).
+Each section becomes one chunk; deeper headings stay inside their section.
+"""
+import hashlib
+import re
+
+_SECTION_HEADING_RE = re.compile(r"^\s*#{1,2}(?!#)\s*(.+?)\s*#*\s*$")
+
+# text before the first heading
+DEFAULT_SECTION = "Overview"
+
+
+def split_sections(description: str) -> list[tuple[str, str]]:
+    """
+    Return (section, text) pairs in document order. The heading line is kept
+    at the top of its text; sections with no body are dropped.
+    """
+    sections: list[tuple[str, list[str]]] = [(DEFAULT_SECTION, [])]
+
+    for line in description.split("\n"):
+        m = _SECTION_HEADING_RE.match(line)
+        if m:
+            sections.append((m.group(1), [line.strip()]))
+        else:
+            sections[-1][1].append(line)
+
+    chunks = []
+    for section, lines in sections:
+        body = [ln for ln in lines if ln.strip() and not _SECTION_HEADING_RE.match(ln)]
+        if body:
+            chunks.append((section, "\n".join(lines).strip()))
+    return chunks
+
+
+def build_chunks(program_name: str, description: str) -> list[dict]:
+    """
+    Chunk rows for one program. The program name is prepended to every chunk
+    so a section still says which program it belongs to when retrieved alone.
+    """
+    rows = []
+    for index, (section, section_text) in enumerate(split_sections(description)):
+        content = f"{program_name}\n{section_text}"
+        rows.append({
+            "chunk_index": index,
+            "section": section,
+            "content": content,
+            "content_hash": hashlib.sha256(content.encode("utf-8")).hexdigest(),
+        })
+    return rows
@@ -0,0 +1,92 @@
+"""
+Near-duplicate detection for program descriptions (MinHash + LSH).
+
+Many programs reuse a school's boilerplate description across sites and
+streams with only a few lines changed. Each description gets a MinHash
+signature of its word shingles; signatures are split into bands and
+descriptions sharing a band are candidates, kept when their estimated
+Jaccard similarity reaches the threshold. Clusters are the connected
+components of the kept pairs.
+"""
+import re
+import zlib
+from collections import defaultdict
+
+import numpy as np
+
+# bump when shingling or hashing changes so stored signatures are recomputed
+MINHASH_VERSION = 1
+
+NUM_PERM = 128
+# 16 bands of 8 rows: pairs above ~0.7 Jaccard almost always share a band
+BANDS = 16
+SHINGLE_WORDS = 5
+
+_MERSENNE_PRIME = np.uint64((1 << 61) - 1)
+_MAX_HASH = np.uint64((1 << 32) - 1)
+_rng = np.random.default_rng(1503)
+# a, b < 2**32 so a * x + b stays inside uint64 for 32-bit x
+_A = _rng.integers(1, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, 1 << 32, size=NUM_PERM, dtype=np.uint64)
+
+_WORD_RE = re.compile(r"\w+")
+
+
+def shingles(text: str) -> np.ndarray:
+    """32-bit hashes of the overlapping ``SHINGLE_WORDS``-word windows."""
+    words = _WORD_RE.findall(text.lower())
+    if len(words) < SHINGLE_WORDS:
+        windows = [" ".join(words)]
+    else:
+        windows = [" ".join(words[i:i + SHINGLE_WORDS]) for i in range(len(words) - SHINGLE_WORDS + 1)]
+    return np.unique(np.fromiter((zlib.crc32(w.encode("utf-8")) for w in windows), dtype=np.uint64))
+
+
+def minhash(text: str) -> np.ndarray:
+    """``NUM_PERM`` uint32 minimums, one per hash permutation."""
+    x = shingles(text)
+    hashed = ((x[:, None] * _A + _B) % _MERSENNE_PRIME) & _MAX_HASH
+    return hashed.min(axis=0).astype(np.uint32)
+
+
+def to_bytes(signature: np.ndarray) -> bytes:
+    return signature.astype("<u4").tobytes()
+
+
+def from_bytes(data: bytes) -> np.ndarray:
+    return np.frombuffer(data, dtype="<u4")
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of the two shingle sets."""
+    return float(np.mean(a == b))
+
+
+def cluster(signatures: dict[str, np.ndarray], threshold: float) -> dict[str, str]:
+    """
+    Map every key to its cluster id: the smallest key of its cluster, so ids
+    stay put as long as that member does.
+    """
+    parent = {key: key for key in signatures}
+
+    def find(key):
+        while parent[key] != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    rows = NUM_PERM // BANDS
+    for band in range(BANDS):
+        buckets = defaultdict(list)
+        for key, sig in signatures.items():
+            buckets[sig[band * rows:(band + 1) * rows].tobytes()].append(key)
+
+        for members in buckets.values():
+            for i, first in enumerate(members):
+                for other in members[i + 1:]:
+                    a, b = find(first), find(other)
+                    if a != b and similarity(signatures[first], signatures[other]) >= threshold:
+                        # the smaller root wins, so a root is its cluster's smallest key
+                        parent[max(a, b)] = min(a, b)
+
+    return {key: find(key) for key in signatures}
@@ -1,5 +1,28 @@
-from dagster import Definitions
-from .assets import check_program_count, embed_programs, load_programs_to_db, parse_program_records, raw_program_descriptions, staging_program_descriptions
+import os
+
+from dagster import Definitions, EnvVar
+from .assets import (
+    chunk_programs,
+    cluster_program_descriptions,
+    embed_program_chunks,
+    embed_programs,
+    extract_program_facts,
+    load_programs_to_db,
+    parse_program_records,
+    raw_program_descriptions,
+    refresh_analytics_views,
+    staging_program_descriptions,
+)
+from .checks import (
+    check_duplicate_program_names,
+    check_missing_embeddings,
+    check_orphaned_foreign_keys,
+    check_program_count,
+    check_program_descriptions,
+)
+from .io_managers import ParquetIOManager
+from .resources import PostgresResource
+from .sensors import raw_data_sensor
 
 defs = Definitions(
     assets=[
@@ -8,7 +31,27 @@ defs = Definitions(
         parse_program_records,
         load_programs_to_db,
         embed_programs,
+        chunk_programs,
+        embed_program_chunks,
+        extract_program_facts,
+        cluster_program_descriptions,
+        refresh_analytics_views,
+    ],
+    asset_checks=[
         check_program_count,
-        
-    ]
+        check_program_descriptions,
+        check_orphaned_foreign_keys,
+        check_duplicate_program_names,
+        check_missing_embeddings,
+    ],
+    sensors=[raw_data_sensor],
+    resources={
+        # resolved and connected at run time, never while loading the code location
+        "db": PostgresResource(
+            database_url=EnvVar("DATABASE_URL"),
+            echo=os.getenv("SQL_ECHO", "false").lower() == "true",
+        ),
+        # raw / staged / parsed record lists as Parquet instead of pickles
+        "parquet_io_manager": ParquetIOManager(),
+    },
 )
\ No newline at end of file
@@ -0,0 +1,219 @@
+"""
+Concurrent, rate-limit-aware scheduling of embedding requests.
+
+Texts are packed into batches by token count, several batches are kept in
+flight under a requests-per-minute and tokens-per-minute budget, and
+failed requests are retried with exponential backoff. Finished batches
+are handed back to the caller one at a time (on the calling thread) so
+they can be committed as they arrive.
+"""
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Callable
+
+import tiktoken
+
+# text-embedding-3-* input limit
+MAX_INPUT_TOKENS = 8191
+
+
+@dataclass
+class EmbeddingItem:
+    key: str
+    text: str
+    content_hash: str | None = None
+    tokens: int = 0
+
+
+@dataclass
+class SchedulerStats:
+    embedded: int = 0
+    batches: int = 0
+    retries: int = 0
+    truncated: int = 0
+    failed_batches: int = 0
+    failed_items: int = 0
+    errors: list[str] = field(default_factory=list)
+
+
+class EmbeddingBatchError(Exception):
+    """A batch that still failed after all retries; carries how many were made."""
+
+    def __init__(self, error: Exception, retries: int):
+        super().__init__(str(error))
+        self.retries = retries
+
+
+class RateLimiter:
+    """Sliding one-minute window over request and token budgets (thread-safe)."""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int, window: float = 60.0):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.window = window
+        self._events: deque[tuple[float, int]] = deque()
+        self._tokens_in_window = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, tokens: int) -> None:
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                while self._events and self._events[0][0] <= now - self.window:
+                    _, old_tokens = self._events.popleft()
+                    self._tokens_in_window -= old_tokens
+
+                fits = (
+                    len(self._events) < self.requests_per_minute
+                    and self._tokens_in_window + tokens <= self.tokens_per_minute
+                )
+                # a single request bigger than the whole budget still goes out alone
+                if fits or not self._events:
+                    self._events.append((now, tokens))
+                    self._tokens_in_window += tokens
+                    return
+
+                wait_for = self._events[0][0] + self.window - now
+            time.sleep(max(wait_for, 0.01))
+
+
+class EmbeddingScheduler:
+    def __init__(
+        self,
+        embed_texts: Callable[[list[str]], list[list[float]]],
+        model: str = "text-embedding-3-small",
+        max_batch_tokens: int = 100_000,
+        max_batch_size: int = 100,
+        max_in_flight: int = 4,
+        requests_per_minute: int = 3000,
+        tokens_per_minute: int = 1_000_000,
+        max_retries: int = 5,
+        backoff_base: float = 1.0,
+        backoff_max: float = 60.0,
+        log=None,
+    ):
+        self.embed_texts = embed_texts
+        self.max_batch_tokens = max_batch_tokens
+        self.max_batch_size = max_batch_size
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.limiter = RateLimiter(requests_per_minute, tokens_per_minute)
+        self.log = log
+
+        try:
+            self.encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self.encoding = tiktoken.get_encoding("cl100k_base")
+
+    # ── Batching ────────────────────────────────────────────────────
+    def _prepare(self, item: EmbeddingItem, stats: SchedulerStats) -> EmbeddingItem:
+        tokens = self.encoding.encode(item.text)
+        if len(tokens) > MAX_INPUT_TOKENS:
+            tokens = tokens[:MAX_INPUT_TOKENS]
+            item.text = self.encoding.decode(tokens)
+            stats.truncated += 1
+        item.tokens = len(tokens)
+        return item
+
+    def make_batches(self, items, stats: SchedulerStats) -> list[list[EmbeddingItem]]:
+        """Pack items in order into batches bounded by token count and size."""
+        batches: list[list[EmbeddingItem]] = []
+        batch: list[EmbeddingItem] = []
+        batch_tokens = 0
+
+        for item in items:
+            item = self._prepare(item, stats)
+            if batch and (
+                batch_tokens + item.tokens > self.max_batch_tokens
+                or len(batch) >= self.max_batch_size
+            ):
+                batches.append(batch)
+                batch, batch_tokens = [], 0
+            batch.append(item)
+            batch_tokens += item.tokens
+
+        if batch:
+            batches.append(batch)
+        return batches
+
+    # ── Execution ───────────────────────────────────────────────────
+    def _embed_batch(self, batch: list[EmbeddingItem]) -> tuple[list[list[float]], int]:
+        """Embed one batch, retrying with jittered exponential backoff."""
+        texts = [item.text for item in batch]
+        tokens = sum(item.tokens for item in batch)
+        attempt = 0
+
+        while True:
+            self.limiter.acquire(tokens)
+            try:
+                vectors = self.embed_texts(texts)
+                if len(vectors) != len(texts):
+                    raise ValueError(f"expected {len(texts)} vectors, got {len(vectors)}")
+                return vectors, attempt
+            except Exception as e:
+                if attempt >= self.max_retries:
+                    raise EmbeddingBatchError(e, attempt) from e
+                delay = min(self.backoff_max, self.backoff_base * 2 ** attempt)
+                delay *= random.uniform(0.5, 1.0)
+                if self.log:
+                    self.log.warning(f"Embedding batch failed ({e}); retry {attempt + 1} in {delay:.1f}s")
+                time.sleep(delay)
+                attempt += 1
+
+    def run(
+        self,
+        items,
+        on_batch_done: Callable[[list[EmbeddingItem], list[list[float]]], None],
+    ) -> SchedulerStats:
+        """
+        Embed all items, keeping up to ``max_in_flight`` requests running.
+
+        ``on_batch_done`` is called on this thread for each finished batch. A
+        batch that still fails after all retries is counted in the stats and
+        the remaining batches carry on.
+        """
+        stats = SchedulerStats()
+        batches = deque(self.make_batches(items, stats))
+        total = len(batches)
+
+        if self.log:
+            self.log.info(f"Embedding in {total} batches, up to {self.max_in_flight} in flight")
+
+        with ThreadPoolExecutor(max_workers=self.max_in_flight) as pool:
+            running = {}
+
+            while batches or running:
+                while batches and len(running) < self.max_in_flight:
+                    batch = batches.popleft()
+                    running[pool.submit(self._embed_batch, batch)] = batch
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    batch = running.pop(future)
+                    try:
+                        vectors, retries = future.result()
+                    except Exception as e:
+                        # retries are counted whether or not the batch got through
+                        if isinstance(e, EmbeddingBatchError):
+                            stats.retries += e.retries
+                        stats.failed_batches += 1
+                        stats.failed_items += len(batch)
+                        stats.errors.append(str(e))
+                        if self.log:
+                            self.log.error(f"Embedding batch of {len(batch)} failed permanently: {e}")
+                        continue
+
+                    on_batch_done(batch, vectors)
+                    stats.batches += 1
+                    stats.retries += retries
+                    stats.embedded += len(batch)
+                    if self.log:
+                        self.log.info(f"Batch {stats.batches}/{total} complete. Total embedded: {stats.embedded}")
+
+        return stats
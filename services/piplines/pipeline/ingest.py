@@ -0,0 +1,173 @@
+"""
+Incremental readers for the scraped program-descriptions files.
+
+The scrape is either a single JSON array (``*.json``) or newline-delimited
+JSON (``*.ndjson`` / ``*.jsonl``). Both are read one record at a time so
+the pipeline never has to hold more than one raw record in memory.
+"""
+import hashlib
+import json
+import re
+from dataclasses import dataclass, replace
+from itertools import chain
+from pathlib import Path
+from typing import Iterator
+
+_NDJSON_SUFFIXES = {".ndjson", ".jsonl"}
+_READ_CHUNK_SIZE = 1 << 16
+_WHITESPACE = " \t\r\n"
+_SCALAR_END_RE = re.compile(r"[ \t\r\n,\]]")
+
+
+@dataclass(frozen=True)
+class RecordSource:
+    """
+    Lightweight handle to one or more raw data files, passed between assets
+    in streaming mode instead of the full list of records.
+    """
+    paths: tuple[str, ...]
+    records_count: int
+    sample_id: str | None = None
+    staged: bool = False
+    # incremental runs: restrict iteration to these record ids
+    only_ids: frozenset[str] | None = None
+
+    def as_staged(self) -> "RecordSource":
+        return replace(self, staged=True)
+
+    def iter_records(self) -> Iterator[dict]:
+        """Yield raw records, or staged records once staging has run."""
+        records = chain.from_iterable(iter_raw_records(p) for p in self.paths)
+        if self.only_ids is not None:
+            records = (r for r in records if r.get("id") in self.only_ids)
+        if self.staged:
+            return iter_staged_records(records)
+        return records
+
+
+# ── Raw readers ─────────────────────────────────────────────────────
+def iter_raw_records(path: str | Path) -> Iterator[dict]:
+    """Yield raw records from a JSON array or NDJSON file."""
+    path = Path(path)
+    if path.suffix.lower() in _NDJSON_SUFFIXES:
+        return _iter_ndjson(path)
+    return _iter_json_array(path)
+
+
+def _iter_ndjson(path: Path) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                yield json.loads(line)
+
+
+def _iter_json_array(path: Path) -> Iterator[dict]:
+    """
+    Decode the items of a top-level JSON array one at a time.
+
+    Reads the file in fixed-size chunks and uses ``raw_decode`` on the
+    buffer; when an item straddles a chunk boundary the next chunk is
+    appended and decoding is retried.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, encoding="utf-8") as f:
+        buf = ""
+        pos = 0
+        eof = False
+
+        def fill() -> bool:
+            nonlocal buf, pos, eof
+            chunk = f.read(_READ_CHUNK_SIZE)
+            if not chunk:
+                eof = True
+                return False
+            buf = buf[pos:] + chunk # drop already-decoded prefix
+            pos = 0
+            return True
+
+        # find the opening bracket
+        while True:
+            while pos < len(buf) and buf[pos] in _WHITESPACE:
+                pos += 1
+            if pos < len(buf):
+                break
+            if not fill():
+                return # empty file
+        if buf[pos] != "[":
+            raise ValueError(f"{path} is not a JSON array")
+        pos += 1
+
+        while True:
+            # skip separators between items
+            while pos < len(buf) and (buf[pos] in _WHITESPACE or buf[pos] == ","):
+                pos += 1
+            if pos >= len(buf):
+                if not fill():
+                    raise ValueError(f"{path}: unexpected end of JSON array")
+                continue
+            if buf[pos] == "]":
+                return
+
+            # a scalar (number, true, null...) has no closing character, so it
+            # is only complete once the delimiter after it has been read
+            if buf[pos] not in '{["' and not eof and not _SCALAR_END_RE.search(buf, pos):
+                fill()
+                continue
+
+            try:
+                item, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof or not fill():
+                    raise
+                continue
+
+            yield item
+            pos = end
+
+
+def scan_records(*paths: str | Path) -> RecordSource:
+    """Count records and capture the first id without keeping any of them."""
+    count = 0
+    sample_id = None
+    for record in chain.from_iterable(iter_raw_records(p) for p in paths):
+        if count == 0:
+            sample_id = record.get("id")
+        count += 1
+    return RecordSource(paths=tuple(str(p) for p in paths), records_count=count, sample_id=sample_id)
+
+
+# ── Fingerprints ────────────────────────────────────────────────────
+def record_fingerprint(record: dict) -> str:
+    """Stable content hash of a raw record (key order does not matter)."""
+    payload = json.dumps(record, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def filter_changed(staged_records, manifest: dict[str, str]) -> Iterator[dict]:
+    """Drop staged records whose fingerprint matches the manifest."""
+    for record in staged_records:
+        if manifest.get(record["program_id"]) != record["fingerprint"]:
+            yield record
+
+
+# ── Staging ─────────────────────────────────────────────────────────
+def stage_record(record: dict) -> dict:
+    """Clean the markdown of a single raw record."""
+    text = record.get("page_content", "")
+
+    # Remove excessive newlines
+    text = re.sub(r"\n+", "\n", text)
+
+    return {
+        "program_id": record.get("id"),
+        "source_url": record.get("metadata", {}).get("source"),
+        "clean_text": text.strip(),
+        "fingerprint": record_fingerprint(record),
+    }
+
+
+def iter_staged_records(records) -> Iterator[dict]:
+    for record in records:
+        yield stage_record(record)
@@ -0,0 +1,95 @@
+"""
+Performance metadata for asset materializations.
+
+``@instrumented`` goes between ``@asset`` and the compute function and adds
+wall time, CPU time, throughput, peak RSS and the number of SQL statements
+sent to Postgres to the materialization's metadata, so the asset UI can
+plot them run over run.
+"""
+import functools
+import resource
+import threading
+import time
+
+from dagster import AssetExecutionContext
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .ingest import RecordSource
+
+
+# ── DB round trips ──────────────────────────────────────────────────
+class _StatementCounter:
+    """Process-wide count of statements executed through any SQLAlchemy engine."""
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, conn, cursor, statement, parameters, context, executemany):
+        with self._lock:
+            self.value += 1
+
+
+# executemany batches count once; raw psycopg2 COPY in bulk_load isn't seen at all
+db_statements = _StatementCounter()
+event.listen(Engine, "before_cursor_execute", db_statements)
+
+
+# ── Helpers ─────────────────────────────────────────────────────────
+def _record_count(result) -> int | None:
+    """Number of records an asset produced, where its output says."""
+    if isinstance(result, (list, tuple)):
+        return len(result)
+    if isinstance(result, RecordSource):
+        return result.records_count if result.only_ids is None else len(result.only_ids)
+    if isinstance(result, dict):
+        return result.get("total_processed")
+    return None
+
+
+def _cpu_seconds() -> float:
+    # includes finished process-pool workers (parallel parsing)
+    children = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return time.process_time() + children.ru_utime + children.ru_stime
+
+
+def _peak_rss_mb() -> float:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # KiB on Linux
+
+
+# ── Decorator ───────────────────────────────────────────────────────
+def instrumented(fn):
+    """Wrap an asset compute function and attach its performance metadata."""
+
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        context = AssetExecutionContext.get()
+        statements_before = db_statements.value
+        cpu_before = _cpu_seconds()
+        start = time.perf_counter()
+
+        def metrics(result=None) -> dict:
+            wall = time.perf_counter() - start
+            values = {
+                "wall_time_s": round(wall, 3),
+                "cpu_time_s": round(_cpu_seconds() - cpu_before, 3),
+                # peak of the step process; with the in-process executor it only ever grows
+                "peak_rss_mb": round(_peak_rss_mb(), 1),
+                "db_round_trips": db_statements.value - statements_before,
+            }
+            records = _record_count(result)
+            if records is not None and wall > 0:
+                values["records_per_sec"] = round(records / wall, 1)
+            return values
+
+        try:
+            result = fn(*args, **kwargs)
+        except Exception:
+            context.log.info(f"Failed after {metrics()}")
+            raise
+
+        context.add_output_metadata(metrics(result))
+        return result
+
+    return wrapper
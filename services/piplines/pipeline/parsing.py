@@ -0,0 +1,308 @@
+"""
+Record-level parsing of staged program descriptions.
+
+Kept free of database and Dagster imports so it can be shipped to
+process-pool workers without re-running the asset module's setup.
+"""
+import os
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from .parsing_helpers import (
+    DISCIPLINE_INDEX,
+    SCHOOL_INDEX,
+    _clean_discipline_name,
+    _extract_stream,
+    _is_metadata_line,
+    _next_nonempty,
+    _take_until_metadata,
+    normalize_header_line,
+    split_discipline_and_site,
+    tokenize_header,
+)
+
+
+def _find_header_index(lines: list[str]) -> int | None:
+    """Index of the line that starts with "#" and does not start with "##"."""
+    return next(
+        (
+            i
+            for i, line in enumerate(lines)
+            if line.lstrip().startswith("#") and not line.lstrip().startswith("##")
+        ),
+        None
+    )
+
+
+def record_school(record: dict) -> str | None:
+    """
+    English school name of a staged record, read from its header only.
+    Matches the ``school_name`` that ``parse_record`` would produce.
+    """
+    lines = [ln.strip() for ln in record["clean_text"].split("\n") if ln.strip()]
+    header_index = _find_header_index(lines)
+    if header_index is None:
+        return None
+
+    parts = tokenize_header(lines[header_index].lstrip("# ").rstrip("-"))
+    if len(parts) < 2:
+        return None
+
+    school_name = parts[0].strip()
+    return SCHOOL_INDEX.get(school_name) or school_name
+
+
+def parse_record(
+    record: dict,
+    skipped_headers: list[str],
+    stats: Counter | None = None,
+) -> dict | None:
+    """
+    Parse a single staged record; returns None (and notes why) if skipped.
+    French-name lookups are tallied in ``stats`` (e.g. "discipline_miss").
+    """
+    # keep original lines for description joining
+    raw_lines = record["clean_text"].split("\n")
+
+    # cleaned lines for header detection
+    lines = [ln.strip() for ln in raw_lines if ln.strip()]
+
+    # Find the header line
+    header_index = _find_header_index(lines)
+
+    if header_index is None:
+        skipped_headers.append("NO HEADER")
+        return None
+
+    header_line = lines[header_index].lstrip("# ").strip() 
+
+    # Handle header continuation: if header ends with "-", next line is site 
+    # This handles cases like:
+    # # School - Discipline -
+    # St. John's
+    site_continuation = None
+    if header_line.endswith("-"):
+        j = _next_nonempty(lines, header_index + 1) # next non empty line after header index
+        if j is not None:
+            next_line = lines[j].strip()
+            # Only accept if it's NOT another header and NOT metadata
+            if not next_line.startswith("#") and not _is_metadata_line(next_line):
+                site_continuation = next_line
+                # Remove the trailing "-" from header_line
+                header_line = header_line.rstrip("-").strip()
+
+    # Normalize dash spacing and extra spaces, then split into parts by " - "
+    header_line = normalize_header_line(header_line)
+    parts = tokenize_header(header_line)
+    if len(parts) < 2: #bad header line
+        skipped_headers.append(header_line)
+        return None
+
+    # school is the first part in header like "McGill University - Medicine - Montreal"
+    school_name = parts[0].strip()
+    school_en = SCHOOL_INDEX.get(school_name)
+    if stats is not None:
+        stats["school_exact" if school_en else "school_miss"] += 1
+    school_name = school_en or school_name
+
+    # discipline and site are the remaining parts in header like "Medicine - Montreal"
+    # use known disciplines to identify where discipline ends and site begins (a bit hardcoded)
+    remainder = parts[1:]
+    if not remainder:
+        skipped_headers.append(header_line)
+        return None
+    
+    discipline_name, site_str = split_discipline_and_site(remainder)
+    
+    # If we found a site continuation (header ended with "-"), append it to site
+    if site_continuation:
+        if site_str:
+            site_str = f"{site_str} {site_continuation}".strip()
+        else:
+            site_str = site_continuation
+    
+    site_parts = [site_str] if site_str else []
+    
+    if not discipline_name:
+        skipped_headers.append(header_line)
+        return None
+
+    # Clean discipline name (fallback for edge cases - split_discipline_and_site should handle most)
+    discipline_name = _clean_discipline_name(discipline_name)
+
+    # take site parts until metadata line (no "Residency Match" hardcode)
+    site_parts = _take_until_metadata(site_parts)
+    program_site = " - ".join(site_parts).strip() if site_parts else ""
+
+    # special case for Family Medicine integrated variants
+    first_lower = discipline_name.lower()
+    if first_lower.startswith("family medicine") or first_lower.startswith("médecine familiale"):
+        discipline_base = "Family Medicine"
+        allowed_integrated = {
+            "integrated clinician scholar",
+            "integrated emergency medicine",
+        }
+        #if program site contains an allowed integrated variant, add it to the discipline name
+        if program_site and program_site.strip().lower() in allowed_integrated:
+            discipline_name = f"{discipline_base} {program_site.strip()}"
+            program_site = "" #make program site empty for now, we will add it back later
+        else:
+            discipline_name = discipline_base
+
+    # French to English discipline mapping
+    # Try full match first
+    discipline_en = DISCIPLINE_INDEX.get(discipline_name)
+    if discipline_en:
+        if stats is not None:
+            stats["discipline_exact"] += 1
+        discipline_name = discipline_en
+    # if no match, try matching parts (for multi-part French disciplines)
+    # for example "Oto-rhino-laryngologie et chirurgie cervico-faciale" -> "Oto-rhino-laryngologie and cervico-facial surgery"
+    else:  # No translation happened
+        # Split by " - " to check individual parts
+        parts = discipline_name.split(" - ")
+        translated_parts = []
+        changed = False
+        
+        for part in parts:
+            # exact match, then partial matches (for cases like "Oto-rhino-laryngologie et chirurgie cervico")
+            translated_part = DISCIPLINE_INDEX.translate(part, stats, kind="discipline")
+            
+            if translated_part is not None: #if the part was translated, add it to the translated parts
+                changed = True
+            
+            translated_parts.append(translated_part or part)
+        
+        # If any part was translated, reconstruct
+        if changed:
+            discipline_name = " - ".join(translated_parts)
+        
+        # Clean up any city names or location suffixes that might have been included in French discipline names
+        # (e.g., "Oto-rhino-laryngologie et chirurgie cervico- faciale - Sherbrooke faciale")
+        # structural approach: if a part appears after what looks like a complete discipline,
+        # and it's short/capitalized, it's likely a city suffix that got included
+        final_parts = discipline_name.split(" - ") #split discipline name into parts by " - " like "Oto-rhino-laryngologie and cervico-facial surgery" -> ["Oto-rhino-laryngologie", "and", "cervico-facial", "surgery"]
+        cleaned_parts = []
+        
+        # Work through parts, keeping discipline parts and removing city-like suffixes
+        for i, part in enumerate(final_parts):
+            # Skip very short parts that appear at the end (likely city suffixes)
+            # This handles cases like "faciale", "cervico" that are anatomical terms
+            # but also cases where city names got included
+            words = part.split()
+            
+            # If it's a very short part (1 word, <= 8 chars) at the end, might be a suffix (like "faciale", "cervico")
+            # But only if we already have substantial discipline content (more than 15 chars)
+            if i == len(final_parts) - 1 and len(words) == 1 and len(part) <= 8:
+                # Check if previous parts already form a substantial discipline name
+                prev_text = " - ".join(final_parts[:i])
+                if len(prev_text) > 15:  
+                    continue
+            
+            cleaned_parts.append(part)
+        
+        if len(cleaned_parts) < len(final_parts): #if we removed some parts, join the remaining parts back together
+            discipline_name = " - ".join(cleaned_parts).strip()
+
+    # program stream id
+    raw_id = record["program_id"]
+    id_parts = raw_id.split("|") 
+    if len(id_parts) != 2:
+        raise ValueError(f"Invalid program_id format: {raw_id}")
+    match_cycle = id_parts[0].strip()
+    program_stream_id = id_parts[1].strip() #program stream id is the second part of the program_id after "|"
+
+    # program stream is the stream of the program (IMG / CMG etc)
+    program_stream = _extract_stream(lines, header_index, stats)
+
+    # program description
+    description_start = next(
+        (i for i, ln in enumerate(raw_lines) if ln.strip().startswith("##")),
+        None
+    )
+    program_description = (
+        "\n".join(raw_lines[description_start:]).strip()
+        if description_start is not None
+        else record["clean_text"].strip()
+    )
+
+    program_name = f"{school_name}/{discipline_name}/{program_site or ''}".rstrip("/")
+
+    return {
+        "match_cycle": match_cycle,
+        "program_stream_id": program_stream_id,
+        "school_name": school_name,
+        "discipline_name": discipline_name,
+        "program_site": program_site,
+        "program_stream": program_stream,
+        "program_name": program_name,
+        "program_description": program_description,
+        "source_url": record["source_url"],
+        # carried through so the loader can update the fingerprint manifest
+        "record_id": raw_id,
+        "fingerprint": record.get("fingerprint"),
+    }
+
+
+def iter_parsed_records(records, skipped_headers: list[str], stats: Counter | None = None):
+    """Lazily parse staged records, collecting skipped headers as it goes."""
+    for record in records:
+        parsed = parse_record(record, skipped_headers, stats)
+        if parsed is not None:
+            yield parsed
+
+
+# ── Parallel parsing ────────────────────────────────────────────────
+def _chunked(records, chunk_size: int):
+    it = iter(records)
+    while chunk := list(islice(it, chunk_size)):
+        yield chunk
+
+
+def _parse_chunk(records: list[dict]) -> tuple[list[dict], list[str], Counter]:
+    """Worker entry point: parse one shard and return its skipped headers and stats too."""
+    skipped_headers: list[str] = []
+    stats: Counter = Counter()
+    parsed = list(iter_parsed_records(records, skipped_headers, stats))
+    return parsed, skipped_headers, stats
+
+
+def parse_records_parallel(
+    records,
+    skipped_headers: list[str],
+    stats: Counter | None = None,
+    max_workers: int | None = None,
+    chunk_size: int = 100,
+) -> list[dict]:
+    """
+    Parse records on a process pool.
+
+    Records are sharded into chunks of ``chunk_size`` and results are merged
+    in submission order, so the output (and the skipped-header list) matches
+    the sequential parser exactly. At most two chunks per worker are in
+    flight at a time so a streamed input is never fully materialized.
+    """
+    parsed: list[dict] = []
+    max_workers = max_workers or os.cpu_count() or 1
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        window = 2 * max_workers
+        pending = deque()
+
+        def drain_one():
+            chunk_parsed, chunk_skipped, chunk_stats = pending.popleft().result()
+            parsed.extend(chunk_parsed)
+            skipped_headers.extend(chunk_skipped)
+            if stats is not None:
+                stats.update(chunk_stats)
+
+        for chunk in _chunked(records, chunk_size):
+            pending.append(pool.submit(_parse_chunk, chunk))
+            if len(pending) >= window:
+                drain_one()
+
+        while pending:
+            drain_one()
+
+    return parsed
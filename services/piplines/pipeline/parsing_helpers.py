@@ -3,6 +3,8 @@ Helper functions for parsing program records from scraped data.
 """
 import re
 import unicodedata
+from bisect import bisect_left
+from collections import Counter
 
 from .normalization import (
     DISCIPLINE_FR_TO_EN,
@@ -17,25 +19,115 @@ def normalize_text(text: str) -> str:
     return unicodedata.normalize("NFKC", text).strip()
 
 
+def fold_text(text: str) -> str:
+    """
+    Lookup key for translation dicts: NFKC, case-folded, accents removed,
+    typographic apostrophes straightened and whitespace collapsed.
+    "Université d’Ottawa" and "universite d'ottawa" fold to the same key.
+    """
+    text = normalize_text(text).casefold().replace("’", "'")
+    text = "".join(
+        ch for ch in unicodedata.normalize("NFKD", text) if not unicodedata.combining(ch)
+    )
+    return " ".join(text.split())
+
+
+# ── Translation Index ───────────────────────────────────────────────
+class TranslationIndex:
+    """
+    French -> English lookup built once from a normalization dict.
+
+    Keys are folded with ``fold_text`` so case, accent and apostrophe
+    variants all hit the same entry. ``prefix_lookup`` replaces the linear
+    "starts-with" scan over the dict: when several entries match, the one
+    listed first in the source dict wins, as before.
+    """
+
+    def __init__(self, mapping: dict[str, str], head_len: int = 20):
+        self._head_len = head_len
+        self._exact: dict[str, tuple[int, str]] = {}
+        for rank, (fr_name, en_name) in enumerate(mapping.items()):
+            self._exact.setdefault(fold_text(fr_name), (rank, en_name))
+
+        self._sorted_keys = sorted(self._exact)
+        # keys of at least head_len chars match a text sharing their head;
+        # shorter keys match any text they are a prefix of
+        self._heads: dict[str, tuple[int, str]] = {}
+        self._short: dict[str, tuple[int, str]] = {}
+        for key, entry in self._exact.items():
+            if len(key) >= head_len:
+                bucket, bucket_key = self._heads, key[:head_len]
+            else:
+                bucket, bucket_key = self._short, key
+            if bucket_key not in bucket or entry < bucket[bucket_key]:
+                bucket[bucket_key] = entry
+
+    def get(self, text: str) -> str | None:
+        """Exact (folded) match."""
+        entry = self._exact.get(fold_text(text))
+        return entry[1] if entry else None
+
+    def prefix_lookup(self, text: str) -> str | None:
+        """
+        Entry whose key starts with ``text``, or whose first ``head_len``
+        characters start ``text`` (e.g. a truncated or suffixed French name).
+        """
+        query = fold_text(text)
+        candidates = []
+
+        # keys starting with the query are contiguous in sorted order
+        i = bisect_left(self._sorted_keys, query)
+        while i < len(self._sorted_keys) and self._sorted_keys[i].startswith(query):
+            candidates.append(self._exact[self._sorted_keys[i]])
+            i += 1
+
+        if len(query) >= self._head_len and query[: self._head_len] in self._heads:
+            candidates.append(self._heads[query[: self._head_len]])
+        for n in range(1, min(len(query), self._head_len - 1) + 1):
+            if query[:n] in self._short:
+                candidates.append(self._short[query[:n]])
+
+        return min(candidates)[1] if candidates else None
+
+    def translate(self, text: str, stats: Counter | None = None, kind: str = "") -> str | None:
+        """Exact match, falling back to ``prefix_lookup``; counts hits and misses."""
+        result = self.get(text)
+        outcome = "exact"
+        if result is None:
+            result = self.prefix_lookup(text)
+            outcome = "prefix" if result is not None else "miss"
+        if stats is not None:
+            stats[f"{kind}_{outcome}"] += 1
+        return result
+
+
+DISCIPLINE_INDEX = TranslationIndex(DISCIPLINE_FR_TO_EN)
+SCHOOL_INDEX = TranslationIndex(SCHOOL_FR_TO_EN)
+STREAM_INDEX = TranslationIndex(STREAM_FR_TO_EN)
+
+
 # ── Constants ──────────────────────────────────────────────────────
 _YEAR_START_RE = re.compile(r"^\s*\d{4}\b")
 
+# One pass over the lowercased line instead of a chain of substring checks:
+# anchored prefixes (year, stream codes) or keywords anywhere in the line.
+_METADATA_RE = re.compile(
+    r"^(?:# 202|202|cmg|img|ros)"  # year line / stream codes
+    r"|residency|match|iteration"
+    r"|premier tour"  # French: "first iteration"
+    r"|jumelage"  # French: "match"
+)
+
+# En/em dashes are treated as plain hyphens in headers
+_DASH_TRANSLATION = str.maketrans({"–": "-", "—": "-"})
+_SPACED_DASH_RE = re.compile(r"\s+-\s+")
+_MULTI_SPACE_RE = re.compile(r"\s+")
+
 
 # ── Metadata Detection ──────────────────────────────────────────────
 def _is_metadata_line(s: str) -> bool:
     """Check if a line is a metadata line (year, match, iteration, stream info)."""
-    t = s.strip().lower()
-    return (
-        t.startswith("# 202") or t.startswith("202")  # year line
-        or "residency" in t
-        or "match" in t
-        or "iteration" in t
-        or "premier tour" in t  # French: "first iteration"
-        or "jumelage" in t  # French: "match"
-        or t.startswith("cmg")
-        or t.startswith("img")
-        or t.startswith("ros")
-    )
+    return _METADATA_RE.search(s.strip().lower()) is not None
 
 
 def _next_nonempty(lines: list[str], start: int) -> int | None:
@@ -74,6 +166,52 @@ def _take_until_metadata(parts: list[str]) -> list[str]:
     return out
 
 
+# ── Header Tokenizing ───────────────────────────────────────────────
+class _PrefixTrie:
+    """Character trie answering "longest known word that prefixes this text"."""
+
+    _END = ""  # never a real character, marks the end of a word
+
+    def __init__(self, words):
+        self._root: dict = {}
+        for word in words:
+            node = self._root
+            for ch in word:
+                node = node.setdefault(ch, {})
+            node[self._END] = word
+
+    def longest_prefix(self, text: str) -> str | None:
+        node = self._root
+        best = None
+        for ch in text:
+            node = node.get(ch)
+            if node is None:
+                break
+            best = node.get(self._END, best)
+        return best
+
+
+# built once at import; lookups are O(len(header)) however many disciplines
+_DISCIPLINE_TRIE = _PrefixTrie(KNOWN_DISCIPLINES)
+
+
+def normalize_header_line(header_line: str) -> str:
+    """Normalize dash variants and spacing in a header line."""
+    header_line = header_line.translate(_DASH_TRANSLATION)
+    header_line = _SPACED_DASH_RE.sub(" - ", header_line)
+    return _MULTI_SPACE_RE.sub(" ", header_line).strip()
+
+
+def tokenize_header(header_line: str) -> list[str]:
+    """
+    Split a header line like "School - Discipline - Site" into its parts.
+
+    The line is normalized first, so "School — Discipline – Site" gives the
+    same parts. Empty parts are dropped.
+    """
+    return [p.strip() for p in normalize_header_line(header_line).split(" - ") if p.strip()]
+
+
 # ── Discipline and Site Parsing ──────────────────────────────────────
 def split_discipline_and_site(parts: list[str]) -> tuple[str, str | None]:
     """
@@ -105,11 +243,8 @@ def split_discipline_and_site(parts: list[str]) -> tuple[str, str | None]:
 
     remainder = " - ".join(parts)
 
-    best_match = None
-    for disc in KNOWN_DISCIPLINES:
-        if remainder.startswith(disc): # if remainder starts with a known discipline, it is the discipline
-            if best_match is None or len(disc) > len(best_match):
-                best_match = disc
+    # longest known discipline the remainder starts with
+    best_match = _DISCIPLINE_TRIE.longest_prefix(remainder)
 
     if best_match: # if we found a best match, the site is the remainder minus the best match
         site = remainder[len(best_match) :].strip(" -")
@@ -148,7 +283,7 @@ def _clean_discipline_name(discipline_name: str) -> str:
 
 
 # ── Stream Extraction ────────────────────────────────────────────────
-def _extract_stream(lines: list[str], header_index: int) -> str:
+def _extract_stream(lines: list[str], header_index: int, stats: Counter | None = None) -> str:
     """
     Extract stream from the line immediately after the metadata line.
     Metadata line pattern: "#  2025 R-1 Main Residency Match - first iteration"
@@ -171,11 +306,10 @@ def _extract_stream(lines: list[str], header_index: int) -> str:
                 if next_line.startswith("#"):
                     break
 
-                stream_norm = normalize_text(next_line.lower())
-
-                if stream_norm in STREAM_FR_TO_EN:
-                    return STREAM_FR_TO_EN[stream_norm]
+                stream_en = STREAM_INDEX.get(next_line)
+                if stats is not None:
+                    stats["stream_exact" if stream_en else "stream_miss"] += 1
 
-                return next_line
+                return stream_en or next_line
     
     return "Unknown"
\ No newline at end of file
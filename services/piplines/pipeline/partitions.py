@@ -0,0 +1,99 @@
+"""
+Partitioning of the program assets by match cycle and school.
+
+Both dimensions are dynamic: the match cycle is the prefix of a raw record
+id ("1503|27447" -> "1503") and the school is the English school name from
+the record header. New keys are registered as records are staged, so a new
+cycle or school shows up as new partitions without a code change.
+
+In Postgres, ``program`` and ``programchangelog`` are LIST-partitioned by
+match cycle as well; ``ensure_cycle_partitions`` creates the per-cycle
+tables before a cycle's first load.
+"""
+import re
+
+from dagster import DynamicPartitionsDefinition, MultiPartitionKey, MultiPartitionsDefinition
+from sqlalchemy import text
+
+from .parsing import record_school
+
+MATCH_CYCLE = "match_cycle"
+SCHOOL = "school"
+
+# tables declared with postgresql_partition_by="LIST (match_cycle)"
+CYCLE_PARTITIONED_TABLES = ("program", "programchangelog")
+_CYCLE_RE = re.compile(r"^\w+$")
+
+match_cycle_partitions = DynamicPartitionsDefinition(name=MATCH_CYCLE)
+school_partitions = DynamicPartitionsDefinition(name=SCHOOL)
+
+program_partitions = MultiPartitionsDefinition({
+    MATCH_CYCLE: match_cycle_partitions,
+    SCHOOL: school_partitions,
+})
+
+
+def match_cycle_of(record_id: str) -> str:
+    return record_id.split("|", 1)[0].strip()
+
+
+def partitions_of(staged_records, unplaced: list[dict] | None = None) -> set[tuple[str, str]]:
+    """
+    (match cycle, school) of every staged record whose school can be read;
+    the others are appended to ``unplaced``.
+    """
+    keys = set()
+    for record in staged_records:
+        school = record_school(record)
+        if school:
+            keys.add((match_cycle_of(record["program_id"]), school))
+        elif unplaced is not None:
+            unplaced.append(record)
+    return keys
+
+
+def register_partitions(instance, cycles, schools) -> dict[str, list[str]]:
+    """Add the keys the instance doesn't know yet; returns what was added."""
+    added = {}
+    for name, keys in ((MATCH_CYCLE, cycles), (SCHOOL, schools)):
+        new_keys = sorted(set(keys) - set(instance.get_dynamic_partitions(name)))
+        if new_keys:
+            instance.add_dynamic_partitions(name, new_keys)
+        added[name] = new_keys
+    return added
+
+
+def partition_of(context) -> tuple[str, str]:
+    """(match_cycle, school) of the partition being materialized."""
+    key: MultiPartitionKey = context.partition_key
+    dims = key.keys_by_dimension
+    return dims[MATCH_CYCLE], dims[SCHOOL]
+
+
+# ── Postgres partitions ─────────────────────────────────────────────
+def ensure_cycle_partitions(engine, cycles) -> list[str]:
+    """
+    Create the ``<table>_<cycle>`` partitions that don't exist yet; returns
+    the ones created. Runs in its own short transaction (the DDL locks the
+    parent table) under an advisory lock so parallel loads don't race.
+    """
+    created = []
+    cycles = sorted(set(cycles))
+    for cycle in cycles:
+        if not _CYCLE_RE.match(cycle):
+            raise ValueError(f"Invalid match cycle: {cycle!r}")
+
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(hashtext('cycle_partitions'))"))
+        for cycle in cycles:
+            for table in CYCLE_PARTITIONED_TABLES:
+                partition = f"{table}_{cycle}"
+                exists = conn.execute(text("SELECT to_regclass(:name)"), {"name": partition}).scalar()
+                if exists:
+                    continue
+                conn.execute(text(
+                    f'CREATE TABLE "{partition}" PARTITION OF "{table}" '
+                    f"FOR VALUES IN ('{cycle}')"
+                ))
+                created.append(partition)
+    return created
@@ -0,0 +1,67 @@
+"""
+Database resource shared by the pipeline assets, checks and sensors.
+
+Nothing here touches the network at import time: the engine (and its
+connection pool) is created on first use, and the schema bootstrap runs
+once per process right after that.
+"""
+import threading
+
+from dagster import ConfigurableResource
+from pydantic import PrivateAttr
+from sqlalchemy import text
+from sqlalchemy.engine import Engine
+from sqlmodel import Session, SQLModel, create_engine
+
+from services.api.app import models  # noqa: F401  (registers the tables on SQLModel.metadata)
+from services.api.app.analytics_views import create_analytics_views
+
+# arbitrary app-wide key so concurrent runs don't race on CREATE EXTENSION / CREATE TABLE
+_BOOTSTRAP_LOCK_KEY = 0x43614D53
+
+
+class PostgresResource(ConfigurableResource):
+    """Owns the SQLAlchemy engine; connects and bootstraps the schema lazily."""
+
+    database_url: str
+    echo: bool = False
+    pool_size: int = 5
+    max_overflow: int = 10
+    # CREATE EXTENSION vector + create_all on first use
+    bootstrap_schema: bool = True
+
+    _engine: Engine | None = PrivateAttr(default=None)
+    _lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    def get_engine(self) -> Engine:
+        if self._engine is None:
+            with self._lock:
+                if self._engine is None:
+                    engine = create_engine(
+                        self.database_url,
+                        echo=self.echo,
+                        pool_size=self.pool_size,
+                        max_overflow=self.max_overflow,
+                        pool_pre_ping=True,
+                    )
+                    if self.bootstrap_schema:
+                        _bootstrap(engine)
+                    self._engine = engine
+        return self._engine
+
+    def session(self) -> Session:
+        return Session(self.get_engine())
+
+    def teardown_after_execution(self, context) -> None:
+        if self._engine is not None:
+            self._engine.dispose()
+            self._engine = None
+
+
+def _bootstrap(engine: Engine) -> None:
+    with engine.begin() as conn:
+        conn.execute(text("SELECT pg_advisory_xact_lock(:key)"), {"key": _BOOTSTRAP_LOCK_KEY})
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        SQLModel.metadata.create_all(conn)
+        create_analytics_views(conn)
@@ -0,0 +1,332 @@
+"""
+Sensor that keeps the database in step with the scrape files in ``data/``.
+
+Files are tracked in the sensor cursor by content hash (re-hashed only when
+their size or mtime moves), so touched-but-identical files never start a
+run. A change is handled in three steps:
+
+1. once no data file has been written for ``SETTLE_SECONDS`` (so a burst of
+   drops becomes one batch), a single ingest run stages all changed files
+   and lists the affected (match cycle, school) partitions in the staging
+   materialization's ``partitions`` metadata;
+2. when that run succeeds, one run per affected partition parses, loads and
+   embeds the changed records; partition runs that fail are requested again,
+   up to ``PARTITION_ATTEMPTS`` times in all;
+3. once every partition run has finished, one run brings the unpartitioned
+   assets built from the program table (facts, chunks, clusters, analytics
+   views) up to date.
+
+A file's hash is only committed to the cursor once its whole batch loaded.
+If ingest or a partition fails for good, the files are picked up again
+after ``RETRY_AFTER_SECONDS``; records that did load are fingerprinted by
+then, so only the failed partitions' records are staged again.
+"""
+import hashlib
+import json
+import time
+from pathlib import Path
+
+from dagster import (
+    DagsterEventType,
+    DagsterRunStatus,
+    MultiPartitionKey,
+    RunRequest,
+    RunsFilter,
+    SensorEvaluationContext,
+    SensorResult,
+    SkipReason,
+    sensor,
+)
+
+from .assets import (
+    DATA_DIR,
+    chunk_programs,
+    cluster_program_descriptions,
+    embed_program_chunks,
+    embed_programs,
+    extract_program_facts,
+    load_programs_to_db,
+    parse_program_records,
+    raw_program_descriptions,
+    refresh_analytics_views,
+    staging_program_descriptions,
+)
+from .partitions import MATCH_CYCLE, SCHOOL
+
+DATA_SUFFIXES = {".json", ".ndjson", ".jsonl"}
+# quiet period after the last file write before a batch is started
+SETTLE_SECONDS = 120
+# runs per partition and batch, the first one included
+PARTITION_ATTEMPTS = 3
+# wait before re-ingesting the files of a batch that failed
+RETRY_AFTER_SECONDS = 15 * 60
+_HASH_CHUNK_SIZE = 1 << 20
+
+# unpartitioned assets that read every cycle's programs: run once per batch,
+# after all of its partition runs, instead of once (and concurrently) per partition
+POST_LOAD_ASSETS = [
+    extract_program_facts,
+    chunk_programs,
+    embed_program_chunks,
+    cluster_program_descriptions,
+    refresh_analytics_views,
+]
+# tags grouping the partition runs of one batch and naming their partition
+_BATCH_TAG = "carms/batch"
+_PARTITION_TAG = "carms/partition"
+
+_ACTIVE_RUN_STATUSES = [
+    DagsterRunStatus.QUEUED,
+    DagsterRunStatus.NOT_STARTED,
+    DagsterRunStatus.STARTING,
+    DagsterRunStatus.STARTED,
+]
+
+
+# ── File tracking ───────────────────────────────────────────────────
+def _file_sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(_HASH_CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _scan_data_dir(data_dir: Path, known: dict[str, dict]) -> dict[str, dict]:
+    """Stat every data file; only files whose size or mtime moved are re-hashed."""
+    files = {}
+    if not data_dir.is_dir():
+        return files
+
+    for path in sorted(data_dir.iterdir()):
+        if not path.is_file() or path.suffix.lower() not in DATA_SUFFIXES:
+            continue
+        stat = path.stat()
+        entry = {"size": stat.st_size, "mtime": stat.st_mtime}
+        prev = known.get(path.name)
+        if prev and prev["size"] == entry["size"] and prev["mtime"] == entry["mtime"]:
+            entry["sha256"] = prev["sha256"]
+        else:
+            entry["sha256"] = _file_sha256(path)
+        files[path.name] = entry
+    return files
+
+
+def _staged_partitions(instance, run_id: str) -> list[tuple[str, str]]:
+    """The (match cycle, school) pairs the ingest run's staging step listed."""
+    for entry in instance.all_logs(run_id, of_type=DagsterEventType.ASSET_MATERIALIZATION):
+        materialization = entry.asset_materialization
+        if materialization and materialization.asset_key == staging_program_descriptions.key:
+            partitions = materialization.metadata.get("partitions")
+            return [tuple(key) for key in partitions.value] if partitions else []
+    return []
+
+
+# ── Sensor ──────────────────────────────────────────────────────────
+def _partition_run(run_key: str, cycle: str, school: str, attempt: int) -> RunRequest:
+    return RunRequest(
+        run_key=f"{run_key}:{cycle}:{school}" + (f":{attempt}" if attempt > 1 else ""),
+        partition_key=MultiPartitionKey({MATCH_CYCLE: cycle, SCHOOL: school}),
+        asset_selection=[
+            parse_program_records.key,
+            load_programs_to_db.key,
+            embed_programs.key,
+        ],
+        tags={_BATCH_TAG: run_key, _PARTITION_TAG: f"{cycle}|{school}"},
+    )
+
+
+def _finish_batch(state: dict, files: dict[str, dict], succeeded: bool) -> None:
+    """Commit the batch's file hashes, or leave them out and back off."""
+    if succeeded:
+        state["files"].update(files)
+    else:
+        state["retry_after"] = time.time() + RETRY_AFTER_SECONDS
+
+
+def _launch_partitions(context: SensorEvaluationContext, state: dict) -> SensorResult:
+    """Second step: fan out to the affected partitions once ingest succeeded."""
+    pending = state["pending"]
+    runs = context.instance.get_runs(
+        filters=RunsFilter(tags={"dagster/run_key": pending["run_key"]}),
+        limit=1,
+    )
+
+    if not runs or runs[0].status in _ACTIVE_RUN_STATUSES:
+        return SensorResult(
+            skip_reason=SkipReason(f"Waiting for ingest run {pending['run_key']}"),
+            cursor=json.dumps(state),
+        )
+
+    run = runs[0]
+    state["pending"] = None
+
+    if run.status != DagsterRunStatus.SUCCESS:
+        _finish_batch(state, pending["files"], succeeded=False)
+        return SensorResult(
+            skip_reason=SkipReason(f"Ingest run {run.run_id} did not succeed; will retry"),
+            cursor=json.dumps(state),
+        )
+
+    partitions = _staged_partitions(context.instance, run.run_id)
+    if not partitions:
+        _finish_batch(state, pending["files"], succeeded=True)
+        return SensorResult(
+            skip_reason=SkipReason(f"{sorted(pending['files'])} contain no new or changed records"),
+            cursor=json.dumps(state),
+        )
+
+    run_requests = [_partition_run(pending["run_key"], cycle, school, 1) for cycle, school in partitions]
+    state["loading"] = {
+        "run_key": pending["run_key"],
+        "files": pending["files"],
+        "runs": len(run_requests),
+        "attempt": 1,
+    }
+    context.log.info(f"Requesting {len(run_requests)} partition runs for {sorted(pending['files'])}")
+    return SensorResult(run_requests=run_requests, cursor=json.dumps(state))
+
+
+def _launch_post_load(context: SensorEvaluationContext, state: dict) -> SensorResult:
+    """
+    Third step: once the partition runs are done, request the failed ones
+    again or, when none is left to retry, refresh the unpartitioned assets.
+    """
+    loading = state["loading"]
+    runs = context.instance.get_runs(filters=RunsFilter(tags={_BATCH_TAG: loading["run_key"]}))
+
+    if len(runs) < loading["runs"] or any(run.status in _ACTIVE_RUN_STATUSES for run in runs):
+        return SensorResult(
+            skip_reason=SkipReason(f"Waiting for the partition runs of {loading['run_key']}"),
+            cursor=json.dumps(state),
+        )
+
+    # newest first, so the first run seen per partition is its latest attempt
+    latest = {}
+    for run in runs:
+        latest.setdefault(run.tags[_PARTITION_TAG], run.status)
+    failed = sorted(key for key, status in latest.items() if status != DagsterRunStatus.SUCCESS)
+
+    if failed and loading["attempt"] < PARTITION_ATTEMPTS:
+        loading["attempt"] += 1
+        loading["runs"] += len(failed)
+        context.log.warning(f"Retrying {len(failed)} failed partitions (attempt {loading['attempt']}): {failed}")
+        return SensorResult(
+            run_requests=[
+                _partition_run(loading["run_key"], *key.split("|", 1), loading["attempt"])
+                for key in failed
+            ],
+            cursor=json.dumps(state),
+        )
+
+    state["loading"] = None
+    _finish_batch(state, loading["files"], succeeded=not failed)
+    if failed:
+        context.log.error(
+            f"Partitions {failed} of {loading['run_key']} failed {PARTITION_ATTEMPTS} times; "
+            f"their files are retried in {RETRY_AFTER_SECONDS}s"
+        )
+    if len(failed) == len(latest):
+        return SensorResult(
+            skip_reason=SkipReason(f"No partition run of {loading['run_key']} succeeded"),
+            cursor=json.dumps(state),
+        )
+
+    return SensorResult(
+        run_requests=[
+            RunRequest(
+                run_key=f"{loading['run_key']}:post-load",
+                asset_selection=[asset.key for asset in POST_LOAD_ASSETS],
+            )
+        ],
+        cursor=json.dumps(state),
+    )
+
+
+@sensor(
+    target=[
+        raw_program_descriptions,
+        staging_program_descriptions,
+        parse_program_records,
+        load_programs_to_db,
+        embed_programs,
+        *POST_LOAD_ASSETS,
+    ],
+    minimum_interval_seconds=30,
+)
+def raw_data_sensor(context: SensorEvaluationContext):
+    """Start incremental runs for the partitions touched by changed scrape files."""
+
+    state = json.loads(context.cursor) if context.cursor else {"files": {}, "pending": None, "loading": None}
+
+    if state["pending"]:
+        return _launch_partitions(context, state)
+    if state.get("loading"):
+        return _launch_post_load(context, state)
+
+    known = state["files"]
+    files = _scan_data_dir(DATA_DIR, known)
+    changed = [
+        name for name, entry in files.items()
+        if known.get(name, {}).get("sha256") != entry["sha256"]
+    ]
+
+    # refresh stats of unchanged files (and drop deleted ones) so they aren't re-hashed;
+    # changed files stay out of the cursor until their batch has loaded
+    state["files"] = {name: entry for name, entry in files.items() if name not in changed}
+    for name in changed:
+        if name in known:
+            state["files"][name] = known[name]
+
+    if not changed:
+        return SensorResult(skip_reason=SkipReason("No data file changed"), cursor=json.dumps(state))
+
+    quiet_for = time.time() - max(files[name]["mtime"] for name in changed)
+    if quiet_for < SETTLE_SECONDS:
+        return SensorResult(
+            skip_reason=SkipReason(f"{len(changed)} changed files, waiting for writes to settle"),
+            cursor=json.dumps(state),
+        )
+
+    if time.time() < state.get("retry_after", 0):
+        return SensorResult(
+            skip_reason=SkipReason(f"Last batch failed; retrying {len(changed)} changed files later"),
+            cursor=json.dumps(state),
+        )
+
+    # staging output is shared, so don't replace it under partition runs still in flight
+    active = context.instance.get_runs(
+        filters=RunsFilter(
+            tags={"dagster/sensor_name": context.sensor_name},
+            statuses=_ACTIVE_RUN_STATUSES,
+        ),
+        limit=1,
+    )
+    if active:
+        return SensorResult(
+            skip_reason=SkipReason("Previous batch still running"),
+            cursor=json.dumps(state),
+        )
+
+    paths = [str(DATA_DIR / name) for name in changed]
+    batch = hashlib.sha256("".join(files[name]["sha256"] for name in changed).encode()).hexdigest()
+    run_key = f"ingest:{batch[:16]}:{int(time.time())}"
+    state["pending"] = {
+        "run_key": run_key,
+        "files": {name: files[name] for name in changed},
+    }
+
+    # reading, staging and working out the affected partitions all happen in
+    # the run, not on the sensor's evaluation thread
+    return SensorResult(
+        run_requests=[
+            RunRequest(
+                run_key=run_key,
+                asset_selection=[raw_program_descriptions.key, staging_program_descriptions.key],
+                run_config={
+                    "ops": {"raw_program_descriptions": {"config": {"data_paths": paths}}},
+                },
+            )
+        ],
+        cursor=json.dumps(state),
+    )
@@ -0,0 +1,83 @@
+import random
+
+import numpy as np
+import pytest
+
+from services.piplines.pipeline.dedup import (
+    NUM_PERM,
+    cluster,
+    from_bytes,
+    minhash,
+    shingles,
+    similarity,
+    to_bytes,
+)
+
+_WORDS = [f"word{i}" for i in range(400)]
+
+
+def _text(seed: int, n: int = 300) -> str:
+    rng = random.Random(seed)
+    return " ".join(rng.choice(_WORDS) for _ in range(n))
+
+
+def _edit(text: str, changed: int, seed: int) -> str:
+    """``text`` with ``changed`` of its words replaced."""
+    rng = random.Random(seed)
+    words = text.split()
+    for i in rng.sample(range(len(words)), changed):
+        words[i] = f"edit{seed}_{i}"
+    return " ".join(words)
+
+
+def _jaccard(a: str, b: str) -> float:
+    sa, sb = set(shingles(a).tolist()), set(shingles(b).tolist())
+    return len(sa & sb) / len(sa | sb)
+
+
+def test_signature_shape_and_serialization():
+    sig = minhash(_text(0))
+    assert sig.shape == (NUM_PERM,) and sig.dtype == np.uint32
+    assert np.array_equal(from_bytes(to_bytes(sig)), sig)
+    assert np.array_equal(minhash(_text(0)), sig)  # deterministic across calls
+
+
+def test_short_and_case_insensitive_text():
+    assert len(shingles("two words")) == 1
+    assert np.array_equal(minhash("Residents Rotate"), minhash("residents rotate"))
+
+
+@pytest.mark.parametrize("changed", [3, 10, 30])
+def test_similarity_estimates_jaccard(changed):
+    a = _text(1)
+    b = _edit(a, changed, seed=changed)
+    # standard error of a 128-permutation estimate is at most ~0.045
+    assert abs(similarity(minhash(a), minhash(b)) - _jaccard(a, b)) < 0.15
+
+
+def test_cluster_groups_near_duplicates():
+    base_a, base_b = _text(10), _text(20)
+    texts = {
+        "p1": base_a,
+        "p2": _edit(base_a, 2, seed=1),
+        "p3": _edit(base_a, 3, seed=2),
+        "p4": base_b,
+        "p5": _edit(base_b, 2, seed=3),
+        "p6": _text(30),
+    }
+    clusters = cluster({key: minhash(text) for key, text in texts.items()}, threshold=0.8)
+
+    assert clusters == {"p1": "p1", "p2": "p1", "p3": "p1", "p4": "p4", "p5": "p4", "p6": "p6"}
+
+
+def test_cluster_id_is_smallest_member():
+    sig = minhash(_text(40))
+    clusters = cluster({"z": sig, "m": sig.copy(), "b": sig.copy()}, threshold=0.9)
+    assert set(clusters.values()) == {"b"}
+
+
+def test_cluster_threshold_filters_candidates():
+    a = _text(50)
+    b = _edit(a, 60, seed=4)  # well below 0.95
+    clusters = cluster({"a": minhash(a), "b": minhash(b)}, threshold=0.95)
+    assert clusters == {"a": "a", "b": "b"}
@@ -0,0 +1,139 @@
+import pytest
+
+pytest.importorskip("tiktoken")
+
+from services.piplines.pipeline import embedding_scheduler  # noqa: E402
+from services.piplines.pipeline.embedding_scheduler import (  # noqa: E402
+    MAX_INPUT_TOKENS,
+    EmbeddingItem,
+    EmbeddingScheduler,
+    RateLimiter,
+    SchedulerStats,
+)
+
+
+class _WordEncoding:
+    """One token per word, so batch sizes are easy to reason about offline."""
+
+    def encode(self, text):
+        return text.split()
+
+    def decode(self, tokens):
+        return " ".join(tokens)
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(embedding_scheduler.time, "monotonic", clock.monotonic)
+    monkeypatch.setattr(embedding_scheduler.time, "sleep", clock.sleep)
+    return clock
+
+
+def _scheduler(monkeypatch, embed_texts=None, **kwargs):
+    monkeypatch.setattr(embedding_scheduler.tiktoken, "encoding_for_model", lambda model: _WordEncoding())
+    embed_texts = embed_texts or (lambda texts: [[float(len(t))] for t in texts])
+    return EmbeddingScheduler(embed_texts, **kwargs)
+
+
+def _items(*token_counts):
+    return [EmbeddingItem(key=f"k{i}", text=" ".join(["w"] * n)) for i, n in enumerate(token_counts)]
+
+
+# ── Batching ────────────────────────────────────────────────────────
+def test_batches_bounded_by_tokens(monkeypatch):
+    scheduler = _scheduler(monkeypatch, max_batch_tokens=10, max_batch_size=100)
+    batches = scheduler.make_batches(_items(4, 4, 4, 10, 1), SchedulerStats())
+
+    assert [[item.tokens for item in batch] for batch in batches] == [[4, 4], [4], [10], [1]]
+
+
+def test_batches_bounded_by_size(monkeypatch):
+    scheduler = _scheduler(monkeypatch, max_batch_tokens=1000, max_batch_size=2)
+    batches = scheduler.make_batches(_items(1, 1, 1, 1, 1), SchedulerStats())
+
+    assert [[item.key for item in batch] for batch in batches] == [["k0", "k1"], ["k2", "k3"], ["k4"]]
+
+
+def test_oversized_item_is_truncated_and_sent_alone(monkeypatch):
+    scheduler = _scheduler(monkeypatch, max_batch_tokens=MAX_INPUT_TOKENS)
+    stats = SchedulerStats()
+    batches = scheduler.make_batches(_items(3, MAX_INPUT_TOKENS + 50), stats)
+
+    assert stats.truncated == 1
+    assert [[item.tokens for item in batch] for batch in batches] == [[3], [MAX_INPUT_TOKENS]]
+
+
+def test_run_embeds_everything_and_retries(monkeypatch, clock):
+    calls = []
+
+    def flaky(texts):
+        calls.append(texts)
+        if len(calls) == 1:
+            raise RuntimeError("rate limited")
+        return [[1.0] for _ in texts]
+
+    scheduler = _scheduler(monkeypatch, flaky, max_batch_tokens=5, max_in_flight=1)
+    done = []
+    stats = scheduler.run(_items(2, 2, 2, 2), lambda batch, vectors: done.extend(i.key for i in batch))
+
+    assert sorted(done) == ["k0", "k1", "k2", "k3"]
+    assert (stats.embedded, stats.batches, stats.retries, stats.failed_batches) == (4, 2, 1, 0)
+
+
+def test_run_counts_permanent_failures(monkeypatch, clock):
+    def broken(texts):
+        raise RuntimeError("down")
+
+    scheduler = _scheduler(monkeypatch, broken, max_batch_tokens=5, max_retries=2)
+    stats = scheduler.run(_items(2, 2, 2), lambda batch, vectors: None)
+
+    assert (stats.embedded, stats.failed_batches, stats.failed_items) == (0, 2, 3)
+    assert stats.errors == ["down", "down"]
+    assert stats.retries == 4  # both batches used up their two retries
+
+
+# ── Rate limiting ───────────────────────────────────────────────────
+def test_limiter_waits_for_request_budget(clock):
+    limiter = RateLimiter(requests_per_minute=2, tokens_per_minute=1000, window=60.0)
+    limiter.acquire(1)
+    limiter.acquire(1)
+    assert clock.now == 0.0
+
+    limiter.acquire(1)  # third request waits for the first to leave the window
+    assert clock.now == pytest.approx(60.0)
+
+
+def test_limiter_waits_for_token_budget(clock):
+    limiter = RateLimiter(requests_per_minute=100, tokens_per_minute=100, window=60.0)
+    limiter.acquire(60)
+    clock.now = 10.0
+    limiter.acquire(40)
+    assert clock.now == 10.0
+
+    limiter.acquire(1)
+    assert clock.now == pytest.approx(60.0)
+    limiter.acquire(59)  # the first 60 tokens have left the window
+    assert clock.now == pytest.approx(60.0)
+
+
+def test_limiter_lets_an_oversized_request_through_alone(clock):
+    limiter = RateLimiter(requests_per_minute=10, tokens_per_minute=100, window=60.0)
+    limiter.acquire(500)
+    assert clock.now == 0.0
+
+    limiter.acquire(1)
+    assert clock.now == pytest.approx(60.0)
@@ -0,0 +1,63 @@
+import json
+
+import pytest
+
+from services.piplines.pipeline import ingest
+from services.piplines.pipeline.ingest import iter_raw_records
+
+RECORDS = [
+    {"id": "1503|27001", "page_content": "# École — “quoted” ]}, text\n", "metadata": {"source": "a"}},
+    {"id": "1503|27002", "page_content": "", "metadata": {}},
+    {"id": "1503|27003", "page_content": "x" * 50, "metadata": {"source": None, "n": [1, 2.5, True]}},
+]
+
+
+@pytest.fixture(params=[1, 2, 3, 7, 1 << 16])
+def chunk_size(request, monkeypatch):
+    monkeypatch.setattr(ingest, "_READ_CHUNK_SIZE", request.param)
+    return request.param
+
+
+def _write(tmp_path, text: str, name: str = "records.json"):
+    path = tmp_path / name
+    path.write_text(text, encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("indent", [None, 2])
+def test_json_array_matches_json_load(tmp_path, chunk_size, indent):
+    path = _write(tmp_path, json.dumps(RECORDS, ensure_ascii=False, indent=indent))
+    assert list(iter_raw_records(path)) == RECORDS
+
+
+def test_scalars_split_across_chunks(tmp_path, chunk_size):
+    items = [12345, -0.5, 1e10, True, False, None, "s", 7]
+    path = _write(tmp_path, " [ 12345 ,-0.5,1e10,\ntrue , false,null,\"s\",7]")
+    assert list(iter_raw_records(path)) == items
+
+
+def test_trailing_scalar_without_closing_bracket_is_an_error(tmp_path, chunk_size):
+    path = _write(tmp_path, "[1, 23")
+    with pytest.raises(ValueError):
+        list(iter_raw_records(path))
+
+
+@pytest.mark.parametrize("text", ["", "  \n", "[]", " [ ] "])
+def test_empty(tmp_path, chunk_size, text):
+    assert list(iter_raw_records(_write(tmp_path, text))) == []
+
+
+def test_not_an_array(tmp_path, chunk_size):
+    with pytest.raises(ValueError):
+        list(iter_raw_records(_write(tmp_path, '{"id": 1}')))
+
+
+def test_truncated_item(tmp_path, chunk_size):
+    path = _write(tmp_path, json.dumps(RECORDS)[:-20])
+    with pytest.raises(ValueError):
+        list(iter_raw_records(path))
+
+
+def test_ndjson(tmp_path):
+    text = "\n".join(json.dumps(r, ensure_ascii=False) for r in RECORDS) + "\n\n"
+    assert list(iter_raw_records(_write(tmp_path, text, "records.ndjson"))) == RECORDS
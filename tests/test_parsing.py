@@ -0,0 +1,59 @@
+import json
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+from services.piplines.benchmarks.synthetic import generate_records
+from services.piplines.pipeline.ingest import stage_record
+from services.piplines.pipeline.parsing import (
+    iter_parsed_records,
+    parse_record,
+    parse_records_parallel,
+    record_school,
+)
+
+FIXTURES = json.loads((Path(__file__).parent / "fixtures" / "program_records.json").read_text(encoding="utf-8"))
+
+
+def test_parallel_parse_matches_sequential():
+    staged = [stage_record(r) for r in generate_records(250, seed=7)]
+    staged[3]["clean_text"] = "no header here"  # skipped headers keep their order too
+    skipped, stats = [], Counter()
+    sequential = list(iter_parsed_records(staged, skipped, stats))
+
+    parallel_skipped, parallel_stats = [], Counter()
+    parallel = parse_records_parallel(staged, parallel_skipped, parallel_stats, max_workers=2, chunk_size=40)
+
+    assert parallel == sequential
+    assert parallel_skipped == skipped == ["NO HEADER"]
+    assert parallel_stats == stats
+
+
+# ── Parser against fixed records ────────────────────────────────────
+@pytest.mark.parametrize("fixture", FIXTURES, ids=[f["raw"]["id"] for f in FIXTURES])
+def test_parse_record_matches_fixture(fixture):
+    skipped = []
+    parsed = parse_record(stage_record(fixture["raw"]), skipped)
+
+    if fixture["expected"] is None:
+        assert parsed is None and skipped
+        return
+    assert {key: parsed[key] for key in fixture["expected"]} == fixture["expected"]
+    assert parsed["record_id"] == fixture["raw"]["id"]
+
+
+def test_french_school_names_resolve_to_english():
+    # Behaviour change: since lookups are folded, capitalised / accented French
+    # school names parse to the English name. They used to be kept as written
+    # ("Université de Montréal"); migration 9de718597fa0 remaps existing rows.
+    schools = {f["raw"]["id"]: f["expected"]["school_name"] for f in FIXTURES if f["expected"]}
+    assert schools["1503|27002"] == "University of Montreal"
+    assert schools["1503|27003"] == "University of Sherbrooke"
+
+
+def test_record_school_matches_parser():
+    for fixture in FIXTURES:
+        staged = stage_record(fixture["raw"])
+        expected = fixture["expected"]["school_name"] if fixture["expected"] else None
+        assert record_school(staged) == expected
@@ -0,0 +1,121 @@
+from collections import Counter
+
+import pytest
+
+from services.piplines.pipeline.normalization import KNOWN_DISCIPLINES, SCHOOL_FR_TO_EN
+from services.piplines.pipeline.parsing_helpers import (
+    SCHOOL_INDEX,
+    TranslationIndex,
+    _PrefixTrie,
+    _is_metadata_line,
+    fold_text,
+    split_discipline_and_site,
+    tokenize_header,
+)
+
+
+# ── Discipline trie ─────────────────────────────────────────────────
+def _longest_prefix_scan(words, text):
+    """The linear scan the trie replaced."""
+    matches = [w for w in words if text.startswith(w)]
+    return max(matches, key=len) if matches else None
+
+
+@pytest.mark.parametrize("text", [
+    "Otolaryngology - Head and Neck Surgery - Toronto",
+    "Otolaryngology - Toronto",
+    "Neurology - Pediatric",
+    "Pediatrics - Research Track - Calgary",
+    "Public Health and Preventive Medicine including Family Medicine - Kingston",
+    "Pathology",
+    "Path",
+    "Unknown Discipline - Ottawa",
+    "",
+])
+def test_trie_matches_linear_scan(text):
+    trie = _PrefixTrie(KNOWN_DISCIPLINES)
+    assert trie.longest_prefix(text) == _longest_prefix_scan(KNOWN_DISCIPLINES, text)
+
+
+@pytest.mark.parametrize("parts, expected", [
+    (["Otolaryngology", "Head and Neck Surgery", "Toronto"], ("Otolaryngology - Head and Neck Surgery", "Toronto")),
+    (["General Surgery", "Ottawa"], ("General Surgery", "Ottawa")),
+    (["Family Medicine"], ("Family Medicine", None)),
+    (["Something", "Else", "Site"], ("Something - Else", "Site")),
+    ([], ("", None)),
+])
+def test_split_discipline_and_site(parts, expected):
+    assert split_discipline_and_site(parts) == expected
+
+
+# ── Header tokens and metadata lines ────────────────────────────────
+def test_tokenize_header_normalizes_dashes():
+    assert tokenize_header("McGill University — Psychiatry –  Montréal") == [
+        "McGill University", "Psychiatry", "Montréal",
+    ]
+
+
+def _is_metadata_line_chain(s: str) -> bool:
+    """The substring checks the compiled pattern replaced."""
+    t = s.strip().lower()
+    return (
+        t.startswith("# 202") or t.startswith("202")
+        or "residency" in t or "match" in t or "iteration" in t
+        or "premier tour" in t or "jumelage" in t
+        or t.startswith("cmg") or t.startswith("img") or t.startswith("ros")
+    )
+
+
+@pytest.mark.parametrize("line", [
+    "#  2025 R-1 Main Residency Match - first iteration",
+    "2025 R-1 Jumelage principal des résidents - premier tour",
+    "CMG Stream for CMG",
+    "  ROS stream",
+    "IMG Stream for IMG",
+    "Regular Stream for All",
+    "Toronto",
+    "Programme in the match",
+    "Rossland",
+    "",
+])
+def test_metadata_line_matches_substring_checks(line):
+    assert _is_metadata_line(line) == _is_metadata_line_chain(line)
+
+
+# ── Translation index ───────────────────────────────────────────────
+def test_fold_text():
+    assert fold_text("  Université  d’Ottawa ") == fold_text("universite d'ottawa") == "universite d'ottawa"
+
+
+@pytest.mark.parametrize("name", ["Université de Montréal", "UNIVERSITE DE MONTREAL", "université de montréal"])
+def test_index_get_folds_case_and_accents(name):
+    assert SCHOOL_INDEX.get(name) == "University of Montreal"
+
+
+def test_index_get_is_exact():
+    assert SCHOOL_INDEX.get("Université de Montréal - Campus") is None
+    assert SCHOOL_INDEX.get("University of Toronto") is None
+
+
+def test_prefix_lookup_first_entry_wins():
+    index = TranslationIndex({"chirurgie": "Surgery", "chirurgie cardiaque": "Cardiac Surgery"}, head_len=8)
+
+    # both keys share the query's head; the one listed first wins, as the old scan did
+    assert index.prefix_lookup("Chirurgie cardiaque - Québec") == "Surgery"
+    assert index.prefix_lookup("chir") == "Surgery"
+    assert index.prefix_lookup("médecine") is None
+
+
+def test_translate_counts_outcomes():
+    index = TranslationIndex({"neurologie": "Neurology", "oto-rhino-laryngologie et chirurgie": "Otolaryngology"})
+    stats = Counter()
+
+    assert index.translate("Neurologie", stats, kind="discipline") == "Neurology"
+    assert index.translate("Oto-rhino-laryngologie et chirurgie cervico", stats, kind="discipline") == "Otolaryngology"
+    assert index.translate("Urologie", stats, kind="discipline") is None
+    assert stats == Counter(discipline_exact=1, discipline_prefix=1, discipline_miss=1)
+
+
+def test_every_school_translation_is_reachable():
+    for fr_name, en_name in SCHOOL_FR_TO_EN.items():
+        assert SCHOOL_INDEX.get(fr_name) == en_name
@@ -0,0 +1,69 @@
+import hashlib
+
+import pytest
+
+from services.api.app.program_versions import (
+    SNAPSHOT_EVERY,
+    apply_delta,
+    encode_delta,
+    encode_snapshot,
+    new_versions,
+    reconstruct,
+)
+
+
+def _hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+def _history(texts: list[str]) -> list[dict]:
+    """Version rows for a description that went through ``texts`` in order."""
+    rows, old, last_version = [], None, None
+    for text in texts:
+        rows += new_versions(last_version, old, _hash(old) if old else None, text, _hash(text))
+        old, last_version = text, rows[-1]["version"]
+    return rows
+
+
+@pytest.mark.parametrize("old, new", [
+    ("a\nb\nc\n", "a\nB\nc\n"),
+    ("a\nb\nc", "a\nb\nc\nd"),  # no trailing newline
+    ("one\ntwo\n", ""),
+    ("", "Langue de candidature\nFrançais\n"),
+    ("same\n", "same\n"),
+    ("x\r\ny\r\n", "x\r\nz\r\n"),
+])
+def test_delta_round_trip(old, new):
+    assert apply_delta(old, encode_delta(old, new)) == new
+
+
+def test_reconstruct_every_version():
+    texts = [f"## Overview\nRevision {i}\n\n## Interviews\nDates: {i % 3}\n" for i in range(2 * SNAPSHOT_EVERY + 3)]
+    rows = _history(texts)
+
+    assert [r["version"] for r in rows] == list(range(1, len(texts) + 1))
+    for version, text in enumerate(texts, start=1):
+        start = max(v for v in range(1, version + 1) if rows[v - 1]["is_snapshot"])
+        chain = [(r["is_snapshot"], r["payload"]) for r in rows[start - 1:version]]
+        assert reconstruct(chain) == text
+
+
+def test_snapshot_cadence():
+    rows = _history([f"text {i}\n" for i in range(SNAPSHOT_EVERY + 2)])
+    assert [r["version"] for r in rows if r["is_snapshot"]] == [1, SNAPSHOT_EVERY + 1]
+
+
+def test_first_change_records_previous_text():
+    rows = new_versions(None, "old\n", _hash("old\n"), "new\n", _hash("new\n"))
+
+    assert [(r["version"], r["is_snapshot"]) for r in rows] == [(1, True), (2, False)]
+    assert rows[0]["description_hash"] == _hash("old\n")
+    assert reconstruct([(r["is_snapshot"], r["payload"]) for r in rows]) == "new\n"
+
+
+def test_reconstruct_needs_a_snapshot():
+    with pytest.raises(ValueError):
+        reconstruct([(False, encode_delta("a\n", "b\n"))])
+    with pytest.raises(ValueError):
+        reconstruct([])
+    assert reconstruct([(True, encode_snapshot("é\n"))]) == "é\n"